@@ -9,8 +9,8 @@ from argparse import Namespace
 from collections import Counter, deque
 from collections.abc import Collection, MutableSequence
 from enum import IntEnum, IntFlag
-from typing import (AbstractSet, Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Literal, Mapping, NamedTuple,
-                    Optional, Protocol, Set, Tuple, Union, TYPE_CHECKING)
+from typing import (AbstractSet, Any, Callable, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, Literal, Mapping,
+                    NamedTuple, Optional, Protocol, Set, Tuple, Union, TYPE_CHECKING)
 import dataclasses
 
 from typing_extensions import NotRequired, TypedDict
@@ -875,14 +875,40 @@ class CollectionState():
         reachable_advancements = True
         # since the loop has a good chance to run more than once, only filter the advancements once
         locations = {location for location in locations if location.advancement and location not in self.advancements}
+        # locations with a declarative rule (see worlds.generic.Rules.Rule) that was false in a reachable region,
+        # by the items the rule depends on. Those don't need to be evaluated again until one of the items changes.
+        blocked: Dict[Location, FrozenSet[Tuple[int, str]]] = {}
+        blocked_players: Set[int] = set()
+        changed_items: Set[Tuple[int, str]] = set()
 
         while reachable_advancements:
-            reachable_advancements = {location for location in locations if location.can_reach(self)}
+            reachable_advancements = set()
+            for location in locations:
+                dependencies = blocked.get(location)
+                if dependencies is not None:
+                    if dependencies.isdisjoint(changed_items):
+                        continue
+                    del blocked[location]
+                dependencies = getattr(location.access_rule, "dependencies", None)
+                if dependencies is None or type(location).can_reach is not Location.can_reach:
+                    if location.can_reach(self):
+                        reachable_advancements.add(location)
+                elif location.parent_region.can_reach(self):
+                    if location.access_rule(self):
+                        reachable_advancements.add(location)
+                    else:
+                        blocked[location] = dependencies
+                        blocked_players.update(player for player, _ in dependencies)
             locations -= reachable_advancements
+
+            prog_items_before = {player: self.prog_items[player].copy() for player in blocked_players}
             for advancement in reachable_advancements:
                 self.advancements.add(advancement)
                 assert isinstance(advancement.item, Item), "tried to collect Event with no Item"
                 self.collect(advancement.item, True, advancement)
+            changed_items = {(player, item) for player, before in prog_items_before.items()
+                             for after in (self.prog_items[player],) for item in before.keys() | after.keys()
+                             if before[item] != after[item]}
 
     # item name related
     def has(self, item: str, player: int, count: int = 1) -> bool:
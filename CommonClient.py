@@ -175,6 +175,15 @@ class ClientCommandProcessor(CommandProcessor):
             self.output("Unreadied.")
         async_start(self.ctx.send_msgs([{"cmd": "StatusUpdate", "status": state}]), name="send StatusUpdate")
 
+    def _cmd_filter(self, *filters: str) -> bool:
+        """Only show messages of these types, item classes or players in the log, e.g. /filter ItemSend Hint
+        progression. Without arguments, all messages are shown again."""
+        if not self.ctx.ui:
+            self.output("Filtering the log is only available in the GUI.")
+            return False
+        self.ctx.ui.filter_log(*filters)
+        return True
+
     def default(self, raw: str):
         """The default message parser to be used when parsing any messages that do not match a command"""
         raw = self.ctx.on_user_say(raw)
@@ -196,8 +205,15 @@ class CommonContext:
             self.lookup_type: typing.Literal["item", "location"] = lookup_type
             self._unknown_item: typing.Callable[[int], str] = lambda key: f"Unknown {lookup_type} (ID: {key})"
             self._archipelago_lookup: typing.Dict[int, str] = {}
-            self._game_store: typing.Dict[str, typing.ChainMap[int, str]] = collections.defaultdict(
-                lambda: collections.ChainMap(self._archipelago_lookup, Utils.KeyedDefaultDict(self._unknown_item)))
+            self._game_store: typing.Dict[str, typing.ChainMap[int, str]] = Utils.KeyedDefaultDict(self._local_game)
+
+        def _local_game(self, game: str) -> typing.ChainMap[int, str]:
+            """Lookup table of a game the server sent no data package for, from the installed world if there is one."""
+            local_package = network_data_package["games"].get(game)
+            if local_package is None:
+                return collections.ChainMap(self._archipelago_lookup, Utils.KeyedDefaultDict(self._unknown_item))
+            self.update_game(game, local_package[f"{self.lookup_type}_name_to_id"])
+            return self._game_store[game]
 
         # noinspection PyTypeChecker
         def __getitem__(self, key: str) -> typing.Mapping[int, str]:
@@ -235,11 +251,18 @@ class CommonContext:
 
             return self.lookup_in_game(code, self.ctx.slot_info[slot].game)
 
-        def update_game(self, game: str, name_to_id_lookup_table: typing.Dict[str, int]) -> None:
-            """Overrides existing lookup tables for a particular game."""
+        def update_game(self, game: str,
+                        name_to_id_lookup_table: typing.Union[typing.Dict[str, int], Utils.DataPackageTable]) -> None:
+            """Overrides existing lookup tables for a particular game.
+            A DataPackageTable from the data package store is used as it is, looking names up lazily."""
             id_to_name_lookup_table = Utils.KeyedDefaultDict(self._unknown_item)
-            id_to_name_lookup_table.update({code: name for name, code in name_to_id_lookup_table.items()})
-            self._game_store[game] = collections.ChainMap(self._archipelago_lookup, id_to_name_lookup_table)
+            if isinstance(name_to_id_lookup_table, Utils.DataPackageTable):
+                self._game_store[game] = collections.ChainMap(self._archipelago_lookup, name_to_id_lookup_table,
+                                                              id_to_name_lookup_table)
+                id_to_name_lookup_table = name_to_id_lookup_table
+            else:
+                id_to_name_lookup_table.update({code: name for name, code in name_to_id_lookup_table.items()})
+                self._game_store[game] = collections.ChainMap(self._archipelago_lookup, id_to_name_lookup_table)
             if game == "Archipelago":
                 # Keep track of the Archipelago data package separately so if it gets updated in a custom datapackage,
                 # it updates in all chain maps automatically.
@@ -262,6 +285,9 @@ class CommonContext:
     generator_version: Version = Version(0, 0, 0)
     current_energy_link_value: typing.Optional[int] = None  # to display in UI, gets set by server
     max_size: int = 16*1024*1024  # 16 MB of max incoming packet size
+    item_send_limit: int = 50
+    """ItemSend messages shown per item_send_interval, more are summarized at the end of the interval"""
+    item_send_interval: float = 1.0
 
     last_death_link: float = time.time()  # last send/received death link on AP layer
 
@@ -378,7 +404,12 @@ class CommonContext:
 
         self.jsontotextparser = JSONtoTextParser(self)
         self.rawjsontotextparser = RawJSONtoTextParser(self)
-        self.update_data_package(network_data_package)
+        # data of the other installed games gets looked up on first use, instead of building it for all worlds
+        self.update_game(network_data_package["games"]["Archipelago"], "Archipelago")
+        self._item_send_window = 0.0
+        self._item_send_count = 0
+        # (sending slot, receiving slot) -> ItemSend messages that were not shown
+        self._item_send_summary: typing.Counter[typing.Tuple[int, int]] = collections.Counter()
 
         # execution
         self.keep_alive_task = asyncio.create_task(keep_alive(self), name="Bouncy")
@@ -527,15 +558,55 @@ class CommonContext:
         logger.info(args["text"])
 
     def on_print_json(self, args: dict):
+        logging.getLogger("FileLog").info(self.rawjsontotextparser(copy.deepcopy(args["data"])),
+                                          extra={"NoStream": True})
+        if args.get("type") == "ItemSend" and self.summarize_item_send(args):
+            return
+
         if self.ui:
             # send copy to UI
-            self.ui.print_json(copy.deepcopy(args["data"]))
+            self.ui.print_json(copy.deepcopy(args["data"]), args)
 
-        logging.getLogger("FileLog").info(self.rawjsontotextparser(copy.deepcopy(args["data"])),
-                                          extra={"NoStream": True})
         logging.getLogger("StreamLog").info(self.jsontotextparser(copy.deepcopy(args["data"])),
                                             extra={"NoFile": True})
 
+    def summarize_item_send(self, args: dict) -> bool:
+        """Counts an ItemSend message past item_send_limit in its interval into a summary, instead of it being shown.
+        Releases and collects send thousands of them at once, which would otherwise freeze the client.
+        Items this client's slot sends or receives are always shown and don't count towards the limit.
+        Returns if the message got summarized."""
+        if self.slot in (args["receiving"], args["item"].player):
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        now = loop.time()
+        if now - self._item_send_window >= self.item_send_interval:
+            self._item_send_window = now
+            self._item_send_count = 0
+        self._item_send_count += 1
+        if self._item_send_count <= self.item_send_limit:
+            return False
+        if not self._item_send_summary:
+            loop.call_at(self._item_send_window + self.item_send_interval, self.print_item_send_summary)
+        self._item_send_summary[args["item"].player, args["receiving"]] += 1
+        return True
+
+    def print_item_send_summary(self) -> None:
+        """Shows how many ItemSend messages were summarized, by sending and receiving slot."""
+        summary, self._item_send_summary = self._item_send_summary, collections.Counter()
+        for (sender, receiver), count in summary.most_common():
+            items = f"{count} more item{'s' if count > 1 else ''}"
+            if sender == receiver:
+                data = [{"type": "player_id", "text": str(sender)}, {"text": f" found {items} of their own."}]
+            else:
+                data = [{"type": "player_id", "text": str(sender)}, {"text": f" sent {items} to "},
+                        {"type": "player_id", "text": str(receiver)}, {"text": "."}]
+            if self.ui:
+                self.ui.print_json(copy.deepcopy(data), {"type": "ItemSend", "receiving": receiver, "slot": sender})
+            logging.getLogger("StreamLog").info(self.jsontotextparser(data), extra={"NoFile": True})
+
     def on_package(self, cmd: str, args: dict):
         """For custom package handling in subclasses."""
         pass
@@ -612,17 +683,21 @@ class CommonContext:
                 if remote_checksum == local_checksum:
                     self.update_game(network_data_package["games"][game], game)
                 else:
-                    cached_game = Utils.load_data_package_for_checksum(game, remote_checksum)
-                    cache_checksum: typing.Optional[str] = cached_game.get("checksum")
+                    cached_game = Utils.data_package_store.open(game, remote_checksum)
                     # download remote version if cache is not new enough
-                    if remote_checksum != cache_checksum:
+                    if cached_game is None:
                         needed_updates.add(game)
                     else:
                         self.update_game(cached_game, game)
         if needed_updates:
             await self.send_msgs([{"cmd": "GetDataPackage", "games": [game_name]} for game_name in needed_updates])
 
-    def update_game(self, game_package: dict, game: str):
+    def update_game(self, game_package: typing.Union[dict, Utils.CompactDataPackage], game: str):
+        if isinstance(game_package, Utils.CompactDataPackage):
+            self.item_names.update_game(game, game_package.item_names)
+            self.location_names.update_game(game, game_package.location_names)
+            self.checksums[game] = game_package.checksum
+            return
         self.item_names.update_game(game, game_package["item_name_to_id"])
         self.location_names.update_game(game, game_package["location_name_to_id"])
         self.checksums[game] = game_package.get("checksum")
@@ -929,6 +1004,9 @@ async def process_server_cmd(ctx: CommonContext, args: dict):
 
     elif cmd == 'Connected':
         ctx.username = ctx.auth
+        if ctx.ui:
+            # messages of a previous connection refer to its players
+            ctx.ui.render_log()
         ctx.team = args["team"]
         ctx.slot = args["slot"]
         # int keys get lost in JSON transfer
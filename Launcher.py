@@ -6,6 +6,7 @@ Archipelago Launcher
 * If run without arguments or unknown arguments, open launcher GUI.
 
 Additional components can be added to worlds.LauncherComponents.components.
+Components of worlds are listed from the world manifest, the worlds are only imported once one of them gets run.
 """
 
 import argparse
@@ -156,6 +157,11 @@ def identify(path: None | str) -> tuple[None | str, None | Component]:
             return path, component
         elif path == component.display_name or path == component.script_name:
             return None, component
+    import worlds
+    if worlds.lazy_world_sources:
+        # worlds that are not imported yet may add patch suffixes to the components of shared clients, like SNI's
+        worlds.load_lazy_worlds()
+        return identify(path)
     return None, None
 
 
@@ -443,6 +449,10 @@ def main(args: argparse.Namespace | dict | None = None):
     elif not args:
         args = {}
 
+    # components of .apworld files the world manifest does not list yet are only known once they are imported
+    import worlds
+    worlds.load_unlisted_worlds()
+
     path = args.get("Patch|Game|Component|url", None)
     if path is not None:
         if path.startswith("archipelago://"):
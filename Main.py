@@ -13,9 +13,10 @@ from BaseClasses import CollectionState, Item, Location, LocationProgressType, M
 from Fill import FillError, balance_multiworld_progression, distribute_items_restrictive, flood_items, \
     parse_planned_blocks, distribute_planned_blocks, resolve_early_locations_for_planned
 from Options import StartInventoryPool
-from Utils import __version__, output_path, version_tuple
+from Utils import __version__, file_image_cache, output_path, version_tuple
 from settings import get_settings
 from worlds import AutoWorld
+from worlds.OutputScheduler import output_scheduler
 from worlds.generic.Rules import exclusion_rules, locality_rules
 
 __all__ = ["main"]
@@ -49,18 +50,21 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     multiworld.state = CollectionState(multiworld)
     logger.info('Archipelago Version %s  -  Seed: %s\n', __version__, multiworld.seed)
 
-    logger.info(f"Found {len(AutoWorld.AutoWorldRegister.world_types)} World Types:")
-    longest_name = max(len(text) for text in AutoWorld.AutoWorldRegister.world_types)
+    # only the worlds of the games being generated, listing all would import all
+    world_types = {game: AutoWorld.AutoWorldRegister.world_types[game]
+                   for game in sorted(set(multiworld.game.values()))}
+    logger.info(f"Found {len(world_types)} World Types:")
+    longest_name = max(len(text) for text in world_types)
 
-    item_count = len(str(max(len(cls.item_names) for cls in AutoWorld.AutoWorldRegister.world_types.values())))
-    location_count = len(str(max(len(cls.location_names) for cls in AutoWorld.AutoWorldRegister.world_types.values())))
+    item_count = len(str(max(len(cls.item_names) for cls in world_types.values())))
+    location_count = len(str(max(len(cls.location_names) for cls in world_types.values())))
 
-    for name, cls in AutoWorld.AutoWorldRegister.world_types.items():
+    for name, cls in world_types.items():
         if not cls.hidden and len(cls.item_names) > 0:
             logger.info(f" {name:{longest_name}}: Items: {len(cls.item_names):{item_count}} | "
                         f"Locations: {len(cls.location_names):{location_count}}")
 
-    del item_count, location_count
+    del world_types, item_count, location_count
 
     # This assertion method should not be necessary to run if we are not outputting any multidata.
     if not args.skip_output and not args.spoiler_only:
@@ -218,18 +222,24 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         logger.info('Done. Skipped multidata modification. Total time: %s', time.perf_counter() - start)
         return multiworld
 
+    generator_settings = get_settings().generator
+    output_scheduler.configure(memory_limit=generator_settings.output_memory_limit * 2**20,
+                               processes=generator_settings.output_processes)
     output = tempfile.TemporaryDirectory()
-    with output as temp_dir:
+    with output as temp_dir, output_scheduler, file_image_cache:
         output_players = [player for player in multiworld.player_ids if AutoWorld.World.generate_output.__code__
                           is not multiworld.worlds[player].generate_output.__code__]
         with concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
             check_accessibility_task = pool.submit(multiworld.fulfills_accessibility)
 
-            output_file_futures = [pool.submit(AutoWorld.call_stage, multiworld, "generate_output", temp_dir)]
+            output_file_futures = [pool.submit(output_scheduler.timed, "stage output",
+                                               AutoWorld.call_stage, multiworld, "generate_output", temp_dir)]
             for player in output_players:
                 # skip starting a thread for methods that say "pass".
                 output_file_futures.append(
-                    pool.submit(AutoWorld.call_single, multiworld, "generate_output", player, temp_dir))
+                    pool.submit(output_scheduler.timed,
+                                f"{multiworld.game[player]} ({multiworld.get_player_name(player)})",
+                                AutoWorld.call_single, multiworld, "generate_output", player, temp_dir))
 
             # collect ER hint info
             er_hint_data: dict[int, dict[int, str]] = {}
@@ -353,6 +363,9 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                     logger.info(f'Generating output files ({i}/{len(output_file_futures)}).')
                 future.result()
 
+        logger.debug("Slowest outputs: " + ", ".join(f"{label} {seconds:.2f}s ({waited:.2f}s waiting)"
+                                                     for label, seconds, waited in output_scheduler.get_slowest(5)))
+
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
             multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
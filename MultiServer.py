@@ -126,6 +126,8 @@ def get_saving_second(seed_name: str, interval: int = 60) -> int:
 
 class Client(Endpoint):
     version = Version(0, 0, 0)
+    team: typing.Optional[int]
+    slot: typing.Optional[int]
     tags: typing.List[str]
     remote_items: bool
     remote_start_inventory: bool
@@ -168,6 +170,39 @@ class Client(Endpoint):
 team_slot = typing.Tuple[int, int]
 
 
+class DataStorageSubscriptions:
+    """
+    Clients subscribed with SetNotify to data storage keys, either to single keys or to all keys starting with a prefix.
+    Finding the subscribers of a key takes one lookup per distinct prefix length, however many subscriptions exist.
+    """
+    keys: typing.DefaultDict[str, typing.MutableSet[Client]]
+    prefixes: typing.DefaultDict[str, typing.MutableSet[Client]]
+    _prefix_lengths: typing.List[int]
+
+    def __init__(self) -> None:
+        self.keys = collections.defaultdict(weakref.WeakSet)
+        self.prefixes = collections.defaultdict(weakref.WeakSet)
+        self._prefix_lengths = []
+
+    def add_key(self, key: str, client: Client) -> None:
+        self.keys[key].add(client)
+
+    def add_prefix(self, prefix: str, client: Client) -> None:
+        if prefix not in self.prefixes:
+            self._prefix_lengths = sorted({*self._prefix_lengths, len(prefix)})
+        self.prefixes[prefix].add(client)
+
+    def get_subscribers(self, key: str) -> typing.Set[Client]:
+        subscribers = set(self.keys.get(key, ()))
+        for length in self._prefix_lengths:
+            if length > len(key):
+                break
+            prefix_subscribers = self.prefixes.get(key[:length])
+            if prefix_subscribers:
+                subscribers.update(prefix_subscribers)
+        return subscribers
+
+
 class Context:
     dumper = staticmethod(encode)
     loader = staticmethod(decode)
@@ -191,7 +226,7 @@ class Context:
     save_version = 2
     stored_data: typing.Dict[str, object]
     read_data: typing.Dict[str, object]
-    stored_data_notification_clients: typing.Dict[str, typing.Set[Client]]
+    stored_data_notification_clients: DataStorageSubscriptions
     slot_info: typing.Dict[int, NetworkSlot]
     generator_version = Version(0, 0, 0)
     checksums: typing.Dict[str, str]
@@ -201,6 +236,8 @@ class Context:
     location_name_groups: typing.Dict[str, typing.Dict[str, typing.Set[str]]]
     all_item_and_group_names: typing.Dict[str, typing.Set[str]]
     all_location_and_group_names: typing.Dict[str, typing.Set[str]]
+    name_indices: typing.Dict[typing.Tuple[str, str], Utils.FuzzyNameIndex]
+    """ fuzzy lookup index per (game, name kind), see get_name_index """
     non_hintable_names: typing.Dict[str, typing.AbstractSet[str]]
     spheres: typing.List[typing.Dict[int, typing.Set[int]]]
     """ each sphere is { player: { location_id, ... } } """
@@ -257,7 +294,7 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread: typing.Optional[threading.Thread] = None
         self.save_dirty = False
-        self.tags = ['AP']
+        self.tags = ['AP', 'DataStorageBatch']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
         self.seed_name = ""
@@ -265,7 +302,8 @@ class Context:
         self.group_collected: typing.Dict[int, typing.Set[int]] = {}
         self.random = random.Random()
         self.stored_data = {}
-        self.stored_data_notification_clients = collections.defaultdict(weakref.WeakSet)
+        self.stored_data_notification_clients = DataStorageSubscriptions()
+        self.pending_set_replies: typing.Dict[Client, typing.List[str]] = {}
         self.read_data = {}
         self.spheres = []
 
@@ -276,6 +314,7 @@ class Context:
         self.location_name_groups = {}
         self.all_item_and_group_names = {}
         self.all_location_and_group_names = {}
+        self.name_indices = {}
         self.item_names = collections.defaultdict(
             lambda: Utils.KeyedDefaultDict(lambda code: f'Unknown item (ID:{code})'))
         self.location_names = collections.defaultdict(
@@ -286,22 +325,29 @@ class Context:
 
     # Data package retrieval
     def _load_game_data(self):
-        import worlds
-        self.gamespackage = worlds.network_data_package["games"]
-
-        self.item_name_groups = {world_name: world.item_name_groups for world_name, world in
-                                 worlds.AutoWorldRegister.world_types.items()}
-        self.location_name_groups = {world_name: world.location_name_groups for world_name, world in
-                                     worlds.AutoWorldRegister.world_types.items()}
-        for world_name, world in worlds.AutoWorldRegister.world_types.items():
-            self.non_hintable_names[world_name] = world.hint_blacklist
+        # filled by _load_world_data for the games of the multidata
+        self.gamespackage = {}
+        self.item_name_groups = {}
+        self.location_name_groups = {}
 
-        for game_package in self.gamespackage.values():
-            # remove groups from data sent to clients
-            del game_package["item_name_groups"]
-            del game_package["location_name_groups"]
+    def _load_world_data(self, games: typing.AbstractSet[str]):
+        """Loads the data of the installed worlds of the games, only importing those worlds."""
+        import worlds
+        for game in games:
+            world = worlds.AutoWorldRegister.world_types.get(game)
+            if world is None:
+                continue
+            game_package = worlds.network_data_package["games"][game]
+            self.gamespackage[game] = game_package
+            self.item_name_groups[game] = world.item_name_groups
+            self.location_name_groups[game] = world.location_name_groups
+            self.non_hintable_names[game] = world.hint_blacklist
+            # remove groups from data sent to clients, unless an earlier context in this process already did
+            game_package.pop("item_name_groups", None)
+            game_package.pop("location_name_groups", None)
 
     def _init_game_data(self):
+        self.name_indices.clear()
         for game_name, game_package in self.gamespackage.items():
             if "checksum" in game_package:
                 self.checksums[game_name] = game_package["checksum"]
@@ -327,6 +373,24 @@ class Context:
     def location_names_for_game(self, game: str) -> typing.Optional[typing.Dict[str, int]]:
         return self.gamespackage[game]["location_name_to_id"] if game in self.gamespackage else None
 
+    def get_name_index(self, game: str,
+                       kind: typing.Literal["item", "location", "item_and_group", "location_and_group"]) \
+            -> Utils.FuzzyNameIndex:
+        """Fuzzy lookup index of a game's names for get_intended_text, built on first use."""
+        key = game, kind
+        index = self.name_indices.get(key)
+        if index is None:
+            if kind == "item":
+                names = self.item_names_for_game(game)
+            elif kind == "location":
+                names = self.location_names_for_game(game)
+            elif kind == "item_and_group":
+                names = self.all_item_and_group_names[game]
+            else:
+                names = self.all_location_and_group_names[game]
+            index = self.name_indices[key] = Utils.FuzzyNameIndex(names)
+        return index
+
     # General networking
     async def send_msgs(self, endpoint: Endpoint, msgs: typing.Iterable[dict]) -> bool:
         if not endpoint.socket or not endpoint.socket.open:
@@ -400,6 +464,55 @@ class Context:
         msgs = self.dumper(msgs)
         async_start(self.broadcast_send_encoded_msgs(endpoints, msgs))
 
+    def queue_set_reply(self, endpoints: typing.Iterable[Client], msg: typing.Dict[str, typing.Any]):
+        """
+        Queues a SetReply for endpoints. All SetReplies queued for a client during one event loop iteration
+        get sent to it as one message.
+        """
+        encoded: typing.Optional[str] = None
+        for endpoint in endpoints:
+            if encoded is None:
+                encoded = self.dumper([msg])[1:-1]
+                if not self.pending_set_replies:
+                    asyncio.get_running_loop().call_soon(self.send_set_replies)
+            self.pending_set_replies.setdefault(endpoint, []).append(encoded)
+
+    def send_set_replies(self):
+        pending, self.pending_set_replies = self.pending_set_replies, {}
+        # clients subscribed to the same keys get the same message, so it only gets joined once
+        by_replies: typing.Dict[typing.Tuple[str, ...], typing.List[Client]] = collections.defaultdict(list)
+        for endpoint, replies in pending.items():
+            by_replies[tuple(replies)].append(endpoint)
+        for replies, endpoints in by_replies.items():
+            async_start(self.broadcast_send_encoded_msgs(endpoints, f"[{','.join(replies)}]"))
+
+    def set_stored_data(self, client: Client, sets: typing.List[typing.Dict[str, typing.Any]]):
+        """
+        Applies the operations of Set packages to the data storage and queues their SetReplies. All sets are applied
+        before anything gets stored, so if one of them fails, for example through an unknown operation, none of them
+        change the data storage.
+        """
+        values: typing.Dict[str, typing.Any] = {}
+        replies: typing.List[typing.Dict[str, typing.Any]] = []
+        for args in sets:
+            key = args["key"]
+            original_value = values[key] if key in values else self.stored_data.get(key, args.get("default", 0))
+            # operations like "update" change containers in place, so they work on a copy
+            value = copy.copy(original_value)
+            for operation in args["operations"]:
+                func = modify_functions[operation["operation"]]
+                value = func(value, operation["value"])
+            values[key] = value
+            replies.append({**args, "cmd": "SetReply", "original_value": original_value, "value": value,
+                            "slot": client.slot})
+        self.stored_data.update(values)
+        for reply in replies:
+            targets = self.stored_data_notification_clients.get_subscribers(reply["key"])
+            if reply.get("want_reply", False):
+                targets.add(client)
+            self.queue_set_reply(targets, reply)
+        self.save()
+
     async def disconnect(self, endpoint: Client):
         if endpoint in self.endpoints:
             self.endpoints.remove(endpoint)
@@ -511,6 +624,7 @@ class Context:
             server_options = decoded_obj.get("server_options", {})
             self._set_options(server_options)
 
+        self._load_world_data({"Archipelago", *self.games.values()})
         # embedded data package
         for game_name, data in decoded_obj.get("datapackage", {}).items():
             if game_name in game_data_packages:
@@ -822,15 +936,15 @@ class Context:
 
     def on_changed_hints(self, team: int, slot: int):
         key: str = f"_read_hints_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        targets: typing.Set[Client] = self.stored_data_notification_clients.get_subscribers(key)
         if targets:
-            self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.hints[team, slot]}])
+            self.queue_set_reply(targets, {"cmd": "SetReply", "key": key, "value": self.hints[team, slot]})
 
     def on_client_status_change(self, team: int, slot: int):
         key: str = f"_read_client_status_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        targets: typing.Set[Client] = self.stored_data_notification_clients.get_subscribers(key)
         if targets:
-            self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.client_game_state[team, slot]}])
+            self.queue_set_reply(targets, {"cmd": "SetReply", "key": key, "value": self.client_game_state[team, slot]})
 
 
 def update_aliases(ctx: Context, team: int):
@@ -1583,10 +1697,11 @@ class ClientMessageProcessor(CommonCommandProcessor):
     def _cmd_getitem(self, item_name: str) -> bool:
         """Cheat in an item, if it is enabled on this server"""
         if self.ctx.item_cheat:
-            names = self.ctx.item_names_for_game(self.ctx.games[self.client.slot])
+            game = self.ctx.games[self.client.slot]
+            names = self.ctx.item_names_for_game(game)
             item_name, usable, response = get_intended_text(
                 item_name,
-                names
+                self.ctx.get_name_index(game, "item")
             )
             if usable:
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
@@ -1643,9 +1758,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
             if game not in self.ctx.all_item_and_group_names:
                 self.output("Can't look up item/location for unknown game. Hint for ID instead.")
                 return False
-            names = self.ctx.all_location_and_group_names[game] \
-                if for_location else \
-                self.ctx.all_item_and_group_names[game]
+            names = self.ctx.get_name_index(game, "location_and_group" if for_location else "item_and_group")
             hint_name, usable, response = get_intended_text(input_text, names)
 
             if usable:
@@ -1768,7 +1881,7 @@ def get_slot_points(ctx: Context, team: int, slot: int) -> int:
             ctx.get_hint_cost(slot) * ctx.hints_used[team, slot])
 
 
-async def process_client_cmd(ctx: Context, client: Client, args: dict):
+async def process_client_cmd(ctx: Context, client: Client, args: typing.Dict[str, typing.Any]):
     try:
         cmd: str = args["cmd"]
     except:
@@ -2039,33 +2152,43 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             await ctx.send_msgs(client, [args])
 
         elif cmd == "Set":
-            if "key" not in args or args["key"].startswith("_read_") or \
-                    "operations" not in args or not type(args["operations"]) == list:
+            if not is_valid_set(args):
                 await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
                                               "text": 'Set', "original_cmd": cmd}])
                 return
-            args["cmd"] = "SetReply"
-            value = ctx.stored_data.get(args["key"], args.get("default", 0))
-            args["original_value"] = copy.copy(value)
-            args["slot"] = client.slot
-            for operation in args["operations"]:
-                func = modify_functions[operation["operation"]]
-                value = func(value, operation["value"])
-            ctx.stored_data[args["key"]] = args["value"] = value
-            targets = set(ctx.stored_data_notification_clients[args["key"]])
-            if args.get("want_reply", False):
-                targets.add(client)
-            if targets:
-                ctx.broadcast(targets, [args])
-            ctx.save()
+            ctx.set_stored_data(client, [args])
+
+        elif cmd == "SetBatch":
+            if "sets" not in args or type(args["sets"]) != list or \
+                    not all(type(set_args) == dict and is_valid_set(set_args) for set_args in args["sets"]):
+                await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
+                                              "text": 'SetBatch', "original_cmd": cmd}])
+                return
+            try:
+                ctx.set_stored_data(client, args["sets"])
+            except Exception as e:
+                await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
+                                              "text": f"SetBatch: {e!r}", "original_cmd": cmd}])
 
         elif cmd == "SetNotify":
-            if "keys" not in args or type(args["keys"]) != list:
+            if "keys" not in args and "prefixes" not in args or \
+                    not is_str_list(args.get("keys", [])) or not is_str_list(args.get("prefixes", [])):
                 await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
                                               "text": 'SetNotify', "original_cmd": cmd}])
                 return
-            for key in args["keys"]:
-                ctx.stored_data_notification_clients[key].add(client)
+            for key in args.get("keys", []):
+                ctx.stored_data_notification_clients.add_key(key, client)
+            for prefix in args.get("prefixes", []):
+                ctx.stored_data_notification_clients.add_prefix(prefix, client)
+
+
+def is_str_list(value: typing.Any) -> bool:
+    return type(value) == list and all(type(entry) == str for entry in value)
+
+
+def is_valid_set(args: dict) -> bool:
+    return type(args.get("key")) == str and not args["key"].startswith("_read_") and \
+        type(args.get("operations")) == list
 
 
 def update_client_status(ctx: Context, client: Client, new_status: ClientStatus):
@@ -2229,7 +2352,8 @@ class ServerCommandProcessor(CommonCommandProcessor):
             team, slot = self.ctx.player_name_lookup[seeked_player]
             item_name = " ".join(item_name)
             names = self.ctx.item_names_for_game(self.ctx.games[slot])
-            item_name, usable, response = get_intended_text(item_name, names)
+            item_name, usable, response = get_intended_text(item_name,
+                                                            self.ctx.get_name_index(self.ctx.games[slot], "item"))
             if usable:
                 amount: int = int(amount)
                 if amount > 100:
@@ -2264,7 +2388,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif self.ctx.location_names_for_game(game) is not None:
-                location, usable, response = get_intended_text(full_name, self.ctx.location_names_for_game(game))
+                location, usable, response = get_intended_text(full_name, self.ctx.get_name_index(game, "location"))
             else:
                 self.output("Can't look up location for unknown game. Send by ID instead.")
                 return False
@@ -2295,7 +2419,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 item, usable, response = int(full_name), True, None
             elif game in self.ctx.all_item_and_group_names:
-                item, usable, response = get_intended_text(full_name, self.ctx.all_item_and_group_names[game])
+                item, usable, response = get_intended_text(full_name, self.ctx.get_name_index(game, "item_and_group"))
             else:
                 self.output("Can't look up item for unknown game. Hint for ID instead.")
                 return False
@@ -2334,7 +2458,8 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif game in self.ctx.all_location_and_group_names:
-                location, usable, response = get_intended_text(full_name, self.ctx.all_location_and_group_names[game])
+                location, usable, response = get_intended_text(full_name,
+                                                               self.ctx.get_name_index(game, "location_and_group"))
             else:
                 self.output("Can't look up location for unknown game. Hint for ID instead.")
                 return False
@@ -32,6 +32,9 @@ from websockets.exceptions import WebSocketException, ConnectionClosed
 
 snes_logger = logging.getLogger("SNES")
 
+snes_ranges_per_request = 8
+"""Ranges to read per GetAddress request. Larger batches of ranges are sent as multiple requests back to back."""
+
 
 class DeathState(enum.IntEnum):
     killing_player = 1
@@ -128,6 +131,9 @@ class SNIContext(CommonContext):
     snes_recv_queue: "asyncio.Queue[bytes]"
     snes_request_lock: asyncio.Lock
     snes_write_buffer: typing.List[typing.Tuple[int, bytes]]
+    snes_read_cache: typing.Dict[int, bytes]
+    """Data read by snes_read_ranges during the current tick, by address"""
+    snes_read_cache_active: bool
     snes_connector_lock: threading.Lock
     death_state: DeathState
     killing_player_task: "typing.Optional[asyncio.Task[None]]"
@@ -154,6 +160,8 @@ class SNIContext(CommonContext):
         self.snes_recv_queue = asyncio.Queue()
         self.snes_request_lock = asyncio.Lock()
         self.snes_write_buffer = []
+        self.snes_read_cache = {}
+        self.snes_read_cache_active = False
         self.snes_connector_lock = threading.Lock()
         self.death_state = DeathState.alive  # for death link flop behaviour
         self.killing_player_task = None
@@ -514,7 +522,9 @@ async def snes_recv_loop(ctx: SNIContext) -> None:
             ctx.snes_autoreconnect_task = asyncio.create_task(snes_autoreconnect(ctx), name="snes auto-reconnect")
 
 
-async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+async def _snes_get_address(ctx: SNIContext, ranges: typing.Sequence[typing.Tuple[int, int]]) \
+        -> typing.Optional[bytes]:
+    """Reads all ranges with GetAddress requests sent back to back, and returns their data concatenated."""
     try:
         await ctx.snes_request_lock.acquire()
 
@@ -526,17 +536,24 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
         ):
             return None
 
-        GetAddress_Request: SNESRequest = {
-            "Opcode": "GetAddress",
-            "Space": "SNES",
-            "Operands": [hex(address)[2:], hex(size)[2:]]
-        }
+        size = 0
         try:
-            await ctx.snes_socket.send(dumps(GetAddress_Request))
+            for index in range(0, len(ranges), snes_ranges_per_request):
+                operands: typing.List[str] = []
+                for address, range_size in ranges[index:index + snes_ranges_per_request]:
+                    operands += [hex(address)[2:], hex(range_size)[2:]]
+                    size += range_size
+                GetAddress_Request: SNESRequest = {
+                    "Opcode": "GetAddress",
+                    "Space": "SNES",
+                    "Operands": operands
+                }
+                await ctx.snes_socket.send(dumps(GetAddress_Request))
         except ConnectionClosed:
             return None
 
-        data: bytes = bytes()
+        # SNI answers with raw binary messages, which may split the data
+        data = bytearray()
         while len(data) < size:
             try:
                 data += await asyncio.wait_for(ctx.snes_recv_queue.get(), 5)
@@ -544,7 +561,8 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
                 break
 
         if len(data) != size:
-            snes_logger.error('Error reading %s, requested %d bytes, received %d' % (hex(address), size, len(data)))
+            snes_logger.error('Error reading %s, requested %d bytes, received %d' %
+                              (", ".join(hex(address) for address, _ in ranges), size, len(data)))
             if len(data):
                 snes_logger.error(str(data))
                 snes_logger.warning('Communication Failure with SNI')
@@ -552,11 +570,63 @@ async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional
                 await ctx.snes_socket.close()
             return None
 
-        return data
+        return bytes(data)
     finally:
         ctx.snes_request_lock.release()
 
 
+async def snes_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+    return await _snes_get_address(ctx, [(address, size)])
+
+
+def merge_snes_ranges(ranges: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[typing.Tuple[int, int]]:
+    """Merges overlapping and adjacent (address, size) ranges, sorted by address."""
+    merged: typing.List[typing.Tuple[int, int]] = []
+    for address, size in sorted(ranges):
+        if merged and address <= merged[-1][0] + merged[-1][1]:
+            start, merged_size = merged[-1]
+            merged[-1] = (start, max(start + merged_size, address + size) - start)
+        else:
+            merged.append((address, size))
+    return merged
+
+
+def _get_cached_read(ctx: SNIContext, address: int, size: int) -> typing.Optional[bytes]:
+    for cached_address, data in ctx.snes_read_cache.items():
+        if cached_address <= address and address + size <= cached_address + len(data):
+            return data[address - cached_address:address - cached_address + size]
+    return None
+
+
+async def snes_read_ranges(ctx: SNIContext, ranges: typing.Iterable[typing.Tuple[int, int]]) \
+        -> typing.Optional[typing.Dict[typing.Tuple[int, int], bytes]]:
+    """
+    Reads many (address, size) ranges in one round trip to SNI and returns their data by range, in the order they were
+    given, or None if reading failed. Overlapping and adjacent ranges are read as one.
+    While the game watcher runs the client handler, read data is kept for the rest of that tick, so all reads in a
+    tick see the same snapshot and ranges that were already read are not read again. Writes clear the snapshot.
+    """
+    ranges = list(dict.fromkeys(ranges))
+    missing = [(address, size) for address, size in ranges if _get_cached_read(ctx, address, size) is None]
+    results: typing.Dict[typing.Tuple[int, int], bytes] = {}
+    if missing:
+        merged = merge_snes_ranges(missing)
+        data = await _snes_get_address(ctx, merged)
+        if data is None:
+            return None
+        position = 0
+        for address, size in merged:
+            block = data[position:position + size]
+            position += size
+            if ctx.snes_read_cache_active and len(block) > len(ctx.snes_read_cache.get(address, b"")):
+                ctx.snes_read_cache[address] = block
+            for read_address, read_size in missing:
+                if address <= read_address and read_address + read_size <= address + size:
+                    results[read_address, read_size] = block[read_address - address:read_address - address + read_size]
+    return {(address, size): results[address, size] if (address, size) in results
+            else typing.cast(bytes, _get_cached_read(ctx, address, size)) for address, size in ranges}
+
+
 async def snes_write(ctx: SNIContext, write_list: typing.List[typing.Tuple[int, bytes]]) -> bool:
     try:
         await ctx.snes_request_lock.acquire()
@@ -566,6 +636,7 @@ async def snes_write(ctx: SNIContext, write_list: typing.List[typing.Tuple[int,
             return False
 
         PutAddress_Request: SNESRequest = {"Opcode": "PutAddress", "Operands": [], 'Space': 'SNES'}
+        ctx.snes_read_cache.clear()
         try:
             for address, data in write_list:
                 PutAddress_Request['Operands'] = [hex(address)[2:], hex(len(data))[2:]]
@@ -599,6 +670,56 @@ async def snes_flush_writes(ctx: SNIContext) -> None:
     await snes_write(ctx, writes)
 
 
+class SNESMemoryWatcher:
+    """
+    Watches ranges of SNES memory and only reports the ones that changed since the last poll, so a game watcher
+    doesn't have to compare the same location flags or item counters on every tick.
+    SNI can't watch memory by itself, so the ranges still get read, but ranges given an interval are read less often.
+    """
+    watches: typing.Dict[str, typing.Tuple[int, int, float]]
+    """Address, size and least seconds between two reads of each range"""
+    data: typing.Dict[str, bytes]
+    """The last known contents of each watched range"""
+    _last_read: typing.Dict[str, float]
+
+    def __init__(self) -> None:
+        self.watches = {}
+        self.data = {}
+        self._last_read = {}
+
+    def watch(self, name: str, address: int, size: int, interval: float = 0) -> None:
+        """Starts watching size bytes at address, reading them at most every interval seconds."""
+        self.watches[name] = (address, size, interval)
+        self.data.pop(name, None)
+        self._last_read.pop(name, None)
+
+    def unwatch(self, name: str) -> None:
+        self.watches.pop(name, None)
+        self.data.pop(name, None)
+        self._last_read.pop(name, None)
+
+    async def poll(self, ctx: SNIContext) -> typing.Dict[str, bytes]:
+        """
+        Returns the new contents of the ranges that changed since the last poll, by name.
+        The first poll after watching a range always reports it. All due ranges are read in one batch, nothing is
+        reported if reading fails.
+        """
+        now = time.monotonic()
+        due = {name: (address, size) for name, (address, size, interval) in self.watches.items()
+               if name not in self._last_read or now - self._last_read[name] >= interval}
+        if not due:
+            return {}
+        results = await snes_read_ranges(ctx, due.values())
+        if results is None:
+            return {}
+        changes: typing.Dict[str, bytes] = {}
+        for name, read_range in due.items():
+            self._last_read[name] = now
+            if self.data.get(name) != results[read_range]:
+                changes[name] = self.data[name] = results[read_range]
+        return changes
+
+
 async def game_watcher(ctx: SNIContext) -> None:
     perf_counter = time.perf_counter()
     while not ctx.exit_event.is_set():
@@ -659,12 +780,16 @@ async def game_watcher(ctx: SNIContext) -> None:
         perf_counter = time.perf_counter()
 
         try:
+            ctx.snes_read_cache_active = True
             await ctx.client_handler.game_watcher(ctx)
         except Exception as e:
             snes_logger.error(f"An error occurred, see logs for details: {e}")
             text_file_logger = logging.getLogger()
             text_file_logger.exception(e)
             await snes_disconnect(ctx)
+        finally:
+            ctx.snes_read_cache_active = False
+            ctx.snes_read_cache.clear()
 
 
 async def run_game(romfile: str) -> None:
@@ -12,6 +12,7 @@ import pickle
 import functools
 import io
 import collections
+import bisect
 import importlib
 import logging
 import warnings
@@ -346,15 +347,9 @@ def get_file_safe_name(name: str) -> str:
 
 def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) -> Dict[str, Any]:
     if checksum and game:
-        if checksum != get_file_safe_name(checksum):
-            raise ValueError(f"Bad symbols in checksum: {checksum}")
-        path = cache_path("datapackage", get_file_safe_name(game), f"{checksum}.json")
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8-sig") as f:
-                    return json.load(f)
-            except Exception as e:
-                logging.debug(f"Could not load data package: {e}")
+        data_package = data_package_store.open(game, checksum)
+        if data_package is not None:
+            return data_package.to_dict()
 
     # fall back to old cache
     cache = persistent_load().get("datapackage", {}).get("games", {}).get(game, {})
@@ -366,17 +361,445 @@ def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) ->
 
 
 def store_data_package_for_checksum(game: str, data: typing.Dict[str, Any]) -> None:
-    checksum = data.get("checksum")
-    if checksum and game:
+    data_package_store.store(game, data)
+
+
+class DataPackageTable(typing.Mapping[int, str]):
+    """
+    Lazy id -> name lookup of one table of a CompactDataPackage. Ids and names are binary searched in the memory mapped
+    file and only decoded when looked up. get_code looks up the id of a name.
+    """
+    _codes: memoryview
+    _ends: memoryview
+    _order: memoryview
+    _pool: memoryview
+
+    def __init__(self, view: memoryview, count: int) -> None:
+        ends_start = count * 8
+        order_start = ends_start + count * 4
+        pool_start = order_start + count * 4
+        self._codes = view[:ends_start].cast("q")
+        self._ends = view[ends_start:order_start].cast("I")
+        self._order = view[order_start:pool_start].cast("I")
+        self._pool = view[pool_start:pool_start + (self._ends[-1] if count else 0)]
+
+    @staticmethod
+    def build(name_to_id: typing.Mapping[str, int]) -> bytes:
+        """Packs a name -> id table: ids sorted, the end of each name, the order of the names and the names."""
+        import array
+
+        entries = sorted((code, name.encode("utf-8")) for name, code in name_to_id.items())
+        codes = array.array("q", (code for code, _ in entries))
+        ends = array.array("I", itertools.accumulate(len(name) for _, name in entries))
+        order = array.array("I", sorted(range(len(entries)), key=lambda index: entries[index][1]))
+        data = b"".join((codes.tobytes(), ends.tobytes(), order.tobytes(), *(name for _, name in entries)))
+        # keep the next table's ids aligned
+        return data + bytes(-len(data) % 8)
+
+    def _name_bytes(self, index: int) -> memoryview:
+        return self._pool[self._ends[index - 1] if index else 0:self._ends[index]]
+
+    def __getitem__(self, code: int) -> str:
+        if not isinstance(code, int):
+            raise KeyError(code)
+        index = bisect.bisect_left(self._codes, code)
+        if index == len(self._codes) or self._codes[index] != code:
+            raise KeyError(code)
+        return str(self._name_bytes(index), "utf-8")
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __iter__(self) -> typing.Iterator[int]:
+        return iter(self._codes)
+
+    def get_code(self, name: str) -> Optional[int]:
+        """Returns the id of name, or None if the table does not have it."""
+        encoded = name.encode("utf-8")
+        position = bisect.bisect_left(self._order, encoded, key=lambda index: bytes(self._name_bytes(index)))
+        if position < len(self._order):
+            index = self._order[position]
+            if self._name_bytes(index) == encoded:
+                return self._codes[index]
+        return None
+
+    def name_to_id(self) -> Dict[str, int]:
+        """Decodes the whole table to a name -> id dict, in order of the ids."""
+        pool = bytes(self._pool)
+        starts = itertools.chain((0,), self._ends)
+        return {pool[start:end].decode("utf-8"): code for code, start, end in zip(self._codes, starts, self._ends)}
+
+    def release(self) -> None:
+        for view in (self._codes, self._ends, self._order, self._pool):
+            view.release()
+
+
+class CompactDataPackage:
+    """
+    Data package of one game in the binary format of DataPackageStore, memory mapped so ids and names are only
+    decoded when they get looked up. The file is in native byte order, as it is only a local cache.
+
+    Layout: the header, the item table, the location table, then every other key of the data package as JSON.
+    """
+    magic: typing.ClassVar[bytes] = b"APDP"
+    format_version: typing.ClassVar[int] = 1
+    header_format: typing.ClassVar[str] = "=4sHxxIIIIII"
+    """magic, version, then count and offset of items, count and offset of locations, size and offset of the rest"""
+    checksum: str
+    item_names: DataPackageTable
+    """id -> name of the items"""
+    location_names: DataPackageTable
+    """id -> name of the locations"""
+    _mmap: "mmap.mmap"
+    _view: memoryview
+    _rest: typing.Tuple[int, int]
+
+    def __init__(self, path: str, checksum: str) -> None:
+        import mmap
+        import struct
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, item_count, item_offset, location_count, location_offset, rest_size, rest_offset = \
+                struct.unpack_from(self.header_format, self._mmap)
+            if magic != self.magic or version != self.format_version:
+                raise ValueError(f"{path} is not a data package of format version {self.format_version}")
+            self._view = memoryview(self._mmap)
+            self.item_names = DataPackageTable(self._view[item_offset:], item_count)
+            self.location_names = DataPackageTable(self._view[location_offset:], location_count)
+        except Exception:
+            self._mmap.close()
+            raise
+        self.checksum = checksum
+        self._rest = (rest_offset, rest_size)
+
+    @classmethod
+    def build(cls, data: typing.Mapping[str, Any]) -> bytes:
+        import struct
+
+        header_size = struct.calcsize(cls.header_format)
+        items = DataPackageTable.build(data["item_name_to_id"])
+        locations = DataPackageTable.build(data["location_name_to_id"])
+        rest = json.dumps({key: value for key, value in data.items()
+                           if key not in ("item_name_to_id", "location_name_to_id")},
+                          ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        header = struct.pack(cls.header_format, cls.magic, cls.format_version,
+                             len(data["item_name_to_id"]), header_size,
+                             len(data["location_name_to_id"]), header_size + len(items),
+                             len(rest), header_size + len(items) + len(locations))
+        return b"".join((header, items, locations, rest))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decodes the whole data package, as it was stored."""
+        rest_offset, rest_size = self._rest
+        data: Dict[str, Any] = json.loads(self._mmap[rest_offset:rest_offset + rest_size].decode("utf-8"))
+        data["item_name_to_id"] = self.item_names.name_to_id()
+        data["location_name_to_id"] = self.location_names.name_to_id()
+        return data
+
+    def close(self) -> None:
+        self.item_names.release()
+        self.location_names.release()
+        self._view.release()
+        self._mmap.close()
+
+
+class DataPackageStore:
+    """
+    Content addressed cache of data packages. Each checksum is stored once as a CompactDataPackage file, and an index
+    records which checksums each game was stored with and when they were last used, so stale ones can be collected.
+    Data packages that are still in the cache format of older versions, one JSON file per game and checksum, are moved
+    into the store when they are opened.
+    """
+    index_version: typing.ClassVar[int] = 1
+    max_age: float
+    """Seconds after their last use after which checksums, except the last used one of each game, get collected."""
+    _path: Optional[str]
+    _lock: "threading.RLock"
+    _opened: Dict[str, CompactDataPackage]
+
+    def __init__(self, path: Optional[str] = None, max_age: float = 30 * 24 * 60 * 60) -> None:
+        import threading
+
+        self._path = path
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._opened = {}
+
+    @property
+    def path(self) -> str:
+        return self._path or cache_path("datapackage")
+
+    def _file(self, checksum: str) -> str:
         if checksum != get_file_safe_name(checksum):
             raise ValueError(f"Bad symbols in checksum: {checksum}")
-        game_folder = cache_path("datapackage", get_file_safe_name(game))
-        os.makedirs(game_folder, exist_ok=True)
+        return os.path.join(self.path, f"{checksum}.apdp")
+
+    def _legacy_file(self, game: str, checksum: str) -> str:
+        return os.path.join(self.path, get_file_safe_name(game), f"{checksum}.json")
+
+    def _load_index(self) -> Dict[str, Dict[str, float]]:
+        """game -> checksum -> time of last use"""
         try:
-            with open(os.path.join(game_folder, f"{checksum}.json"), "w", encoding="utf-8-sig") as f:
-                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            with open(os.path.join(self.path, "index.json"), "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == self.index_version:
+                return index["games"]
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            logging.debug(f"Could not store data package: {e}")
+            logging.debug(f"Could not load data package index: {e}")
+        return {}
+
+    def _save_index(self, games: Dict[str, Dict[str, float]]) -> None:
+        index_file = os.path.join(self.path, "index.json")
+        # write to a temporary file first, other clients may be reading the index
+        temp_file = f"{index_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"version": self.index_version, "games": games}, f, ensure_ascii=False)
+        os.replace(temp_file, index_file)
+
+    def store(self, game: str, data: typing.Mapping[str, Any]) -> None:
+        """Stores the data package of game under its checksum. Data packages without checksum are not stored."""
+        import time
+
+        checksum = data.get("checksum")
+        if not checksum or not game:
+            return
+        path = self._file(checksum)
+        with self._lock:
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                if not os.path.exists(path):
+                    temp_file = f"{path}.{os.getpid()}.tmp"
+                    with open(temp_file, "wb") as f:
+                        f.write(CompactDataPackage.build(data))
+                    os.replace(temp_file, path)
+                games = self._load_index()
+                checksums = games.setdefault(game, {})
+                new_checksum = checksum not in checksums
+                checksums[checksum] = time.time()
+                self._save_index(games)
+                if new_checksum and len(checksums) > 1:
+                    self.collect_garbage()
+            except Exception as e:
+                logging.debug(f"Could not store data package: {e}")
+
+    def open(self, game: str, checksum: str) -> Optional[CompactDataPackage]:
+        """Returns the stored data package of game with checksum, or None if it is not stored."""
+        import time
+
+        path = self._file(checksum)
+        with self._lock:
+            data_package = self._opened.get(checksum)
+            if data_package is None:
+                if not os.path.exists(path):
+                    self._migrate(game, checksum)
+                try:
+                    data_package = self._opened[checksum] = CompactDataPackage(path, checksum)
+                except FileNotFoundError:
+                    return None
+                except Exception as e:
+                    logging.debug(f"Could not load data package: {e}")
+                    return None
+            try:
+                games = self._load_index()
+                checksums = games.setdefault(game, {})
+                # only note uses once in a while, most clients open the same data packages every time
+                if time.time() - checksums.get(checksum, 0) > 60 * 60:
+                    checksums[checksum] = time.time()
+                    self._save_index(games)
+            except Exception as e:
+                logging.debug(f"Could not update data package index: {e}")
+            return data_package
+
+    def _migrate(self, game: str, checksum: str) -> None:
+        legacy_file = self._legacy_file(game, checksum)
+        if os.path.exists(legacy_file):
+            try:
+                with open(legacy_file, "r", encoding="utf-8-sig") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logging.debug(f"Could not load data package: {e}")
+                return
+            if data.get("checksum") == checksum:
+                self.store(game, data)
+
+    def collect_garbage(self) -> int:
+        """
+        Removes checksums that were not used for max_age seconds, except the last used one of each game, and files that
+        are not in the index or were moved into the store. Returns how many data packages got removed.
+        """
+        import time
+
+        removed = 0
+        with self._lock:
+            now = time.time()
+            games = self._load_index()
+            for checksums in games.values():
+                latest = max(checksums, key=checksums.__getitem__)
+                for checksum, last_use in list(checksums.items()):
+                    if checksum != latest and now - last_use > self.max_age:
+                        del checksums[checksum]
+            games = {game: checksums for game, checksums in games.items() if checksums}
+            kept = {checksum for checksums in games.values() for checksum in checksums}
+            self._save_index(games)
+            for entry in os.scandir(self.path):
+                try:
+                    if entry.is_dir():
+                        # cache of older versions
+                        for legacy_entry in os.scandir(entry.path):
+                            if legacy_entry.name.removesuffix(".json") in kept:
+                                os.unlink(legacy_entry.path)
+                        if not any(os.scandir(entry.path)):
+                            os.rmdir(entry.path)
+                        continue
+                    checksum = entry.name.removesuffix(".apdp")
+                    # files of other processes are only removed once they are old enough to be abandoned
+                    if checksum != entry.name and checksum not in kept and \
+                            now - entry.stat().st_mtime > self.max_age:
+                        opened = self._opened.pop(checksum, None)
+                        if opened is not None:
+                            opened.close()
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError as e:
+                    # may still be opened by another client, on Windows
+                    logging.debug(f"Could not remove stale data package {entry.name}: {e}")
+        return removed
+
+
+class DataModule:
+    """
+    Literal values of a module that only holds data, like large generated region or logic tables, loaded on first
+    attribute access from a marshalled cache instead of evaluating the module's source on every import.
+    The cache is keyed by a checksum of the source, so changing the module rebuilds it by importing the module once.
+    Only literals survive caching: dicts, lists, tuples, sets, strings, numbers, bools and None.
+    """
+    cache_version: typing.ClassVar[int] = 1
+    literal_types: typing.ClassVar[typing.Tuple[type, ...]] = (dict, list, tuple, set, frozenset, str, bytes, int,
+                                                                float, bool, type(None))
+    module_name: str
+    _values: Optional[Dict[str, Any]]
+
+    def __init__(self, module_name: str) -> None:
+        self.module_name = module_name
+        self._values = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._values is None:
+            self._values = self._load()
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"data module {self.module_name!r} has no attribute {name!r}") from None
+
+    def _load(self) -> Dict[str, Any]:
+        import hashlib
+        import importlib.util
+        import marshal
+
+        spec = importlib.util.find_spec(self.module_name)
+        if spec is None or spec.origin is None or spec.loader is None:
+            raise ModuleNotFoundError(f"No module named {self.module_name!r}", name=self.module_name)
+        # get_data also reads sources from inside .apworld archives
+        source: bytes = spec.loader.get_data(spec.origin)  # type: ignore[attr-defined]
+        checksum = hashlib.sha1(source).hexdigest()
+        cache_folder = cache_path("data", get_file_safe_name(self.module_name))
+        cache_file = os.path.join(cache_folder, f"{self.cache_version}-{marshal.version}-{checksum}.bin")
+        try:
+            with open(cache_file, "rb") as f:
+                return marshal.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Could not load data cache of {self.module_name}: {e}")
+
+        module = importlib.import_module(self.module_name)
+        values = {name: value for name, value in vars(module).items()
+                  if not name.startswith("_") and isinstance(value, self.literal_types)}
+        try:
+            os.makedirs(cache_folder, exist_ok=True)
+            # write to a temporary file first, other processes may be loading the same module
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, "wb") as f:
+                marshal.dump(values, f)
+            os.replace(temp_file, cache_file)
+            for entry in os.scandir(cache_folder):
+                if entry.path != cache_file and entry.name.endswith(".bin"):
+                    os.unlink(entry.path)
+        except Exception as e:
+            logging.debug(f"Could not store data cache of {self.module_name}: {e}")
+        return values
+
+
+class FileImageCache:
+    """
+    Cache of the contents of read-only input files, like base ROMs, so all players and worlds that need the same file
+    share one immutable copy instead of reading it again. Used as a context manager around a generation's output, which
+    clears it afterwards, so the files are not kept in memory between generations.
+    Files are looked up by path, size and modification time, so a replaced file gets read again. Contents are keyed by
+    their SHA-256, so files with the same contents under different paths are stored once.
+    """
+    max_images: int
+    _lock: "threading.Lock"
+    _digests: Dict[typing.Tuple[str, int, int], str]
+    _images: "collections.OrderedDict[str, bytes]"
+
+    def __init__(self, max_images: int = 4) -> None:
+        import threading
+
+        self.max_images = max_images
+        self._lock = threading.Lock()
+        self._digests = {}
+        self._images = collections.OrderedDict()
+
+    def read(self, path: str) -> bytes:
+        """Returns the contents of the file at path. Patch a copy, for example a bytearray, not the result itself."""
+        import hashlib
+
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None and digest in self._images:
+                self._images.move_to_end(digest)
+                return self._images[digest]
+        # read without holding the lock, other files can be served meanwhile
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._digests = {other: other_digest for other, other_digest in self._digests.items()
+                             if other[0] != key[0]}
+            self._digests[key] = digest
+            # keep the copy that is already shared, if another path or thread got there first
+            data = self._images.setdefault(digest, data)
+            self._images.move_to_end(digest)
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._digests.clear()
+            self._images.clear()
+
+    def __enter__(self) -> "FileImageCache":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.clear()
+
+
+file_image_cache = FileImageCache()
+"""Shared cache of base files, see FileImageCache."""
+
+data_package_store = DataPackageStore()
+"""Cache of the data packages of all games clients connected to or worlds got imported for, see DataPackageStore."""
 
 
 def get_default_adjuster_settings(game_name: str) -> Namespace:
@@ -449,6 +872,10 @@ class RestrictedUnpickler(pickle.Unpickler):
             if module == "Options":
                 mod = self.options_module
             else:
+                if module.startswith("worlds."):
+                    # worlds that are not imported yet can only be imported through their world source
+                    import worlds
+                    worlds.load_lazy_world(module.split(".")[1])
                 mod = importlib.import_module(module)
             obj = getattr(mod, name)
             if issubclass(obj, (self.options_module.Option, self.options_module.PlandoConnection,
@@ -635,22 +1062,26 @@ def format_SI_prefix(value, power=1000, power_labels=("", "k", "M", "G", "T", "P
     return f"{value.quantize(decimal.Decimal('1.00'))} {chaining_prefix(n, power_labels)}"
 
 
-def get_fuzzy_results(input_word: str, word_list: typing.Collection[str], limit: typing.Optional[int] = None) \
-        -> typing.List[typing.Tuple[str, int]]:
+def _get_fuzzy_ratio(word1: str, word2: str) -> float:
     import jellyfish
 
-    def get_fuzzy_ratio(word1: str, word2: str) -> float:
-        if word1 == word2:
-            return 1.01
-        return (1 - jellyfish.damerau_levenshtein_distance(word1.lower(), word2.lower())
-                / max(len(word1), len(word2)))
+    if word1 == word2:
+        return 1.01
+    return (1 - jellyfish.damerau_levenshtein_distance(word1.lower(), word2.lower())
+            / max(len(word1), len(word2)))
+
+
+def get_fuzzy_results(input_word: str, word_list: typing.Union[typing.Collection[str], FuzzyNameIndex],
+                      limit: typing.Optional[int] = None) -> typing.List[typing.Tuple[str, int]]:
+    if isinstance(word_list, FuzzyNameIndex):
+        return word_list.get_fuzzy_results(input_word, limit)
 
     limit = limit if limit else len(word_list)
     return list(
         map(
             lambda container: (container[0], int(container[1]*100)),  # convert up to limit to int %
             sorted(
-                map(lambda candidate: (candidate, get_fuzzy_ratio(input_word, candidate)), word_list),
+                map(lambda candidate: (candidate, _get_fuzzy_ratio(input_word, candidate)), word_list),
                 key=lambda element: element[1],
                 reverse=True
             )[0:limit]
@@ -658,6 +1089,75 @@ def get_fuzzy_results(input_word: str, word_list: typing.Collection[str], limit:
     )
 
 
+def _get_trigrams(word: str) -> typing.Set[str]:
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class FuzzyNameIndex:
+    """
+    Precomputed lookup structure for repeated get_fuzzy_results calls against the same names.
+    Gives the same results, but only computes the edit distance for names that can still make it into the results,
+    using lower bounds of the distance from length difference and shared trigrams.
+    The distance is computed on grapheme clusters, so the bounds only work for ascii names, others are always computed.
+    """
+    names: typing.List[str]
+    _stats: typing.List[typing.Tuple[int, int, int]]
+    """(length, lowercase length, distinct lowercase trigram count) per name, lowercase length -1 if not ascii"""
+    _postings: typing.Dict[str, typing.List[int]]
+    """lowercase trigram -> indices of names containing it"""
+
+    def __init__(self, names: typing.Iterable[str]) -> None:
+        self.names = list(names)  # keep original order, as it decides ties
+        self._stats = []
+        self._postings = collections.defaultdict(list)
+        for index, name in enumerate(self.names):
+            lower = name.lower()
+            if not lower.isascii():
+                self._stats.append((len(name), -1, 0))
+                continue
+            trigrams = _get_trigrams(lower)
+            self._stats.append((len(name), len(lower), len(trigrams)))
+            for trigram in trigrams:
+                self._postings[trigram].append(index)
+        self._postings = dict(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.names)
+
+    def get_fuzzy_results(self, input_word: str, limit: typing.Optional[int] = None) \
+            -> typing.List[typing.Tuple[str, int]]:
+        input_lower = input_word.lower()
+        if not limit or limit >= len(self.names) or not input_lower.isascii():
+            return get_fuzzy_results(input_word, self.names, limit)
+
+        input_trigrams = _get_trigrams(input_lower)
+        shared_trigrams: typing.Counter[int] = collections.Counter()
+        for trigram in input_trigrams:
+            shared_trigrams.update(self._postings.get(trigram, ()))
+
+        # Each edit operation changes at most 4 trigrams (adjacent transposition), and at least the length difference
+        # has to be inserted or deleted. Fewest possible edits gives the highest possible ratio.
+        input_length, input_lower_length, input_trigram_count = len(input_word), len(input_lower), len(input_trigrams)
+        bounds = sorted(
+            (max(abs(lower_length - input_lower_length),
+                 -(-(max(trigram_count, input_trigram_count) - shared_trigrams.get(index, 0)) // 4))
+             / max(length, input_length) if lower_length >= 0 else 0., index)
+            for index, (length, lower_length, trigram_count) in enumerate(self._stats)
+        )
+
+        best: typing.List[typing.Tuple[float, int]] = []  # (-ratio, index), kept sorted
+        for min_distance_ratio, index in bounds:
+            # without any required edits, the name could be an exact match, which gets a bonus
+            if len(best) >= limit and (1 - min_distance_ratio if min_distance_ratio else 1.01) < -best[-1][0]:
+                break
+            bisect.insort(best, (-_get_fuzzy_ratio(input_word, self.names[index]), index))
+            del best[limit:]
+        return [(self.names[index], int(-ratio * 100)) for ratio, index in best]
+
+
 def get_intended_text(input_text: str, possible_answers) -> typing.Tuple[str, bool, str]:
     picks = get_fuzzy_results(input_text, possible_answers, limit=2)
     if len(picks) > 1:
@@ -24,6 +24,7 @@ app.jinja_env.filters['get_file_safe_name'] = get_file_safe_name
 
 app.config["SELFHOST"] = True  # application process is in charge of running the websites
 app.config["GENERATORS"] = 8  # maximum concurrent world gens
+app.config["LARGE_GENERATORS"] = 2  # of the GENERATORS, how many may run large world gens at the same time
 app.config["HOSTERS"] = 8  # maximum concurrent room hosters
 app.config["SELFLAUNCH"] = True  # application process is in charge of launching Rooms.
 app.config["SELFLAUNCHCERT"] = None  # can point to a SSL Certificate to encrypt Room websocket connections
@@ -39,8 +40,23 @@ app.config["SECRET_KEY"] = bytes(socket.gethostname(), encoding="utf-8")
 app.config["JOB_THRESHOLD"] = 1
 # after what time in seconds should generation be aborted, freeing the queue slot. Can be set to None to disable.
 app.config["JOB_TIME"] = 600
+# estimated cost (players + 2 per distinct game) from which on a generation is large and limited to LARGE_GENERATORS
+app.config["LARGE_JOB_COST"] = 30
+# seconds between checks for queued generations, backing off from min to max while the queue is idle
+app.config["GENERATION_POLL_MIN"] = 0.1
+app.config["GENERATION_POLL_MAX"] = 2
 # memory limit for generator processes in bytes
 app.config["GENERATOR_MEMORY_LIMIT"] = 4294967296
+# fork generator processes from a server that already imported all worlds, instead of importing them per process
+app.config["GENERATOR_WARM"] = False
+# replace a generator process once its private memory in bytes exceeds this after a job, None to disable
+app.config["GENERATOR_RECYCLE_MEMORY"] = 2147483648
+# replace a generator process after this many jobs, None to disable
+app.config["GENERATOR_MAX_TASKS"] = 10
+# bytes of the end of each room log kept in memory to serve the room page and log updates from
+app.config["LOG_TAIL_SIZE"] = 1024000
+# how many rooms' log ends are kept in memory per WebHost process
+app.config["LOG_CACHED_ROOMS"] = 256
 app.config['SESSION_PERMANENT'] = True
 
 # waitress uses one thread for I/O, these are for processing of views that then get sent
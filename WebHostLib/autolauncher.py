@@ -12,7 +12,9 @@ from uuid import UUID
 from pony.orm import db_session, select, commit, PrimaryKey
 
 from Utils import restricted_loads
+from .generator_pool import create_generator_pool
 from .locker import Locker, AlreadyRunningException
+from .scheduler import GenerationScheduler, SchedulerMetrics, estimate_cost
 
 _stop_event = Event()
 
@@ -45,7 +47,9 @@ def _mp_gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=No
     return res
 
 
-def launch_generator(pool: multiprocessing.pool.Pool, generation: Generation):
+def launch_generator(pool: multiprocessing.pool.Pool, generation: Generation,
+                     callback: typing.Callable[[Any], None] = handle_generation_success,
+                     error_callback: typing.Callable[[BaseException], None] = handle_generation_failure):
     try:
         meta = json.loads(generation.meta)
         options = restricted_loads(generation.options)
@@ -54,7 +58,7 @@ def launch_generator(pool: multiprocessing.pool.Pool, generation: Generation):
                          {"meta": meta,
                           "sid": generation.id,
                           "owner": generation.owner},
-                         handle_generation_success, handle_generation_failure)
+                         callback, error_callback)
     except Exception as e:
         generation.state = STATE_ERROR
         commit()
@@ -127,14 +131,69 @@ def autohost(config: dict):
     Thread(target=keep_running, name="AP_Autohost").start()
 
 
+_scheduler: GenerationScheduler | None = None
+
+
+def get_generation_metrics() -> SchedulerMetrics | None:
+    """Queue depth and wait time metrics of the running autogen scheduler, if any."""
+    scheduler = _scheduler
+    return scheduler.metrics() if scheduler else None
+
+
+def schedule_generations(scheduler: GenerationScheduler, pools: dict[str, multiprocessing.pool.Pool]) -> bool:
+    """Start queued generations that fit into a free lane. Returns whether a new queued generation was found."""
+    found_new = False
+    with db_session:
+        # for update locks the database row(s) during transaction, preventing writes from elsewhere
+        queued = {generation.id: generation for generation in select(
+            generation for generation in Generation
+            if generation.state == STATE_QUEUED).for_update()}
+        for generation in queued.values():
+            if generation.id not in scheduler:
+                found_new = True
+                try:
+                    cost = estimate_cost(restricted_loads(generation.options))
+                except Exception as e:
+                    generation.state = STATE_ERROR
+                    logging.exception(e)
+                else:
+                    scheduler.enqueue(generation.id, cost)
+
+        assignments = scheduler.schedule(generation.id for generation in queued.values()
+                                         if generation.state == STATE_QUEUED)
+        for sid, lane in assignments:
+            def done(result: Any, _sid=sid) -> None:
+                scheduler.finished(_sid)
+                handle_generation_success(result)
+
+            def failed(result: BaseException, _sid=sid) -> None:
+                scheduler.finished(_sid)
+                handle_generation_failure(result)
+
+            launch_generator(pools[lane], queued[sid], done, failed)
+            if queued[sid].state != STATE_STARTED:
+                scheduler.finished(sid)
+        commit()
+    if assignments:
+        metrics = scheduler.metrics()
+        logging.info(f"Generation queue: {metrics.queued} waiting ({metrics.queued_large} large), "
+                     f"oldest waiting {metrics.oldest_wait:.1f}s, average wait {metrics.average_wait:.1f}s")
+    return found_new
+
+
 def autogen(config: dict):
     def keep_running():
+        global _scheduler
         stop_event = _stop_event
         try:
             with Locker("autogen"):
-
-                with multiprocessing.Pool(config["GENERATORS"], initializer=init_generator,
-                                          initargs=(config,), maxtasksperchild=10) as generator_pool:
+                scheduler = GenerationScheduler(config["GENERATORS"], config["LARGE_GENERATORS"],
+                                                config["LARGE_JOB_COST"])
+                pools: dict[str, multiprocessing.pool.Pool] = {
+                    lane: create_generator_pool(slots, config, init_generator, (config,))
+                    for lane, slots in scheduler.slots.items() if slots
+                }
+                try:
                     with db_session:
                         to_start = select(generation for generation in Generation if generation.state == STATE_STARTED)
 
@@ -145,19 +204,26 @@ def autogen(config: dict):
                                 if sid:
                                     generation.delete()
                                 else:
-                                    launch_generator(generator_pool, generation)
+                                    generation.state = STATE_QUEUED  # gets picked up by the scheduler
 
                             commit()
                         select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
 
-                    while not stop_event.wait(0.1):
-                        with db_session:
-                            # for update locks the database row(s) during transaction, preventing writes from elsewhere
-                            to_start = select(
-                                generation for generation in Generation
-                                if generation.state == STATE_QUEUED).for_update()
-                            for generation in to_start:
-                                launch_generator(generator_pool, generation)
+                    _scheduler = scheduler
+                    poll_interval = config["GENERATION_POLL_MIN"]
+                    while not stop_event.is_set():
+                        if schedule_generations(scheduler, pools):
+                            poll_interval = config["GENERATION_POLL_MIN"]
+                        else:
+                            # back off while the queue is idle, a finishing job wakes us up for the freed slot
+                            poll_interval = min(poll_interval * 2, config["GENERATION_POLL_MAX"])
+                        scheduler.wakeup.wait(poll_interval)
+                        scheduler.wakeup.clear()
+                finally:
+                    if _scheduler is scheduler:
+                        _scheduler = None
+                    for pool in pools.values():
+                        pool.terminate()
         except AlreadyRunningException:
             logging.info("Autogen reports as already running, not starting another.")
 
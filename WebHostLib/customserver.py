@@ -70,7 +70,7 @@ class WebHostContext(Context):
         del self.static_server_data
         self.main_loop = asyncio.get_running_loop()
         self.video = {}
-        self.tags = ["AP", "WebHost"]
+        self.tags = ["AP", "WebHost", "DataStorageBatch"]
 
     def __del__(self):
         try:
@@ -86,6 +86,10 @@ class WebHostContext(Context):
             setattr(self, key, value)
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
+    def _load_world_data(self, games: typing.AbstractSet[str]):
+        # static server data already has the data of all worlds
+        pass
+
     def listen_to_db_commands(self):
         cmdprocessor = DBCommandProcessor(self)
 
@@ -0,0 +1,101 @@
+"""Generator worker pools, optionally forked from a pre-warmed server process and recycled by memory usage."""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import sys
+import typing
+
+# imported by the fork server before it forks generator workers, see generator_warmup
+WARMUP_MODULE = "WebHostLib.generator_warmup"
+
+
+def get_memory_usage() -> int | None:
+    """Memory in bytes that is private to the current process, so not counting copy-on-write pages still shared with
+    the fork server. None if it can't be determined on this platform."""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            return 1024 * sum(int(line.split()[1]) for line in f
+                              if line.startswith(("Private_Clean:", "Private_Dirty:")))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _SentinelWatch:
+    """Wraps a pool's task queue to tell whether the pool told the worker to exit."""
+    def __init__(self, queue: typing.Any) -> None:
+        self.queue = queue
+        self.stopped = False
+        if hasattr(queue, "_writer"):
+            self._writer = queue._writer
+
+    def get(self) -> typing.Any:
+        try:
+            task = self.queue.get()
+        except (EOFError, OSError):
+            self.stopped = True
+            raise
+        if task is None:
+            self.stopped = True
+        return task
+
+
+def _recycling_worker(inqueue: typing.Any, outqueue: typing.Any, initializer: typing.Callable[..., None] | None,
+                      initargs: tuple, maxtasks: int | None, wrap_exception: bool, memory_limit: int | None) -> None:
+    watched = _SentinelWatch(inqueue)
+    completed = 0
+    while maxtasks is None or completed < maxtasks:
+        # run the stock worker one task at a time, so we can check memory between tasks
+        multiprocessing.pool.worker(watched, outqueue, initializer, initargs, 1, wrap_exception)
+        initializer = None
+        if watched.stopped:
+            return
+        completed += 1
+        if memory_limit is not None:
+            memory = get_memory_usage()
+            if memory is not None and memory > memory_limit:
+                logging.info(f"Recycling generator worker {os.getpid()} after {completed} tasks, "
+                             f"using {memory / 2**20:.0f} MiB.")
+                return
+
+
+class RecyclingPool(multiprocessing.pool.Pool):
+    """
+    Pool that replaces workers once their private memory exceeds memory_limit after finishing a task,
+    in addition to the regular maxtasksperchild limit.
+    """
+    def __init__(self, processes: int, initializer: typing.Callable[..., None] | None = None, initargs: tuple = (),
+                 maxtasksperchild: int | None = None, context: typing.Any = None,
+                 memory_limit: int | None = None) -> None:
+        self.memory_limit = memory_limit  # needs to be set before the workers get spawned in Pool.__init__
+        super().__init__(processes, initializer, initargs, maxtasksperchild, context)
+
+    def Process(self, ctx: typing.Any, *args: typing.Any, **kwds: typing.Any) -> multiprocessing.Process:
+        kwds["target"] = _recycling_worker
+        kwds["args"] = (*kwds["args"], self.memory_limit)
+        return ctx.Process(*args, **kwds)
+
+
+def get_generator_context(warm: bool) -> typing.Any:
+    """
+    Multiprocessing context for generator workers. If warm, workers are forked from a fork server that already imported
+    all worlds and filled their caches, sharing those pages copy-on-write and skipping the imports per worker.
+    """
+    if warm and "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([WARMUP_MODULE])
+        return context
+    if warm:
+        logging.warning(f"Warm generator workers are not supported on {sys.platform}, falling back to spawning.")
+    return multiprocessing.get_context()
+
+
+def create_generator_pool(processes: int, config: dict[str, typing.Any],
+                          initializer: typing.Callable[..., None] | None = None,
+                          initargs: tuple = ()) -> RecyclingPool:
+    return RecyclingPool(processes, initializer, initargs,
+                         maxtasksperchild=config["GENERATOR_MAX_TASKS"],
+                         context=get_generator_context(config["GENERATOR_WARM"]),
+                         memory_limit=config["GENERATOR_RECYCLE_MEMORY"])
@@ -0,0 +1,20 @@
+"""
+Imported by the generator fork server before it forks warm generator workers.
+Everything imported or cached here is shared copy-on-write by all generator workers and survives between their jobs.
+"""
+import ModuleUpdate
+
+# requirements were already checked by the WebHost process that started the fork server
+ModuleUpdate.update_ran = True
+
+import Options
+from worlds import AutoWorldRegister
+
+# pulls in Generate, Main and all worlds
+from WebHostLib import generate  # noqa: F401
+
+# option class lookups done per player and job
+Options.CommonOptions.type_hints
+Options.PerGameCommonOptions.type_hints
+for world_type in AutoWorldRegister.world_types.values():
+    world_type.options_dataclass.type_hints
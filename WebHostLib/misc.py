@@ -1,15 +1,17 @@
 import datetime
 import os
-from typing import Any, IO, Dict, Iterator, List, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import jinja2.exceptions
 from flask import request, redirect, url_for, render_template, Response, session, abort, send_from_directory
 from pony.orm import count, commit, db_session
+from werkzeug.datastructures import ContentRange
 from werkzeug.utils import secure_filename
 
 from worlds.AutoWorld import AutoWorldRegister
 from . import app, cache
 from .models import Seed, Room, Command, UUID, uuid4
+from .room_log import RoomLogStore
 
 
 def get_world_theme(game_name: str):
@@ -129,13 +131,14 @@ def new_room(seed: UUID):
     return redirect(url_for("host_room", room=room.id))
 
 
-def _read_log(log: IO[Any], offset: int = 0) -> Iterator[bytes]:
-    marker = log.read(3)  # skip optional BOM
-    if marker != b'\xEF\xBB\xBF':
-        log.seek(0, os.SEEK_SET)
-    log.seek(offset, os.SEEK_CUR)
-    yield from log
-    log.close()  # free file handle as soon as possible
+_room_logs: Optional[RoomLogStore] = None
+
+
+def get_room_logs() -> RoomLogStore:
+    global _room_logs
+    if _room_logs is None:
+        _room_logs = RoomLogStore("logs", app.config["LOG_TAIL_SIZE"], app.config["LOG_CACHED_ROOMS"])
+    return _room_logs
 
 
 @app.route('/log/<suuid:room>')
@@ -144,22 +147,26 @@ def display_log(room: UUID) -> Union[str, Response, Tuple[str, int]]:
     if room is None:
         return abort(404)
     if room.owner == session["_id"]:
-        file_path = os.path.join("logs", str(room.id) + ".txt")
+        log = get_room_logs().get(room.id)
         try:
-            log = open(file_path, "rb")
-            range_header = request.headers.get("Range")
-            if range_header:
-                range_type, range_values = range_header.split('=')
-                start, end = map(str.strip, range_values.split('-', 1))
-                if range_type != "bytes" or end != "":
-                    return "Unsupported range", 500
-                # NOTE: we skip Content-Range in the response here, which isn't great but works for our JS
-                return Response(_read_log(log, int(start)), mimetype="text/plain", status=206)
-            return Response(_read_log(log), mimetype="text/plain")
+            size = log.refresh()
         except FileNotFoundError:
-            return Response(f"Logfile {file_path} does not exist. "
+            return Response(f"Logfile {log.path} does not exist. "
                             f"Likely a crash during spinup of multiworld instance or it is still spinning up.",
                             mimetype="text/plain")
+        byte_range = request.range
+        if byte_range is None or byte_range.units != "bytes" or len(byte_range.ranges) != 1:
+            response = Response(log.iter_range(0, size), mimetype="text/plain")
+        else:
+            span = byte_range.range_for_length(size)
+            if span is None:
+                response = Response("Requested range not satisfiable", mimetype="text/plain", status=416)
+                response.content_range = ContentRange("bytes", None, None, size)
+            else:
+                response = Response(log.iter_range(*span), mimetype="text/plain", status=206)
+                response.content_range = ContentRange("bytes", *span, size)
+        response.accept_ranges = "bytes"
+        return response
 
     return "Access Denied", 403
 
@@ -196,22 +203,18 @@ def host_room(room: UUID):
                  or "Discordbot" in request.user_agent.string
                  or not any(browser_token in request.user_agent.string for browser_token in browser_tokens))
 
-    def get_log(max_size: int = 0 if automated else 1024000) -> str:
+    def get_log(max_size: int = 0 if automated else 1024000) -> Tuple[str, int]:
+        """The end of the log, up to max_size bytes, and the byte offset it ends at."""
         if max_size == 0:
-            return "…"
+            return "…", 0
+        log = get_room_logs().get(room.id)
         try:
-            with open(os.path.join("logs", str(room.id) + ".txt"), "rb") as log:
-                raw_size = 0
-                fragments: List[str] = []
-                for block in _read_log(log):
-                    if raw_size + len(block) > max_size:
-                        fragments.append("…")
-                        break
-                    raw_size += len(block)
-                    fragments.append(block.decode("utf-8"))
-                return "".join(fragments)
+            log.refresh()
         except FileNotFoundError:
-            return ""
+            return "", 0
+        tail, start = log.get_tail(max_size)
+        text = tail.decode("utf-8", errors="replace")
+        return ("…" + text if start else text), start + len(tail)
 
     return render_template("hostRoom.html", room=room, should_refresh=should_refresh, get_log=get_log)
 
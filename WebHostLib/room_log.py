@@ -0,0 +1,121 @@
+"""Room log files with an in-memory tail, so polling log viewers don't re-read the file from the start."""
+from __future__ import annotations
+
+import os
+import threading
+import typing
+from collections import OrderedDict
+
+BOM = b"\xEF\xBB\xBF"
+CHUNK_SIZE = 65536
+
+
+def _get_cut(data: bytes, excess: int) -> int:
+    """Where to cut off at least `excess` bytes from the start of data, keeping lines or at least UTF-8 sequences whole."""
+    cut = data.find(b"\n", excess - 1, excess + (len(data) - excess) // 2) + 1 or excess
+    while cut < len(data) and 0x80 <= data[cut] < 0xC0:
+        cut += 1
+    return cut
+
+
+class RoomLog:
+    """
+    A room's log file, as written by the room hoster, with its most recent `tail_size` bytes kept in memory.
+    Offsets are in bytes of log content, so an optional BOM at the start of the file is not counted.
+    """
+    def __init__(self, path: str, tail_size: int) -> None:
+        self.path = path
+        self.tail_size = tail_size
+        self.tail = b""
+        self.tail_start = 0
+        """Content offset of the first byte of tail."""
+        self.size = 0
+        """Content bytes of the log that were seen so far."""
+        self._header: int | None = None
+        self._identity: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """Read what got appended to the log file since the last refresh and return the content size.
+        Raises FileNotFoundError if there is no log file."""
+        with self._lock, open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self._identity or stat.st_size < (self._header or 0) + self.size:
+                # new or truncated log file
+                self._identity = identity
+                self._header = None
+                self.tail = b""
+                self.tail_start = self.size = 0
+            if self._header is None:
+                if not stat.st_size:
+                    return 0
+                self._header = len(BOM) if f.read(len(BOM)) == BOM else 0
+            end = stat.st_size - self._header
+            if end > self.size:
+                if end - self.size > self.tail_size + 1:
+                    # skip what wouldn't fit into the tail anyway, one extra byte to tell whether it starts a line
+                    self.tail = b""
+                    self.tail_start = self.size = end - self.tail_size - 1
+                f.seek(self._header + self.size)
+                self._append(f.read(end - self.size))
+            return self.size
+
+    def _append(self, data: bytes) -> None:
+        self.tail += data
+        self.size += len(data)
+        excess = len(self.tail) - self.tail_size
+        if excess > 0:
+            cut = _get_cut(self.tail, excess)
+            self.tail = self.tail[cut:]
+            self.tail_start += cut
+
+    def get_tail(self, max_size: int) -> tuple[bytes, int]:
+        """Up to max_size bytes of the in-memory tail of the log and their content offset, as of the last refresh."""
+        with self._lock:
+            tail, start = self.tail, self.tail_start
+        if len(tail) > max_size:
+            cut = _get_cut(tail, len(tail) - max_size)
+            tail = tail[cut:]
+            start += cut
+        return tail, start
+
+    def iter_range(self, start: int, stop: int) -> typing.Iterator[bytes]:
+        """Yield the log content from start to stop, from memory if it is within the tail."""
+        with self._lock:
+            cached = self.tail[start - self.tail_start:stop - self.tail_start] \
+                if start >= self.tail_start and stop <= self.size else None
+            header = self._header or 0
+        if cached is not None:
+            yield cached
+            return
+        with open(self.path, "rb") as f:
+            f.seek(header + start)
+            while start < stop:
+                chunk = f.read(min(CHUNK_SIZE, stop - start))
+                if not chunk:
+                    break
+                start += len(chunk)
+                yield chunk
+
+
+class RoomLogStore:
+    """The RoomLogs of the most recently viewed rooms, shared by the threads of a WebHost process."""
+    def __init__(self, directory: str, tail_size: int, max_rooms: int) -> None:
+        self.directory = directory
+        self.tail_size = tail_size
+        self.max_rooms = max_rooms
+        self._logs: OrderedDict[str, RoomLog] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, room_id: typing.Any) -> RoomLog:
+        key = str(room_id)
+        with self._lock:
+            log = self._logs.get(key)
+            if log is None:
+                log = self._logs[key] = RoomLog(os.path.join(self.directory, f"{key}.txt"), self.tail_size)
+                while len(self._logs) > self.max_rooms:
+                    self._logs.popitem(last=False)
+            else:
+                self._logs.move_to_end(key)
+            return log
@@ -0,0 +1,137 @@
+"""Priority scheduling of queued generations onto generator worker lanes."""
+from __future__ import annotations
+
+import threading
+import time
+import typing
+from collections import deque
+from dataclasses import dataclass, field
+
+LANE_FAST = "fast"
+LANE_LARGE = "large"
+
+# every distinct game adds world setup overhead on top of the per-player work
+GAME_COST = 2
+# how many seconds of waiting halve the effective cost of a job, so big "small" jobs are not starved
+AGING_TIME = 60
+
+
+def estimate_cost(gen_options: typing.Mapping[str, typing.Mapping[str, typing.Any]]) -> int:
+    """Rough cost estimate of a generation from its player count and number of distinct games."""
+    games = {settings.get("game") for settings in gen_options.values()}
+    return len(gen_options) + GAME_COST * len(games)
+
+
+@dataclass
+class SchedulerMetrics:
+    queued: int
+    """Jobs waiting for a free lane slot."""
+    queued_large: int
+    """Of the waiting jobs, the ones that can only run in the large lane."""
+    running: typing.Dict[str, int]
+    """Running jobs per lane."""
+    oldest_wait: float
+    """Seconds the longest waiting job has been queued for."""
+    average_wait: float
+    """Average seconds recently started jobs had to wait."""
+    started: int
+    """Jobs started since the scheduler was created."""
+
+
+@dataclass
+class _Job:
+    cost: int
+    queued_at: float
+    lane: typing.Optional[str] = None
+
+
+@dataclass
+class GenerationScheduler:
+    """
+    Decides which queued generations get started on which lane.
+
+    Jobs with an estimated cost of at least `large_cost` are large and only run in the large lane, which caps how many
+    of them run concurrently. Small jobs run in the fast lane and overflow into the large lane while no large job waits.
+    Thread-safe, as jobs finish on the worker pools' result threads.
+    """
+    workers: int
+    large_workers: int
+    large_cost: int
+    wait_history: int = 100
+    wakeup: threading.Event = field(default_factory=threading.Event)
+    """Set whenever a slot frees up, so the polling loop can schedule right away."""
+
+    def __post_init__(self) -> None:
+        self.large_workers = max(1, min(self.large_workers, self.workers))
+        self.slots = {LANE_FAST: self.workers - self.large_workers, LANE_LARGE: self.large_workers}
+        self.running = {LANE_FAST: 0, LANE_LARGE: 0}
+        self.started = 0
+        self._jobs: typing.Dict[typing.Any, _Job] = {}
+        self._waits: typing.Deque[float] = deque(maxlen=self.wait_history)
+        self._lock = threading.Lock()
+
+    def __contains__(self, job_id: typing.Any) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def enqueue(self, job_id: typing.Any, cost: int) -> None:
+        with self._lock:
+            if job_id not in self._jobs:
+                self._jobs[job_id] = _Job(cost, time.monotonic())
+
+    def is_large(self, job_id: typing.Any) -> bool:
+        with self._lock:
+            return self._jobs[job_id].cost >= self.large_cost
+
+    def schedule(self, queued: typing.Iterable[typing.Any]) -> typing.List[typing.Tuple[typing.Any, str]]:
+        """
+        Pick jobs to start from the currently queued job ids and assign them a lane.
+        Queued ids that were never enqueued are ignored, enqueued ids that are no longer queued and not running are
+        forgotten.
+        """
+        now = time.monotonic()
+        queued = set(queued)
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if not job.lane and job_id not in queued]:
+                del self._jobs[job_id]
+            waiting = [(job_id, job) for job_id, job in self._jobs.items() if not job.lane]
+            large = sorted((item for item in waiting if item[1].cost >= self.large_cost),
+                           key=lambda item: item[1].queued_at)
+            small = sorted((item for item in waiting if item[1].cost < self.large_cost),
+                           key=lambda item: item[1].cost / (1 + (now - item[1].queued_at) / AGING_TIME))
+
+            assignments: typing.List[typing.Tuple[typing.Any, str]] = []
+            free = {lane: self.slots[lane] - self.running[lane] for lane in self.slots}
+            for jobs, lanes in ((large, (LANE_LARGE,)),
+                                (small, (LANE_FAST, LANE_LARGE) if not large else (LANE_FAST,))):
+                for job_id, job in jobs:
+                    lane = next((lane for lane in lanes if free[lane] > 0), None)
+                    if lane is None:
+                        break
+                    free[lane] -= 1
+                    self.running[lane] += 1
+                    self.started += 1
+                    job.lane = lane
+                    self._waits.append(now - job.queued_at)
+                    assignments.append((job_id, lane))
+            return assignments
+
+    def finished(self, job_id: typing.Any) -> None:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job and job.lane:
+                self.running[job.lane] -= 1
+        self.wakeup.set()
+
+    def metrics(self) -> SchedulerMetrics:
+        now = time.monotonic()
+        with self._lock:
+            waiting = [job for job in self._jobs.values() if not job.lane]
+            return SchedulerMetrics(
+                queued=len(waiting),
+                queued_large=sum(job.cost >= self.large_cost for job in waiting),
+                running=dict(self.running),
+                oldest_wait=max((now - job.queued_at for job in waiting), default=0.),
+                average_wait=sum(self._waits) / len(self._waits) if self._waits else 0.,
+                started=self.started,
+            )
@@ -20,7 +20,12 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 ]]
 
-local SCRIPT_VERSION = 1
+local SCRIPT_VERSION = 4
+local FRAMING_VERSION = 1
+
+-- Most messages to process per frame while not locked, so a busy client can't
+-- stall emulation
+local MAX_MESSAGES_PER_FRAME = 16
 
 -- Set to log incoming requests
 -- Will cause lag due to large console output
@@ -37,6 +42,25 @@ field `type`. The value of `type` determines what other fields may exist.
 To get the script version, instead of JSON, send "VERSION" to get the script
 version directly (e.g. "2").
 
+Since version 2, a message may also be a JSON object with an `id` and a list of
+`requests`. The response is then an object with the same `id` and the list of
+`responses`. Clients can send more tagged messages without waiting for the
+responses to earlier ones, and match responses to their messages by `id`. All
+messages that arrive before a frame ends are processed on that frame.
+
+#### Ex. 5
+
+Request: `{"id": 7, "requests": [{"type": "PING"}, {"type": "HASH"}]}`
+
+Response: `{"id": 7, "responses": [{"type": "PONG"}, {"type": "HASH_RESPONSE", "value": "F7D18982"}]}`
+
+---
+
+Since version 3, a client can send "BINARY 1" instead of JSON. The script
+answers "BINARY 1" and from then on only exchanges tagged messages as binary
+frames, in which memory data is raw bytes instead of base64 strings. The
+format is documented in `worlds/_bizhawk/framing.py`.
+
 #### Ex. 1
 
 Request: `[{"type": "PING"}]`
@@ -178,6 +202,36 @@ Response:
     - `domain` (`string`): The name of the memory domain the address
     corresponds to
 
+- `WATCH`  
+    Starts watching a range of memory for changes, replacing any watch with
+    the same `id`. Watches last until the client disconnects.
+
+    Expected Response Type: `WATCH_RESPONSE`
+
+    Additional Fields:
+    - `id` (`string`): The name of the watch
+    - `address` (`int`): The address of the memory to watch
+    - `size` (`int`): The number of bytes to watch
+    - `domain` (`string`): The name of the memory domain the address
+    corresponds to
+    - `interval` (`number`): The least number of seconds between two checks
+    of this range
+
+- `UNWATCH`  
+    Stops watching the range with the given `id`.
+
+    Expected Response Type: `UNWATCH_RESPONSE`
+
+    Additional Fields:
+    - `id` (`string`): The name of the watch
+
+- `WATCH_POLL`  
+    Checks the watched ranges that are due and returns the ones that changed
+    since they were last checked. A range is always returned the first time
+    it is checked.
+
+    Expected Response Type: `WATCH_POLL_RESPONSE`
+
 - `DISPLAY_MESSAGE`  
     Adds a message to the message queue which will be displayed using
     `gui.addmessage` according to the message interval.
@@ -254,6 +308,20 @@ Response:
 - `WRITE_RESPONSE`  
     Acknowledges `WRITE`.
 
+- `WATCH_RESPONSE`  
+    Acknowledges `WATCH`.
+
+- `UNWATCH_RESPONSE`  
+    Acknowledges `UNWATCH`.
+
+- `WATCH_POLL_RESPONSE`  
+    Contains the changes of the watched ranges.
+
+    Additional Fields:
+    - `value` (`{id: string, offset: int, value: string}[]`): For each changed
+    range, its `id` and a base64 string of the changed bytes, which start
+    `offset` bytes into the range
+
 - `DISPLAY_MESSAGE_RESPONSE`  
     Acknowledges `DISPLAY_MESSAGE`.
 
@@ -308,9 +376,15 @@ local prev_time = 0
 local current_time = 0
 
 local locked = false
+local partial_message = ""
+local binary_mode = false
+local frame_size = nil
 
 local rom_hash = nil
 
+-- Memory ranges the client watches for changes, by id
+local watches = {}
+
 function queue_push (self, value)
     self[self.right] = value
     self.right = self.right + 1
@@ -334,6 +408,95 @@ end
 
 local message_queue = new_queue()
 
+local unpack = table.unpack or unpack
+
+local OPCODE_JSON = 0
+local OPCODE_READ = 1
+local OPCODE_WRITE = 2
+local OPCODE_GUARD = 3
+local OPCODE_TYPES = {[OPCODE_READ] = "READ", [OPCODE_WRITE] = "WRITE", [OPCODE_GUARD] = "GUARD"}
+
+function u32_to_string (value)
+    return string.char(value % 256, math.floor(value / 256) % 256, math.floor(value / 65536) % 256,
+        math.floor(value / 16777216) % 256)
+end
+
+function string_to_u32 (s, i)
+    local b1, b2, b3, b4 = string.byte(s, i, i + 3)
+    return b1 + b2 * 256 + b3 * 65536 + b4 * 16777216
+end
+
+-- string.char and string.byte take and return every byte as an argument, so convert in chunks
+function bytes_to_string (arr)
+    local parts = {}
+    for i = 1, #arr, 4096 do
+        parts[#parts + 1] = string.char(unpack(arr, i, math.min(i + 4095, #arr)))
+    end
+    return table.concat(parts)
+end
+
+function string_to_bytes (s, first, last)
+    local arr = {}
+    for i = first, last, 4096 do
+        for _, byte in ipairs({string.byte(s, i, math.min(i + 4095, last))}) do
+            arr[#arr + 1] = byte
+        end
+    end
+    return arr
+end
+
+function decode_binary_requests (body)
+    local message_id = string_to_u32(body, 1)
+    local count = string.byte(body, 5) + string.byte(body, 6) * 256
+    local position = 7
+    local requests = {}
+    for i = 1, count do
+        local opcode = string.byte(body, position)
+        local size
+        position = position + 1
+        if opcode == OPCODE_JSON then
+            size = string_to_u32(body, position)
+            requests[i] = json.decode(string.sub(body, position + 4, position + 3 + size))
+            position = position + 4 + size
+        else
+            local req = {type = OPCODE_TYPES[opcode]}
+            req["address"] = string_to_u32(body, position)
+            local domain_size = string.byte(body, position + 4)
+            req["domain"] = string.sub(body, position + 5, position + 4 + domain_size)
+            position = position + 5 + domain_size
+            size = string_to_u32(body, position)
+            position = position + 4
+            if opcode == OPCODE_READ then
+                req["size"] = size
+                req["binary"] = true
+            else
+                req["bytes"] = string_to_bytes(body, position, position + size - 1)
+                position = position + size
+            end
+            requests[i] = req
+        end
+    end
+    return message_id, requests
+end
+
+function encode_binary_responses (message_id, responses)
+    local parts = {u32_to_string(message_id), string.char(#responses % 256, math.floor(#responses / 256))}
+    for _, res in ipairs(responses) do
+        if res["type"] == "READ_RESPONSE" and res["bytes"] ~= nil then
+            parts[#parts + 1] = string.char(OPCODE_READ)..u32_to_string(#res["bytes"])..bytes_to_string(res["bytes"])
+        elseif res["type"] == "WRITE_RESPONSE" then
+            parts[#parts + 1] = string.char(OPCODE_WRITE)
+        elseif res["type"] == "GUARD_RESPONSE" then
+            parts[#parts + 1] = string.char(OPCODE_GUARD, res["value"] and 1 or 0)..u32_to_string(res["address"])
+        else
+            local encoded = json.encode(res)
+            parts[#parts + 1] = string.char(OPCODE_JSON)..u32_to_string(#encoded)..encoded
+        end
+    end
+    local body = table.concat(parts)
+    return u32_to_string(#body)..body
+end
+
 function lock ()
     locked = true
     client_socket:settimeout(2)
@@ -397,7 +560,7 @@ request_handlers = {
 
     ["GUARD"] = function (req)
         local res = {}
-        local expected_data = base64.decode(req["expected_data"])
+        local expected_data = req["bytes"] or base64.decode(req["expected_data"])
         local actual_data = memory.read_bytes_as_array(req["address"], #expected_data, req["domain"])
 
         local data_is_validated = true
@@ -437,7 +600,11 @@ request_handlers = {
         local res = {}
 
         res["type"] = "READ_RESPONSE"
-        res["value"] = base64.encode(memory.read_bytes_as_array(req["address"], req["size"], req["domain"]))
+        if req["binary"] then
+            res["bytes"] = memory.read_bytes_as_array(req["address"], req["size"], req["domain"])
+        else
+            res["value"] = base64.encode(memory.read_bytes_as_array(req["address"], req["size"], req["domain"]))
+        end
 
         return res
     end,
@@ -446,7 +613,70 @@ request_handlers = {
         local res = {}
 
         res["type"] = "WRITE_RESPONSE"
-        memory.write_bytes_as_array(req["address"], base64.decode(req["value"]), req["domain"])
+        memory.write_bytes_as_array(req["address"], req["bytes"] or base64.decode(req["value"]), req["domain"])
+
+        return res
+    end,
+
+    ["WATCH"] = function (req)
+        local res = {}
+
+        res["type"] = "WATCH_RESPONSE"
+        watches[req["id"]] = {
+            address = req["address"],
+            size = req["size"],
+            domain = req["domain"],
+            interval = req["interval"] or 0,
+            last_check = nil,
+            data = nil,
+        }
+
+        return res
+    end,
+
+    ["UNWATCH"] = function (req)
+        local res = {}
+
+        res["type"] = "UNWATCH_RESPONSE"
+        watches[req["id"]] = nil
+
+        return res
+    end,
+
+    ["WATCH_POLL"] = function (req)
+        local res = {}
+        local changes = {}
+
+        for id, watch in pairs(watches) do
+            if watch.last_check == nil or current_time - watch.last_check >= watch.interval then
+                watch.last_check = current_time
+                local data = memory.read_bytes_as_array(watch.address, watch.size, watch.domain)
+
+                -- Only send the part of the range between the first and last changed byte
+                local first = 1
+                local last = #data
+                if watch.data ~= nil then
+                    while first <= last and data[first] == watch.data[first] do
+                        first = first + 1
+                    end
+                    while last >= first and data[last] == watch.data[last] do
+                        last = last - 1
+                    end
+                end
+
+                if first <= last then
+                    local changed = {}
+                    for i = first, last do
+                        changed[#changed + 1] = data[i]
+                    end
+                    changes[#changes + 1] = {id = id, offset = first - 1, value = base64.encode(changed)}
+                end
+                watch.data = data
+            end
+        end
+
+        res["type"] = "WATCH_POLL_RESPONSE"
+        res["value"] = changes
 
         return res
     end,
@@ -487,9 +717,66 @@ function process_request (req)
     end
 end
 
+function process_requests (data)
+    local res = {}
+    local failed_guard_response = nil
+    for i, req in ipairs(data) do
+        if failed_guard_response ~= nil then
+            res[i] = failed_guard_response
+        else
+            -- An error is more likely to cause an NLua exception than to return an error here
+            local status, response = pcall(process_request, req)
+            if status then
+                res[i] = response
+
+                -- If the GUARD validation failed, skip the remaining commands
+                if response["type"] == "GUARD_RESPONSE" and not response["value"] then
+                    failed_guard_response = response
+                end
+            else
+                if type(response) ~= "string" then response = "Unknown error" end
+                res[i] = {type = "ERROR", err = response}
+            end
+        end
+    end
+    return res
+end
+
+-- Receive the body of a binary frame, keeping what was received of it so far if it isn't complete yet
+function receive_frame ()
+    local data, err, partial
+    if frame_size == nil then
+        data, err, partial = client_socket:receive(4, partial_message)
+        if data == nil then
+            partial_message = partial or ""
+            return nil, err
+        end
+        partial_message = ""
+        frame_size = string_to_u32(data, 1)
+    end
+
+    data, err, partial = client_socket:receive(frame_size, partial_message)
+    if data == nil then
+        partial_message = partial or ""
+        return nil, err
+    end
+    partial_message = ""
+    frame_size = nil
+    return data, nil
+end
+
 -- Receive data from AP client and send message back
+-- Returns true if a message was received
 function send_receive ()
-    local message, err = client_socket:receive()
+    local message, err
+    if binary_mode then
+        message, err = receive_frame()
+    else
+        -- With pipelined messages, the next one can arrive in parts, so keep what was received of it so far
+        local partial
+        message, err, partial = client_socket:receive("*l", partial_message)
+        partial_message = partial or ""
+    end
 
     -- Handle errors
     if err == "closed" then
@@ -497,15 +784,15 @@ function send_receive ()
             print("Connection to client closed")
         end
         current_state = STATE_NOT_CONNECTED
-        return
+        return false
     elseif err == "timeout" then
         unlock()
-        return
+        return false
     elseif err ~= nil then
         print(err)
         current_state = STATE_NOT_CONNECTED
         unlock()
-        return
+        return false
     end
 
     -- Reset timeout timer
@@ -513,37 +800,34 @@ function send_receive ()
 
     -- Process received data
     if DEBUG then
-        print("Received Message ["..emu.framecount().."]: "..'"'..message..'"')
+        if binary_mode then
+            print("Received Frame ["..emu.framecount().."]: "..#message.." bytes")
+        else
+            print("Received Message ["..emu.framecount().."]: "..'"'..message..'"')
+        end
     end
 
-    if message == "VERSION" then
+    if binary_mode then
+        local message_id, requests = decode_binary_requests(message)
+        client_socket:send(encode_binary_responses(message_id, process_requests(requests)))
+    elseif message == "VERSION" then
         client_socket:send(tostring(SCRIPT_VERSION).."\n")
+    elseif message == "BINARY "..FRAMING_VERSION then
+        client_socket:send(message.."\n")
+        binary_mode = true
+    elseif string.sub(message, 1, 7) == "BINARY " then
+        client_socket:send("UNSUPPORTED\n")
     else
-        local res = {}
         local data = json.decode(message)
-        local failed_guard_response = nil
-        for i, req in ipairs(data) do
-            if failed_guard_response ~= nil then
-                res[i] = failed_guard_response
-            else
-                -- An error is more likely to cause an NLua exception than to return an error here
-                local status, response = pcall(process_request, req)
-                if status then
-                    res[i] = response
-
-                    -- If the GUARD validation failed, skip the remaining commands
-                    if response["type"] == "GUARD_RESPONSE" and not response["value"] then
-                        failed_guard_response = response
-                    end
-                else
-                    if type(response) ~= "string" then response = "Unknown error" end
-                    res[i] = {type = "ERROR", err = response}
-                end
-            end
+        if data["requests"] ~= nil then
+            local res = {id = data["id"], responses = process_requests(data["requests"])}
+            client_socket:send(json.encode(res).."\n")
+        else
+            client_socket:send(json.encode(process_requests(data)).."\n")
         end
-
-        client_socket:send(json.encode(res).."\n")
     end
+
+    return true
 end
 
 function initialize_server ()
@@ -603,15 +887,26 @@ function main ()
                     print("Client connected")
                     current_state = STATE_CONNECTED
                     client_socket = client
+                    partial_message = ""
+                    binary_mode = false
+                    frame_size = nil
+                    watches = {}
                     server:close()
                     server = nil
                     client_socket:settimeout(0)
                 end
             end
         else
+            -- Process all pending messages, and keep waiting for more while locked
+            local received_messages = 0
+            local received
             repeat
-                send_receive()
-            until not locked
+                received = send_receive()
+                if received then
+                    received_messages = received_messages + 1
+                end
+            until current_state == STATE_NOT_CONNECTED or
+                (not locked and (not received or received_messages >= MAX_MESSAGES_PER_FRAME))
 
             if timeout_timer <= 0 then
                 print("Client timed out")
@@ -3,9 +3,9 @@ import logging
 import random
 import time
 from collections import deque
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator
 
-from BaseClasses import CollectionState, Entrance, Region, EntranceType
+from BaseClasses import CollectionState, Entrance, Location, Region, EntranceType
 from Options import Accessibility
 from worlds.AutoWorld import World
 
@@ -16,34 +16,100 @@ class EntranceRandomizationError(RuntimeError):
 
 class EntranceLookup:
     class GroupLookup:
+        """
+        Entrances by randomization group, split by whether their region has already been placed, so that stages which
+        want to reach new regions don't have to look at targets into placed ones.
+        """
         _lookup: dict[int, list[Entrance]]
+        _placed: dict[int, list[Entrance]]
+        _positions: dict[Entrance, int]
 
         def __init__(self):
             self._lookup = {}
+            self._placed = {}
+            self._positions = {}
 
         def __len__(self):
-            return sum(map(len, self._lookup.values()))
+            return len(self._positions)
 
         def __bool__(self):
-            return bool(self._lookup)
+            return bool(self._positions)
+
+        def __contains__(self, entrance: Entrance) -> bool:
+            return entrance in self._positions
 
         def __getitem__(self, item: int) -> list[Entrance]:
-            return self._lookup.get(item, [])
+            return self._lookup.get(item, []) + self._placed.get(item, [])
 
         def __iter__(self):
-            return itertools.chain.from_iterable(self._lookup.values())
+            return itertools.chain(itertools.chain.from_iterable(self._lookup.values()),
+                                   itertools.chain.from_iterable(self._placed.values()))
 
         def __repr__(self):
-            return str(self._lookup)
+            return str({group: self[group] for group in {**self._lookup, **self._placed}})
+
+        def _get_partition(self, entrance: Entrance) -> dict[int, list[Entrance]]:
+            group = self._lookup.get(entrance.randomization_group)
+            index = self._positions[entrance]
+            return self._lookup if group and index < len(group) and group[index] is entrance else self._placed
+
+        def _insert(self, partition: dict[int, list[Entrance]], entrance: Entrance) -> None:
+            group = partition.setdefault(entrance.randomization_group, [])
+            self._positions[entrance] = len(group)
+            group.append(entrance)
+
+        def _delete(self, partition: dict[int, list[Entrance]], entrance: Entrance) -> None:
+            group = partition[entrance.randomization_group]
+            index = self._positions.pop(entrance)
+            # move the last entrance of the group into the gap, so removal doesn't have to shift the whole group
+            last = group.pop()
+            if last is not entrance:
+                group[index] = last
+                self._positions[last] = index
+            if not group:
+                del partition[entrance.randomization_group]
 
-        def add(self, entrance: Entrance) -> None:
-            self._lookup.setdefault(entrance.randomization_group, []).append(entrance)
+        def add(self, entrance: Entrance, placed: bool = False) -> None:
+            self._insert(self._placed if placed else self._lookup, entrance)
 
         def remove(self, entrance: Entrance) -> None:
-            group = self._lookup[entrance.randomization_group]
-            group.remove(entrance)
-            if not group:
-                del self._lookup[entrance.randomization_group]
+            self._delete(self._get_partition(entrance), entrance)
+
+        def mark_placed(self, entrance: Entrance) -> None:
+            partition = self._get_partition(entrance)
+            if partition is self._lookup:
+                self._delete(partition, entrance)
+                self._insert(self._placed, entrance)
+
+        def iter_shuffled(self, groups: Iterable[int], rng: random.Random, include_placed: bool) -> Iterator[Entrance]:
+            """
+            Yields the entrances of the given groups in random order. The groups get shuffled in place as they are
+            iterated, so only the entrances that actually get looked at cost time. The lookup may not be modified
+            before iteration ends.
+            """
+            partitions = (self._lookup, self._placed) if include_placed else (self._lookup,)
+            lists = [partition[group] for group in dict.fromkeys(groups) for partition in partitions
+                     if group in partition]
+            sizes = [len(entrances) for entrances in lists]
+            cursors = [0] * len(lists)
+            remaining = sum(sizes)
+            while remaining:
+                # a uniform pick among all remaining entrances, located by the list it is in
+                pick = rng.randrange(remaining)
+                for index, entrances in enumerate(lists):
+                    left = sizes[index] - cursors[index]
+                    if pick < left:
+                        break
+                    pick -= left
+                cursor = cursors[index]
+                picked = entrances[cursor + pick]
+                entrances[cursor + pick] = entrances[cursor]
+                entrances[cursor] = picked
+                self._positions[entrances[cursor + pick]] = cursor + pick
+                self._positions[picked] = cursor
+                cursors[index] += 1
+                remaining -= 1
+                yield picked
 
     dead_ends: GroupLookup
     others: GroupLookup
@@ -51,6 +117,7 @@ class EntranceLookup:
     _expands_graph_cache: dict[Entrance, bool]
     _coupled: bool
     _usable_exits: set[Entrance]
+    _placed_regions: set[Region]
 
     def __init__(self, rng: random.Random, coupled: bool, usable_exits: set[Entrance]):
         self.dead_ends = EntranceLookup.GroupLookup()
@@ -58,6 +125,7 @@ class EntranceLookup:
         self._random = rng
         self._expands_graph_cache = {}
         self._coupled = coupled
+        self._placed_regions = set()
         self._usable_exits = usable_exits
 
     def _can_expand_graph(self, entrance: Entrance) -> bool:
@@ -109,33 +177,91 @@ class EntranceLookup:
 
     def add(self, entrance: Entrance) -> None:
         lookup = self.others if self._can_expand_graph(entrance) else self.dead_ends
-        lookup.add(entrance)
+        lookup.add(entrance, entrance.connected_region in self._placed_regions)
 
     def remove(self, entrance: Entrance) -> None:
         lookup = self.others if self._can_expand_graph(entrance) else self.dead_ends
         lookup.remove(entrance)
 
+    def update_placed_regions(self, placed_regions: set[Region]) -> None:
+        """
+        Moves the targets into newly placed regions out of the way of get_targets with unplaced_only.
+
+        :param placed_regions: All regions which are currently placed, e.g. ERPlacementState.placed_regions
+        """
+        for region in placed_regions - self._placed_regions:
+            for entrance in region.entrances:
+                if entrance in self.others:
+                    self.others.mark_placed(entrance)
+                elif entrance in self.dead_ends:
+                    self.dead_ends.mark_placed(entrance)
+        self._placed_regions.update(placed_regions)
+
     def get_targets(
             self,
             groups: Iterable[int],
             dead_end: bool,
-            preserve_group_order: bool
+            preserve_group_order: bool,
+            unplaced_only: bool = False
     ) -> Iterable[Entrance]:
+        """
+        Lazily yields the targets of the given groups in random order.
 
+        :param groups: The randomization groups to get targets from
+        :param dead_end: Whether to get dead end targets or targets which can expand the graph
+        :param preserve_group_order: Whether to yield all targets of a group before the ones of the next group
+        :param unplaced_only: Whether to skip targets into regions which were already placed, as of the last
+                              update_placed_regions
+        """
         lookup = self.dead_ends if dead_end else self.others
         if preserve_group_order:
-            for group in groups:
-                self._random.shuffle(lookup[group])
-            ret = [entrance for group in groups for entrance in lookup[group]]
-        else:
-            ret = [entrance for group in groups for entrance in lookup[group]]
-            self._random.shuffle(ret)
-        return ret
+            return itertools.chain.from_iterable(lookup.iter_shuffled((group,), self._random, not unplaced_only)
+                                                 for group in groups)
+        return lookup.iter_shuffled(groups, self._random, not unplaced_only)
 
     def __len__(self):
         return len(self.dead_ends) + len(self.others)
 
 
+class _StateCheckpoint:
+    """
+    Undo information for speculative changes to a player's reachability in a live CollectionState, so they can be
+    rolled back without copying the whole state. Only the player's own items may be collected in the meantime, from the
+    given locations.
+    """
+    def __init__(self, state: CollectionState, player: int, sweep_locations: Iterable[Location]):
+        self.state = state
+        self.player = player
+        self.reachable_regions = state.reachable_regions[player].copy()
+        self.blocked_connections = state.blocked_connections[player].copy()
+        self.prog_items = state.prog_items[player].copy()
+        self.stale = state.stale[player]
+        # paths of newly reached regions and entrances get appended, so everything past the old size is new
+        self.path_size = len(state.path)
+        self.advancements = {location for location in sweep_locations if location not in state.advancements}
+        self.locations_checked = {location for location in self.advancements
+                                  if location not in state.locations_checked}
+        # custom state of LogicMixins, which collecting items may have changed as well
+        self.mixins = CollectionState.__new__(CollectionState)
+        self.mixins.multiworld = state.multiworld
+        for function in CollectionState.additional_copy_functions:
+            self.mixins = function(state, self.mixins)
+
+    def rollback(self) -> None:
+        state = self.state
+        player = self.player
+        for key in list(itertools.islice(state.path, self.path_size, None)):
+            del state.path[key]
+        state.reachable_regions[player] = self.reachable_regions
+        state.blocked_connections[player] = self.blocked_connections
+        state.prog_items[player] = self.prog_items
+        state.stale[player] = self.stale
+        state.advancements -= self.advancements
+        state.locations_checked -= self.locations_checked
+        for function in CollectionState.additional_copy_functions:
+            function(self.mixins, state)
+
+
 class ERPlacementState:
     """The state of an ongoing or completed entrance randomization"""
     placements: list[Entrance]
@@ -148,12 +274,15 @@ class ERPlacementState:
     """The CollectionState backing the entrance randomization logic"""
     coupled: bool
     """Whether entrance randomization is operating in coupled mode"""
+    speculative_sweeps: int
+    """How many speculative connections were tested"""
 
     def __init__(self, world: World, coupled: bool):
         self.placements = []
         self.pairings = []
         self.world = world
         self.coupled = coupled
+        self.speculative_sweeps = 0
         self.collection_state = world.multiworld.get_all_state(False, True)
 
     @property
@@ -185,31 +314,41 @@ class ERPlacementState:
 
     def test_speculative_connection(self, source_exit: Entrance, target_entrance: Entrance,
                                     usable_exits: set[Entrance]) -> bool:
-        copied_state = self.collection_state.copy()
-        # simulated connection. A real connection is unsafe because the region graph is shallow-copied and would
-        # propagate back to the real multiworld.
-        copied_state.reachable_regions[self.world.player].add(target_entrance.connected_region)
-        copied_state.blocked_connections[self.world.player].remove(source_exit)
-        copied_state.blocked_connections[self.world.player].update(target_entrance.connected_region.exits)
-        copied_state.update_reachable_regions(self.world.player)
-        copied_state.sweep_for_advancements()
-        # test that at there are newly reachable randomized exits that are ACTUALLY reachable
-        available_randomized_exits = copied_state.blocked_connections[self.world.player]
-        for _exit in available_randomized_exits:
-            if _exit.connected_region:
-                continue
-            # ignore the source exit, and, if coupled, the reverse exit. They're not actually new
-            if _exit.name == source_exit.name or (self.coupled and _exit.name == target_entrance.name):
-                continue
-            # make sure we are only paying attention to usable exits
-            if _exit not in usable_exits:
-                continue
-            # technically this should be is_valid_source_transition, but that may rely on side effects from
-            # on_connect, which have not happened here (because we didn't do a real connection, and if we did, we would
-            # not want them to persist). can_reach is a close enough approximation most of the time.
-            if _exit.can_reach(copied_state):
-                return True
-        return False
+        player = self.world.player
+        state = self.collection_state
+        self.speculative_sweeps += 1
+        # only this player's own items can be picked up by the speculative sweep, which is all that ER can depend on
+        # before fill, and all that the checkpoint has to restore
+        sweep_locations = [location for location in self.world.multiworld.get_filled_locations(player)
+                           if location.advancement and location.item.player == player]
+        checkpoint = _StateCheckpoint(state, player, sweep_locations)
+        try:
+            # simulated connection. A real connection would trigger the world's connection side effects, which we
+            # can't undo.
+            state.reachable_regions[player].add(target_entrance.connected_region)
+            state.blocked_connections[player].remove(source_exit)
+            state.blocked_connections[player].update(target_entrance.connected_region.exits)
+            state.update_reachable_regions(player)
+            state.sweep_for_advancements(sweep_locations)
+            # test that at there are newly reachable randomized exits that are ACTUALLY reachable
+            available_randomized_exits = state.blocked_connections[player]
+            for _exit in available_randomized_exits:
+                if _exit.connected_region:
+                    continue
+                # ignore the source exit, and, if coupled, the reverse exit. They're not actually new
+                if _exit.name == source_exit.name or (self.coupled and _exit.name == target_entrance.name):
+                    continue
+                # make sure we are only paying attention to usable exits
+                if _exit not in usable_exits:
+                    continue
+                # technically this should be is_valid_source_transition, but that may rely on side effects from
+                # on_connect, which have not happened here (because we didn't do a real connection, and if we did, we
+                # would not want them to persist). can_reach is a close enough approximation most of the time.
+                if _exit.can_reach(state):
+                    return True
+            return False
+        finally:
+            checkpoint.rollback()
 
     def connect(
             self,
@@ -370,10 +509,8 @@ def randomize_entrances(
             on_connect(er_state, placed_exits)
 
     def needs_speculative_sweep(dead_end: bool, require_new_exits: bool, placeable_exits: list[Entrance]) -> bool:
-        # speculative sweep is expensive. We currently only do it as a last resort, if we might cap off the graph
-        # entirely
-        if len(placeable_exits) > 1:
-            return False
+        # speculative connections are tested on the live state and rolled back, which is cheap enough to check every
+        # placement that has to expand the graph, not only the last resort one that might cap it off entirely.
 
         # in certain stages of randomization we either expect or don't care if the search space shrinks.
         # we should never speculative sweep here.
@@ -400,9 +537,12 @@ def randomize_entrances(
     def find_pairing(dead_end: bool, require_new_exits: bool) -> bool:
         nonlocal perform_validity_check
         placeable_exits = er_state.find_placeable_exits(perform_validity_check, exits)
+        entrance_lookup.update_placed_regions(er_state.placed_regions)
+        unplaced_only = perform_validity_check and require_new_exits
         for source_exit in placeable_exits:
             target_groups = target_group_lookup[source_exit.randomization_group]
-            for target_entrance in entrance_lookup.get_targets(target_groups, dead_end, preserve_group_order):
+            for target_entrance in entrance_lookup.get_targets(target_groups, dead_end, preserve_group_order,
+                                                               unplaced_only):
                 # when requiring new exits, ideally we would like to make it so that every placement increases
                 # (or keeps the same number of) reachable exits. The goal is to continue to expand the search space
                 # so that we do not crash. In the interest of performance and bias reduction, generally, just checking
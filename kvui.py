@@ -376,6 +376,9 @@ class SelectableLabel(RecycleDataViewBehavior, TooltipLabel):
     def refresh_view_attrs(self, rv, index, data):
         """ Catch and handle the view changes """
         self.index = index
+        if "entry" in data:
+            # UILog rows, render their markup only now that they are shown
+            data = {"text": data["entry"].markup}
         return super(SelectableLabel, self).refresh_view_attrs(
             rv, index, data)
 
@@ -868,6 +871,8 @@ class GameManager(ThemedApp):
             return text
 
         ctx.on_user_say = intercept_say
+        # hint updates can arrive in bursts, the hint log is refreshed at most once per frame
+        self._update_hints_trigger = Clock.create_trigger(self._refresh_hints)
 
         super(GameManager, self).__init__()
 
@@ -1048,10 +1053,40 @@ class GameManager(ThemedApp):
         except Exception as e:
             logging.getLogger("Client").exception(e)
 
-    def print_json(self, data: typing.List[JSONMessagePart]):
-        text = self.json_to_kivy_parser(data)
-        self.log_panels["Archipelago"].on_message_markup(text)
-        self.log_panels["All"].on_message_markup(text)
+    def print_json(self, data: typing.List[JSONMessagePart],
+                   args: typing.Optional[typing.Dict[str, typing.Any]] = None):
+        """Shows a PrintJSON message, args are the PrintJSON arguments to filter it by."""
+        entry = LogEntry.from_print_json(data, self.json_to_kivy_parser, args or {})
+        self.log_panels["Archipelago"].add_entry(entry)
+        self.log_panels["All"].add_entry(entry)
+
+    def render_log(self) -> None:
+        """Renders the messages that were not shown yet, before the player names they refer to change."""
+        for panel in self.log_panels.values():
+            for _, entry in getattr(panel, "entries", ()):
+                entry.markup  # noqa, renders it
+
+    def filter_log(self, *filters: str) -> None:
+        """
+        Only shows messages of the given PrintJSON types, item classes and player names. Each kind of filter that is
+        given has to match. Without filters, all messages are shown again.
+        """
+        kinds: typing.Set[str] = set()
+        players: typing.Set[int] = set()
+        item_classes: typing.Set[str] = set()
+        player_ids = {name.lower(): slot for slot, name in self.ctx.player_names.items()}
+        for text in filters:
+            if text.lower() in item_class_names:
+                item_classes.add(text.lower())
+            elif text.lower() in player_ids:
+                players.add(player_ids[text.lower()])
+            else:
+                # PrintJSON types are CamelCase, but accept them in any case
+                kinds.add(print_json_types.get(text.lower(), text))
+        log_filter = LogFilter(frozenset(kinds) if kinds else None, frozenset(players) if players else None,
+                               frozenset(item_classes) if item_classes else None)
+        self.log_panels["Archipelago"].set_filter(log_filter)
+        self.log_panels["All"].set_filter(log_filter)
 
     def focus_textinput(self):
         if hasattr(self, "textinput"):
@@ -1074,6 +1109,9 @@ class GameManager(ThemedApp):
             self.energy_link_label.text = f"EL: {Utils.format_SI_prefix(self.ctx.current_energy_link_value)}J"
 
     def update_hints(self):
+        self._update_hints_trigger()
+
+    def _refresh_hints(self, dt: typing.Optional[float] = None) -> None:
         hints = self.ctx.stored_data.get(f"_read_hints_{self.ctx.team}_{self.ctx.slot}", [])
         self.hint_log.refresh_hints(hints)
 
@@ -1102,27 +1140,133 @@ class LogtoUI(logging.Handler):
             self.on_log(self.format(record))
 
 
+item_class_names: typing.Tuple[str, ...] = ("progression", "useful", "trap", "normal")
+print_json_types: typing.Dict[str, str] = {kind.lower(): kind for kind in (
+    "ItemSend", "ItemCheat", "Hint", "Join", "Part", "Chat", "ServerChat", "Tutorial", "TagsChanged", "CommandResult",
+    "AdminCommandResult", "Goal", "Release", "Collect", "Countdown", "Message", "Log")}
+"""PrintJSON types by their lower case name, and the kinds of LogEntries that are not PrintJSON types"""
+
+
+def get_item_classes(flags: int) -> typing.List[str]:
+    """Names of the item classes of item flags, as shown in tooltips and used by LogFilter."""
+    item_types = [name for bit, name in enumerate(item_class_names[:-1]) if flags & (1 << bit)]
+    return item_types or ["normal"]
+
+
+class LogEntry:
+    """
+    A message of the log, with what LogFilter filters it by. The markup of PrintJSON messages is only rendered once
+    the message gets shown, most messages of a busy multiworld scroll by without ever being looked at.
+    """
+    __slots__ = ("kind", "players", "item_classes", "_markup", "_parts", "_parser")
+    kind: str
+    """The PrintJSON type, "Message" for PrintJSON without one and "Log" for log records and other markup"""
+    players: typing.FrozenSet[int]
+    """Slots the message is about"""
+    item_classes: typing.FrozenSet[str]
+    """Item classes of the item the message is about"""
+
+    def __init__(self, markup: typing.Optional[str] = None, kind: str = "Log",
+                 players: typing.FrozenSet[int] = frozenset(), item_classes: typing.FrozenSet[str] = frozenset(),
+                 parts: typing.Optional[typing.List[JSONMessagePart]] = None,
+                 parser: typing.Optional[typing.Callable[[typing.List[JSONMessagePart]], str]] = None):
+        self.kind = kind
+        self.players = players
+        self.item_classes = item_classes
+        self._markup = markup
+        self._parts = parts
+        self._parser = parser
+
+    @classmethod
+    def from_print_json(cls, parts: typing.List[JSONMessagePart],
+                        parser: typing.Callable[[typing.List[JSONMessagePart]], str],
+                        args: typing.Dict[str, typing.Any]) -> "LogEntry":
+        item = args.get("item")
+        players = {args.get("receiving"), args.get("slot")}
+        item_classes: typing.FrozenSet[str] = frozenset()
+        if item is not None:
+            players.add(item.player)
+            item_classes = frozenset(get_item_classes(item.flags))
+        players.discard(None)
+        return cls(kind=args.get("type", "Message"), players=frozenset(players), item_classes=item_classes,
+                   parts=parts, parser=parser)
+
+    @property
+    def markup(self) -> str:
+        if self._markup is None:
+            self._markup = self._parser(self._parts)
+            self._parts = self._parser = None
+        return self._markup
+
+
+class LogFilter(typing.NamedTuple):
+    """Which messages a UILog shows. Messages have to match each given set, None shows messages of any."""
+    kinds: typing.Optional[typing.FrozenSet[str]] = None
+    players: typing.Optional[typing.FrozenSet[int]] = None
+    item_classes: typing.Optional[typing.FrozenSet[str]] = None
+
+    def __call__(self, entry: LogEntry) -> bool:
+        return (self.kinds is None or entry.kind in self.kinds) and \
+            (self.players is None or not self.players.isdisjoint(entry.players)) and \
+            (self.item_classes is None or not self.item_classes.isdisjoint(entry.item_classes))
+
+
 class UILog(MDRecycleView):
+    """
+    Shows the last messages of a ring buffer of LogEntries that match its log_filter. New messages are added to the
+    view once per frame, so bursts of messages only cause one update of the layout.
+    """
     messages: typing.ClassVar[int]  # comes from kv file
     adaptive_height = True
+    entries: typing.Deque[typing.Tuple[int, LogEntry]]
+    """The last messages, shown or filtered out, with their sequence number"""
+    log_filter: LogFilter
 
     def __init__(self, *loggers_to_handle, **kwargs):
         super(UILog, self).__init__(**kwargs)
         self.data = []
+        self.entries = deque(maxlen=self.messages)
+        self.log_filter = LogFilter()
+        self._sequence = 0
+        self._pending: typing.List[typing.Tuple[int, LogEntry]] = []
+        self._flush_trigger = Clock.create_trigger(self._flush)
         for logger in loggers_to_handle:
             logger.addHandler(LogtoUI(self.on_log))
 
     def on_log(self, record: str) -> None:
-        self.data.append({"text": escape_markup(record)})
-        self.clean_old()
+        self.add_entry(LogEntry(escape_markup(record)))
 
     def on_message_markup(self, text):
-        self.data.append({"text": text})
-        self.clean_old()
-
-    def clean_old(self):
-        if len(self.data) > self.messages:
-            self.data.pop(0)
+        self.add_entry(LogEntry(text))
+
+    def add_entry(self, entry: LogEntry) -> None:
+        """Adds a message to the log, it shows up in the next frame."""
+        self.entries.append((self._sequence, entry))
+        self._pending.append((self._sequence, entry))
+        self._sequence += 1
+        self._flush_trigger()
+
+    def _flush(self, dt: typing.Optional[float] = None) -> None:
+        oldest = self.entries[0][0] if self.entries else self._sequence
+        rows = [{"entry": entry, "sequence": sequence} for sequence, entry in self._pending
+                if sequence >= oldest and self.log_filter(entry)]
+        self._pending.clear()
+        # rows of messages that dropped out of the ring buffer
+        stale = 0
+        for row in self.data:
+            if row["sequence"] >= oldest:
+                break
+            stale += 1
+        if stale:
+            self.data = self.data[stale:] + rows
+        elif rows:
+            self.data.extend(rows)
+
+    def set_filter(self, log_filter: LogFilter) -> None:
+        """Shows only the messages that match log_filter, including the ones that were filtered out before."""
+        self.log_filter = log_filter
+        self._pending.clear()
+        self.data = [{"entry": entry, "sequence": sequence} for sequence, entry in self.entries if log_filter(entry)]
 
     def fix_heights(self):
         """Workaround fix for divergent texture and layout heights"""
@@ -1323,17 +1467,7 @@ class KivyJSONtoTextParser(JSONtoTextParser):
         return super(KivyJSONtoTextParser, self).__call__(*args, **kwargs)
 
     def _handle_item_name(self, node: JSONMessagePart):
-        flags = node.get("flags", 0)
-        item_types = []
-        if flags & 0b001:  # advancement
-            item_types.append("progression")
-        if flags & 0b010:  # useful
-            item_types.append("useful")
-        if flags & 0b100:  # trap
-            item_types.append("trap")
-        if not item_types:
-            item_types.append("normal")
-
+        item_types = get_item_classes(node.get("flags", 0))
         node.setdefault("refs", []).append("Item Class: " + ", ".join(item_types))
         return super(KivyJSONtoTextParser, self)._handle_item_name(node)
 
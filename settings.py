@@ -24,26 +24,30 @@ __all__ = [
 
 no_gui = False
 skip_autosave = False
-_world_settings_name_cache: dict[str, str] = {}  # TODO: cache on disk and update when worlds change
-_world_settings_name_cache_updated = False
+_world_settings_name_cache: dict[str, str] = {}
 _lock = Lock()
 
 
+def get_world_settings_name(world: type) -> str | None:
+    """Module and class name of a world, if it defines a settings class"""
+    annotation = world.__annotations__.get("settings", None)
+    if annotation is None or annotation == "ClassVar[Optional['Group']]":
+        return None
+    return f"{world.__module__}.{world.__name__}"
+
+
 def _update_cache() -> None:
-    """Load all worlds and update world_settings_name_cache"""
-    global _world_settings_name_cache_updated
-    if _world_settings_name_cache_updated:
-        return
-
-    try:
-        from worlds.AutoWorld import AutoWorldRegister
-        for world in AutoWorldRegister.world_types.values():
-            annotation = world.__annotations__.get("settings", None)
-            if annotation is None or annotation == "ClassVar[Optional['Group']]":
-                continue
-            _world_settings_name_cache[world.settings_key] = f"{world.__module__}.{world.__name__}"
-    finally:
-        _world_settings_name_cache_updated = True
+    """
+    Update world_settings_name_cache from the imported worlds and the world manifest of the others.
+    Does not import any worlds, so it runs again for each unknown key, to find worlds that got imported since.
+    """
+    import worlds
+    from worlds.AutoWorld import AutoWorldRegister
+    _world_settings_name_cache.update(worlds.lazy_world_settings)
+    for world in dict.values(AutoWorldRegister.world_types):
+        world_settings_name = get_world_settings_name(world)
+        if world_settings_name:
+            _world_settings_name_cache[world.settings_key] = world_settings_name
 
 
 def fmt_doc(cls: type, level: int) -> str:
@@ -675,6 +679,16 @@ class GeneratorOptions(Group):
         start_inventory -> Move remaining items to start_inventory, generate additional filler items to fill locations.
         """
 
+    class OutputProcesses(int):
+        """
+        Worker processes for output work that worlds allow to run in a separate process, such as creating delta patches.
+        0 runs it in the generator's output threads, -1 uses one process per CPU core.
+        Starting the processes takes a moment, so this pays off for large seeds.
+        """
+
+    class OutputMemoryLimit(int):
+        """Memory in MiB that output of worlds may reserve at the same time, 0 for no limit"""
+
     enemizer_path: EnemizerPath = EnemizerPath("EnemizerCLI/EnemizerCLI.Core")  # + ".exe" is implied on Windows
     player_files_path: PlayerFilesPath = PlayerFilesPath("Players")
     players: Players = Players(0)
@@ -686,6 +700,8 @@ class GeneratorOptions(Group):
     panic_method: PanicMethod = PanicMethod("swap")
     loglevel: str = "info"
     logtime: bool = False
+    output_processes: OutputProcesses = OutputProcesses(0)
+    output_memory_limit: OutputMemoryLimit = OutputMemoryLimit(1024)
 
 
 class SNIOptions(Group):
@@ -754,6 +770,10 @@ class Settings(Group):
                 return super().__getattribute__(key)
             # directly import world and grab settings class
             world_mod, world_cls_name = _world_settings_name_cache[key].rsplit(".", 1)
+            # worlds that are not imported yet can only be imported through their world source, not by module name
+            if world_mod.startswith("worlds."):
+                import worlds
+                worlds.load_lazy_world(world_mod.split(".")[1])
             world = cast(type, getattr(__import__(world_mod, fromlist=[world_cls_name]), world_cls_name))
             assert getattr(world, "settings_key") == key
             try:
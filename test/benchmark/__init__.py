@@ -5,3 +5,11 @@ if __name__ == "__main__":
     load_worlds.run_load_worlds_benchmark()
     import locations
     locations.run_locations_benchmark()
+    import entrances
+    entrances.run_entrances_benchmark([])
+    import tokens
+    tokens.run_tokens_benchmark([])
+    import bizhawk_framing
+    bizhawk_framing.run_bizhawk_framing_benchmark([])
+    import client_messages
+    client_messages.run_client_messages_benchmark([])
@@ -0,0 +1,110 @@
+def run_bizhawk_framing_benchmark(arguments=None):
+    """Read memory through a loopback connector with each framing the BizHawk client supports and report reads and
+    bytes per second. Read sizes and concurrency can be tuned from the command line, see --help."""
+    import argparse
+    import asyncio
+    import base64
+    import json
+    import logging
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from worlds._bizhawk.framing import decode_requests, encode_responses, frame_size
+    from worlds._bizhawk import BizHawkContext, ConnectionStatus, disconnect, get_script_version, read, \
+        start_binary_framing, start_pipeline
+
+    parser = argparse.ArgumentParser(description="BizHawk connector framing benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 256, 4096],
+                        help="Bytes per read to benchmark, each one is a separate run.")
+    parser.add_argument("--reads", type=int, default=2000, help="Reads per run.")
+    parser.add_argument("--batch", type=int, default=4, help="Reads sent together in one message.")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Messages in flight at once, for the framings that support it.")
+    args = parser.parse_args(arguments)
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    closed: asyncio.Event
+
+    framings = {
+        "JSON, one message at a time": 1,
+        "JSON, pipelined": 2,
+        "binary, pipelined": 3,
+    }
+
+    def process(requests: list, memory: bytes, binary: bool) -> list:
+        value = memory if binary else base64.b64encode(memory).decode("ascii")
+        return [{"type": "READ_RESPONSE", "value": value} for _ in requests]
+
+    async def connector(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, script_version: int,
+                        memory: bytes) -> None:
+        """Answers reads like the connector script would, encoding included."""
+        try:
+            while line := await reader.readline():
+                if line == b"VERSION\n":
+                    writer.write(f"{script_version}\n".encode())
+                elif line.startswith(b"BINARY"):
+                    writer.write(line)
+                    while True:
+                        size, = frame_size.unpack(await reader.readexactly(frame_size.size))
+                        message_id, requests = decode_requests(await reader.readexactly(size))
+                        writer.write(encode_responses(message_id, process(requests, memory, True)))
+                else:
+                    message = json.loads(line)
+                    if isinstance(message, list):
+                        writer.write(json.dumps(process(message, memory, False)).encode() + b"\n")
+                    else:
+                        responses = process(message["requests"], memory, False)
+                        writer.write(json.dumps({"id": message["id"], "responses": responses}).encode() + b"\n")
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+            closed.set()
+
+    async def benchmark(script_version: int, size: int) -> float:
+        nonlocal closed
+        closed = asyncio.Event()
+        memory = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+        server = await asyncio.start_server(lambda reader, writer: connector(reader, writer, script_version, memory),
+                                            "127.0.0.1", 0)
+        ctx = BizHawkContext()
+        ctx.streams = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        ctx.connection_status = ConnectionStatus.TENTATIVE
+        await get_script_version(ctx)
+        if script_version >= 3:
+            await start_binary_framing(ctx)
+        elif script_version >= 2:
+            start_pipeline(ctx)
+
+        read_list = [(0, size, "RAM")] * args.batch
+        messages = args.reads // args.batch
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                await read(ctx, read_list)
+
+        workers = args.concurrency if script_version >= 2 else 1
+        with TimeIt(f"{messages} messages of {size} byte reads") as t:
+            await asyncio.gather(*(worker(messages // workers) for _ in range(workers)))
+
+        disconnect(ctx)
+        await closed.wait()
+        server.close()
+        await server.wait_closed()
+        return t.dif
+
+    for size in args.sizes:
+        for name, script_version in framings.items():
+            seconds = asyncio.run(benchmark(script_version, size))
+            reads = args.reads // args.batch * args.batch
+            logger.info(f"{name}, {size} bytes per read: {reads / seconds:.0f} reads per second, "
+                        f"{reads * size / seconds / 2**20:.2f} MiB per second.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_bizhawk_framing_benchmark()
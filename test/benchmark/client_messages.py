@@ -0,0 +1,71 @@
+def run_client_messages_benchmark(arguments=None):
+    """Feed a headless client a release's worth of ItemSend messages, as the server frames them, and report messages
+    handled per second, with all of them shown and with the ones past the client's item_send_limit summarized."""
+    import argparse
+    import asyncio
+    import io
+    import logging
+    import random
+    import statistics
+    import typing
+
+    import ModuleUpdate
+    ModuleUpdate.update_ran = True
+
+    from time_it import TimeIt
+
+    from CommonClient import CommonContext, process_server_cmd
+    from MultiServer import json_format_send_event
+    from NetUtils import NetworkItem, NetworkSlot, SlotType, decode, encode
+    from Utils import init_logging
+
+    parser = argparse.ArgumentParser(description="Client message handling benchmark")
+    parser.add_argument("--messages", type=int, nargs="+", default=[1_000, 10_000],
+                        help="ItemSend counts to benchmark, each one is a separate run.")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=3, help="Times to handle each set of messages.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(arguments)
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+    # the client's console and file output still gets formatted, but not written anywhere
+    for output_logger in ("FileLog", "StreamLog"):
+        logging.getLogger(output_logger).addHandler(logging.StreamHandler(io.StringIO()))
+        logging.getLogger(output_logger).propagate = False
+
+    def create_frames(message_count: int, rng: random.Random) -> typing.List[str]:
+        messages = [json_format_send_event(NetworkItem(rng.randrange(1, 1000), rng.randrange(1, 10_000),
+                                                       rng.randrange(1, args.players + 1), rng.choice((0, 1, 2, 4))),
+                                           rng.randrange(1, args.players + 1))
+                    for _ in range(message_count)]
+        # the server sends at most 140 of them per frame
+        return [encode(messages[start:start + 140]) for start in range(0, message_count, 140)]
+
+    async def handle(frames: typing.List[str], item_send_limit: int) -> float:
+        ctx = CommonContext()
+        ctx.item_send_limit = item_send_limit
+        ctx.slot = 1
+        ctx.player_names = {slot: f"Player{slot}" for slot in range(args.players + 1)}
+        ctx.slot_info = {slot: NetworkSlot(name, "Archipelago", SlotType.player)
+                         for slot, name in ctx.player_names.items()}
+        with TimeIt("handling messages") as t:
+            for frame in frames:
+                for message in decode(frame):
+                    await process_server_cmd(ctx, message)
+        ctx.print_item_send_summary()
+        await ctx.shutdown()
+        return t.dif
+
+    for message_count in args.messages:
+        frames = create_frames(message_count, random.Random(args.seed))
+        for label, item_send_limit in (("all shown", message_count), ("summarized", CommonContext.item_send_limit)):
+            times = [asyncio.run(handle(frames, item_send_limit)) for _ in range(args.samples)]
+            logger.info(f"{message_count} ItemSends, {label}: "
+                        f"{message_count / statistics.median(times):.0f} messages handled per second.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_client_messages_benchmark()
@@ -0,0 +1,143 @@
+def run_entrances_benchmark(arguments=None):
+    """Randomize entrances of synthetic region graphs and report placement throughput, speculative sweeps,
+    failures and peak memory. Graph shape and mode can be tuned from the command line, see --help."""
+    import argparse
+    import gc
+    import logging
+    import random
+    import statistics
+    import tracemalloc
+    import typing
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from BaseClasses import CollectionState, EntranceType, MultiWorld, Region
+    # load the worlds first, as some of them import entrance_rando themselves
+    from worlds.AutoWorld import World
+    from entrance_rando import EntranceRandomizationError, ERPlacementState, randomize_entrances
+
+    parser = argparse.ArgumentParser(description="Entrance randomization benchmark")
+    parser.add_argument("--regions", type=int, nargs="+", default=[100, 400, 1000],
+                        help="Region counts to benchmark, each one is a separate run.")
+    parser.add_argument("--branching", type=int, default=3,
+                        help="Two-way transitions of regions that are not dead ends.")
+    parser.add_argument("--dead-end-ratio", type=float, default=0.3,
+                        help="Share of regions with only a single transition.")
+    parser.add_argument("--one-way-ratio", type=float, default=0.1,
+                        help="One-way transitions to add, relative to the amount of two-way transitions.")
+    parser.add_argument("--uncoupled", action="store_true", help="Randomize in uncoupled instead of coupled mode.")
+    parser.add_argument("--samples", type=int, default=5, help="Graphs to randomize per region count.")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Attempts with a new seed per sample after randomization fails.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(arguments)
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    TWO_WAY_GROUP = 1
+    ONE_WAY_GROUP = 2
+    group_lookup = {TWO_WAY_GROUP: [TWO_WAY_GROUP], ONE_WAY_GROUP: [ONE_WAY_GROUP]}
+
+    class EntranceBenchmarkWorld(World):
+        game = "Entrance Benchmark"
+        item_name_to_id = {}
+        location_name_to_id = {}
+        hidden = True
+
+    def create_multiworld(seed: int) -> MultiWorld:
+        multiworld = MultiWorld(1)
+        multiworld.game[1] = EntranceBenchmarkWorld.game
+        multiworld.player_name = {1: "Tester"}
+        multiworld.set_seed(seed)
+        options = argparse.Namespace()
+        for name, option in EntranceBenchmarkWorld.options_dataclass.type_hints.items():
+            setattr(options, name, {1: option.from_any(option.default)})
+        multiworld.set_options(options)
+        multiworld.state = CollectionState(multiworld)
+        return multiworld
+
+    def create_graph(multiworld: MultiWorld, region_count: int, rng: random.Random) -> int:
+        """Creates disconnected regions with ER exits and targets, returns the amount of exits."""
+        menu = Region("Menu", 1, multiworld)
+        regions = [Region(f"Region {index}", 1, multiworld) for index in range(region_count)]
+        multiworld.regions += [menu, *regions]
+
+        doors = {region: 1 if rng.random() < args.dead_end_ratio else max(2, args.branching) for region in regions}
+        # the menu can't be a dead end, and two-way transitions need a partner
+        doors = {menu: max(2, args.branching) + (sum(doors.values()) + max(2, args.branching)) % 2, **doors}
+        two_ways = 0
+        for region, door_count in doors.items():
+            for door in range(door_count):
+                name = f"{region.name} Door {door}"
+                for entrance in (region.create_exit(name), region.create_er_target(name)):
+                    entrance.randomization_type = EntranceType.TWO_WAY
+                    entrance.randomization_group = TWO_WAY_GROUP
+                two_ways += 1
+
+        one_ways = round(two_ways * args.one_way_ratio)
+        for index in range(one_ways):
+            source = rng.choice([menu, *regions])
+            exit_ = source.create_exit(f"One Way {index}")
+            target = rng.choice(regions).create_er_target(f"One Way {index} Target")
+            for entrance in (exit_, target):
+                entrance.randomization_type = EntranceType.ONE_WAY
+                entrance.randomization_group = ONE_WAY_GROUP
+        return two_ways + one_ways
+
+    def randomize(region_count: int, seed: int) -> typing.Tuple[int, ERPlacementState]:
+        multiworld = create_multiworld(seed)
+        exit_count = create_graph(multiworld, region_count, random.Random(seed))
+        return exit_count, randomize_entrances(multiworld.worlds[1], not args.uncoupled, group_lookup)
+
+    for region_count in args.regions:
+        times: typing.List[float] = []
+        placements = 0
+        sweeps = 0
+        attempts = 0
+        failures = 0
+        exhausted = 0
+        exit_count = 0
+        for sample in range(args.samples):
+            for retry in range(args.retries + 1):
+                seed = args.seed + sample + retry * args.samples
+                attempts += 1
+                gc.collect()
+                try:
+                    with TimeIt(f"{region_count} regions, seed {seed}") as t:
+                        exit_count, er_state = randomize(region_count, seed)
+                except EntranceRandomizationError as e:
+                    failures += 1
+                    logger.debug(f"Seed {seed} failed: {e}")
+                    continue
+                times.append(t.dif)
+                placements += len(er_state.placements)
+                sweeps += er_state.speculative_sweeps
+                break
+            else:
+                exhausted += 1
+
+        tracemalloc.start()
+        try:
+            randomize(region_count, args.seed)
+        except EntranceRandomizationError:
+            pass
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        mode = "uncoupled" if args.uncoupled else "coupled"
+        if times:
+            logger.info(f"{region_count} regions ({exit_count} exits, {mode}): "
+                        f"{placements / sum(times):.0f} placements per second, "
+                        f"median {statistics.median(times):.4f} seconds per randomization, "
+                        f"{sweeps / len(times):.1f} speculative sweeps per randomization.")
+        logger.info(f"{region_count} regions: {failures}/{attempts} attempts failed "
+                    f"({failures / attempts:.1%}), {exhausted} samples failed all retries, "
+                    f"peak memory {peak_memory / 2**20:.1f} MiB.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_entrances_benchmark()
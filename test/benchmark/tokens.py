@@ -0,0 +1,81 @@
+def run_tokens_benchmark(arguments=None):
+    """Build and apply large token binaries of procedure patches and report tokens per second. The amount and mix
+    of tokens can be tuned from the command line, see --help."""
+    import argparse
+    import logging
+    import random
+    import statistics
+    import typing
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from worlds.Files import APPatchExtension, APTokenMixin, APTokenTypes
+
+    parser = argparse.ArgumentParser(description="Procedure patch token benchmark")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Token counts to benchmark, each one is a separate run.")
+    parser.add_argument("--rom-size", type=int, default=32 * 2**20, help="Size of the patched file in bytes.")
+    parser.add_argument("--adjacent-ratio", type=float, default=0.5,
+                        help="Share of writes that continue where the write before them ended.")
+    parser.add_argument("--write-ratio", type=float, default=0.8,
+                        help="Share of WRITE tokens, the rest is split between the other token types.")
+    parser.add_argument("--samples", type=int, default=3, help="Times to build and apply each token set.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(arguments)
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    class TokenFile:
+        def __init__(self, data: bytes) -> None:
+            self.data = data
+
+        def get_file(self, file: str) -> bytes:
+            return self.data
+
+    other_types = [token_type for token_type in APTokenTypes if token_type != APTokenTypes.WRITE]
+
+    def create_tokens(token_count: int, rng: random.Random) -> APTokenMixin:
+        patch = APTokenMixin()
+        offset = 0
+        for _ in range(token_count):
+            if rng.random() >= args.adjacent_ratio:
+                offset = rng.randrange(args.rom_size - 256)
+            if rng.random() < args.write_ratio:
+                data = rng.randbytes(rng.randrange(1, 16))
+                patch.write_token(APTokenTypes.WRITE, offset, data)
+                offset += len(data)
+            else:
+                token_type = rng.choice(other_types)
+                if token_type in (APTokenTypes.COPY, APTokenTypes.RLE):
+                    patch.write_token(token_type, offset, (rng.randrange(1, 64), rng.randrange(256)))
+                else:
+                    patch.write_token(token_type, offset, rng.randrange(256))
+        return patch
+
+    rom = bytes(args.rom_size)
+    for token_count in args.tokens:
+        patch = create_tokens(token_count, random.Random(args.seed))
+        build_times: typing.List[float] = []
+        apply_times: typing.List[float] = []
+        token_binary = b""
+        for sample in range(args.samples):
+            with TimeIt(f"building {token_count} tokens") as t:
+                token_binary = patch.get_token_binary()
+            build_times.append(t.dif)
+            with TimeIt(f"applying {token_count} tokens") as t:
+                APPatchExtension.apply_tokens(TokenFile(token_binary), rom, "token_data.bin")
+            apply_times.append(t.dif)
+
+        stored_tokens = int.from_bytes(token_binary[:4], "little")
+        logger.info(f"{token_count} tokens ({stored_tokens} after joining writes, "
+                    f"{len(token_binary) / 2**20:.1f} MiB): "
+                    f"{token_count / statistics.median(build_times):.0f} tokens built per second, "
+                    f"{token_count / statistics.median(apply_times):.0f} tokens applied per second.")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_tokens_benchmark()
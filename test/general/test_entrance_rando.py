@@ -129,6 +129,36 @@ class TestEntranceLookup(unittest.TestCase):
         self.assertTrue(dead_end in lookup.dead_ends)
         self.assertEqual(len(lookup.dead_ends), 1)
 
+    def test_unplaced_targets(self):
+        """tests that targets into placed regions are skipped when requested, and removal keeps the lookup intact"""
+        multiworld = generate_test_multiworld()
+        generate_disconnected_region_grid(multiworld, 5)
+        exits_set = set([ex for region in multiworld.get_regions(1)
+                        for ex in region.exits if not ex.connected_region])
+
+        lookup = EntranceLookup(multiworld.worlds[1].random, coupled=True, usable_exits=exits_set)
+        er_targets = [entrance for region in multiworld.get_regions(1)
+                      for entrance in region.entrances if not entrance.parent_region]
+        for entrance in er_targets:
+            lookup.add(entrance)
+        placed_region = multiworld.get_region("region12", 1)
+        lookup.update_placed_regions({placed_region})
+        all_groups = list(ERTestGroups)
+
+        unplaced_targets = list(lookup.get_targets(all_groups, False, False, unplaced_only=True))
+        self.assertEqual(len(er_targets) - len(placed_region.entrances), len(unplaced_targets))
+        self.assertNotIn(placed_region, {target.connected_region for target in unplaced_targets})
+
+        for entrance in placed_region.entrances:
+            lookup.remove(entrance)
+        removed = unplaced_targets[:10]
+        for entrance in removed:
+            lookup.remove(entrance)
+        remaining = list(lookup.get_targets(all_groups, False, True))
+        self.assertEqual(len(lookup), len(remaining))
+        self.assertCountEqual(set(er_targets) - set(placed_region.entrances) - set(removed), remaining)
+
+
 class TestBakeTargetGroupLookup(unittest.TestCase):
     def test_lookup_generation(self):
         multiworld = generate_test_multiworld()
@@ -227,6 +257,33 @@ class TestDisconnectForRandomization(unittest.TestCase):
         self.assertEqual(2, r2.entrances[0].randomization_group)
 
 
+class TestERPlacementState(unittest.TestCase):
+    def test_speculative_connection_rolls_back(self):
+        """tests that testing a speculative connection leaves the live collection state unchanged"""
+        multiworld = generate_test_multiworld()
+        generate_disconnected_region_grid(multiworld, 2)
+        multiworld.get_region("region1", 1).add_event("Speculative Event")
+        exits_set = {ex for region in multiworld.get_regions(1) for ex in region.exits if not ex.connected_region}
+
+        er_state = ERPlacementState(multiworld.worlds[1], coupled=True)
+        state = er_state.collection_state
+        state.update_reachable_regions(1)
+        reachable_regions = state.reachable_regions[1].copy()
+        blocked_connections = state.blocked_connections[1].copy()
+        advancements = state.advancements.copy()
+
+        source_exit = multiworld.get_entrance("region0_right", 1)
+        target_entrance = next(entrance for entrance in multiworld.get_region("region1", 1).entrances
+                               if entrance.name == "region1_left")
+        self.assertTrue(er_state.test_speculative_connection(source_exit, target_entrance, exits_set))
+        self.assertEqual(1, er_state.speculative_sweeps)
+        self.assertEqual(reachable_regions, state.reachable_regions[1])
+        self.assertEqual(blocked_connections, state.blocked_connections[1])
+        self.assertEqual(advancements, state.advancements)
+        self.assertFalse(state.has("Speculative Event", 1))
+        self.assertNotIn(multiworld.get_region("region1", 1), state.path)
+
+
 class TestRandomizeEntrances(unittest.TestCase):
     def test_determinism(self):
         """tests that the same output is produced for the same input"""
@@ -0,0 +1,184 @@
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+
+from worlds import APWorldIndex, WorldManifest, network_data_package, world_sources
+from worlds.AutoWorld import AutoWorldRegister, WorldTypes
+from worlds.LauncherComponents import Component, LazyComponent, SuffixIdentifier, Type, components
+
+
+class TestWorldTypes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.world_types = WorldTypes()
+        self.loaded = []
+
+        def load() -> None:
+            self.loaded.append("source")
+            dict.__setitem__(self.world_types, "Game A", object)
+            dict.__setitem__(self.world_types, "Game B", int)
+
+        self.world_types.pending.update({"Game A": load, "Game B": load})
+
+    def test_lookup_loads_once(self) -> None:
+        self.assertIn("Game B", self.world_types)
+        self.assertEqual(self.loaded, [], "membership test imported the world")
+        self.assertIs(self.world_types["Game B"], int)
+        self.assertIs(self.world_types["Game A"], object)
+        self.assertEqual(self.loaded, ["source"])
+
+    def test_unknown_game(self) -> None:
+        self.assertNotIn("Game C", self.world_types)
+        self.assertIsNone(self.world_types.get("Game C"))
+        with self.assertRaises(KeyError):
+            self.world_types["Game C"]
+        self.assertEqual(self.loaded, [])
+
+    def test_iteration_loads_all(self) -> None:
+        self.assertEqual(sorted(self.world_types), ["Game A", "Game B"])
+        self.assertEqual(self.loaded, ["source"])
+        self.assertFalse(self.world_types.pending)
+
+    def test_direct_import(self) -> None:
+        """A world that gets imported directly instead of through its loader is no longer pending."""
+        self.world_types["Game A"] = object
+        self.assertNotIn("Game A", self.world_types.pending)
+        self.assertIs(self.world_types["Game A"], object)
+        self.assertEqual(self.loaded, [])
+
+
+class TestWorldManifest(unittest.TestCase):
+    def test_data_packages_complete(self) -> None:
+        """Data packages exist for all registered games, lazy or not."""
+        self.assertEqual(set(network_data_package["games"]), set(AutoWorldRegister.world_types))
+
+    def test_manifest_roundtrip(self) -> None:
+        source = next(source for source in world_sources if source.module_name == "clique")
+        fingerprint = source.get_fingerprint()
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "manifest.json")
+            manifest = WorldManifest(path)
+            self.assertIsNone(manifest.get_games(source, fingerprint))
+            manifest.update(source, fingerprint)
+            manifest.save()
+
+            loaded = WorldManifest(path)
+            games = loaded.get_games(source, fingerprint)
+            self.assertEqual(games, {"Clique": network_data_package["games"]["Clique"]["checksum"]})
+            self.assertIsNone(loaded.get_games(source, "outdated"))
+
+            self.assertEqual(loaded.get_entry(source, fingerprint)["components"], [])
+            self.assertEqual(loaded.get_entry(source, fingerprint)["settings"], {})
+
+    def test_manifest_settings(self) -> None:
+        """Worlds that define settings list them, so host.yaml can find them without importing all worlds."""
+        source = next(source for source in world_sources if source.module_name == "alttp")
+        fingerprint = source.get_fingerprint()
+        world = AutoWorldRegister.world_types["A Link to the Past"]
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "manifest.json")
+            manifest = WorldManifest(path)
+            manifest.update(source, fingerprint)
+            manifest.save()
+
+            entry = WorldManifest(path).get_entry(source, fingerprint)
+            self.assertEqual(entry["settings"], {world.settings_key: f"{world.__module__}.{world.__name__}"})
+
+    def test_manifest_components(self) -> None:
+        """Components and icons round trip through the manifest, and icons inside packages get cached."""
+        source = next(source for source in world_sources if source.module_name == "clique")
+        fingerprint = source.get_fingerprint()
+        component = Component("Test Client", func=print, game_name="Clique", icon="test",
+                              file_identifier=SuffixIdentifier(".aptest"))
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "manifest.json")
+            manifest = WorldManifest(path)
+            manifest.update(source, fingerprint, [component], {"test": "ap:worlds.clique/docs/en_Clique.md"})
+            manifest.save()
+
+            entry = WorldManifest(path).get_entry(source, fingerprint)
+            self.assertEqual(entry["components"], [component.to_manifest()])
+            self.assertTrue(entry["icons"]["test"].startswith(tempdir))
+            self.assertTrue(os.path.isfile(entry["icons"]["test"]))
+            lazy_component = LazyComponent(entry["components"][0], lambda: None)
+            self.assertEqual(lazy_component.type, Type.CLIENT)
+            self.assertTrue(lazy_component.handles_file("seed.aptest"))
+
+
+class TestLazyComponent(unittest.TestCase):
+    def setUp(self) -> None:
+        self.components = components[:]
+        self.ran = []
+        self.component = Component("Lazy Test Client", func=self.ran.append, icon="test")
+        self.lazy_component = LazyComponent(self.component.to_manifest(), lambda: components.append(self.component))
+        components.append(self.lazy_component)
+
+    def tearDown(self) -> None:
+        components[:] = self.components
+
+    def test_run_imports_world(self) -> None:
+        """Running a stand-in imports its world and replaces the stand-in with the component the world registers."""
+        self.lazy_component.func("seed.aptest")
+        self.assertEqual(self.ran, ["seed.aptest"])
+        self.assertIn(self.component, components)
+        self.assertNotIn(self.lazy_component, components)
+
+    def test_missing_component(self) -> None:
+        self.lazy_component.loader = lambda: None
+        with self.assertRaises(Exception):
+            self.lazy_component.func()
+
+
+class TestAPWorldIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.apworld = os.path.join(self.tempdir.name, "test.apworld")
+        self.write_apworld({"game": "Test Game", "world_version": "1.0.0"})
+        self.index_path = os.path.join(self.tempdir.name, "apworlds.json")
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def write_apworld(self, metadata: dict) -> None:
+        with zipfile.ZipFile(self.apworld, "w") as zf:
+            zf.writestr("test/__init__.py", "")
+            zf.writestr("test/archipelago.json", json.dumps(metadata))
+
+    def test_metadata(self) -> None:
+        index = APWorldIndex(self.index_path)
+        entry = index.get(self.apworld)
+        self.assertEqual(entry["game"], "Test Game")
+        self.assertEqual(entry["metadata"]["world_version"], "1.0.0")
+        index.save()
+
+        # unchanged files are looked up by their stat, without hashing or opening them again
+        index = APWorldIndex(self.index_path)
+        index.entries[self.apworld]["metadata"] = {"game": "Cached Game"}
+        self.assertEqual(index.get(self.apworld)["metadata"]["game"], "Cached Game")
+        self.assertFalse(index.changed)
+
+    def test_changes(self) -> None:
+        index = APWorldIndex(self.index_path)
+        content_hash = index.get(self.apworld)["sha256"]
+        os.utime(self.apworld, ns=(0, 0))
+        self.assertEqual(index.get(self.apworld)["sha256"], content_hash, "touching an .apworld changed its hash")
+        self.write_apworld({"game": "Other Game"})
+        entry = index.get(self.apworld)
+        self.assertNotEqual(entry["sha256"], content_hash)
+        self.assertEqual(entry["game"], "Other Game")
+
+    def test_no_game(self) -> None:
+        self.write_apworld({"game": ["Test Game"]})
+        self.assertIsNone(APWorldIndex(self.index_path).get(self.apworld)["game"])
+        with zipfile.ZipFile(self.apworld, "w") as zf:
+            zf.writestr("test/__init__.py", "")
+        self.assertIsNone(APWorldIndex(self.index_path).get(self.apworld)["game"])
+
+    def test_removed(self) -> None:
+        index = APWorldIndex(self.index_path)
+        index.get(self.apworld)
+        index.save()
+        index = APWorldIndex(self.index_path)
+        index.save()
+        self.assertEqual(APWorldIndex(self.index_path).entries, {}, "removed .apworld kept its entry")
@@ -0,0 +1,77 @@
+import unittest
+
+from test.general import generate_test_multiworld
+from worlds.generic.LogicCompiler import ItemClauses, LogicCompiler
+from worlds.generic.Rules import And, CanReach, Has, HasAll, Or
+
+
+class TestLogicCompiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.state = self.multiworld.state
+        self.state.prog_items[1].update({"Sword": 2, "Shield": 1})
+        self.calls = 0
+
+        def counted(state) -> bool:
+            self.calls += 1
+            return True
+
+        self.compiler = LogicCompiler({
+            "Sword": Has("Sword", 1),
+            "Swords": Has("Sword", 1, 2),
+            "Shield": Has("Shield", 1),
+            "Bow": Has("Bow", 1),
+            "Menu": CanReach("Menu", 1),
+            "Counted": counted,
+            "Enabled": True,
+            "Disabled": False,
+        })
+
+    def test_constants(self) -> None:
+        self.assertIsInstance(self.compiler.compile_dnf([["Disabled", "Bow"], ["Enabled"]]), And)
+        self.assertTrue(self.compiler.compile_dnf([[]])(self.state))
+        self.assertFalse(self.compiler.compile_dnf([])(self.state))
+        self.assertFalse(self.compiler.compile_dnf([["Disabled"]])(self.state))
+        rule = self.compiler.compile_dnf([["Enabled", "Bow"]])
+        self.assertEqual(HasAll, type(rule))
+        self.assertFalse(rule(self.state))
+
+    def test_item_clauses(self) -> None:
+        """Verify that item only clauses get merged into one lookup and redundant clauses get dropped."""
+        rule = self.compiler.compile_dnf([["Bow", "Shield"], ["Sword", "Swords"], ["Bow", "Shield", "Sword"]])
+        self.assertIsInstance(rule, ItemClauses)
+        self.assertCountEqual([(("Sword", 2),), (("Bow", 1), ("Shield", 1))], rule.clauses)
+        self.assertTrue(rule(self.state))
+        self.assertEqual({(1, "Sword"), (1, "Bow"), (1, "Shield")}, rule.dependencies)
+        self.state.prog_items[1]["Sword"] = 1
+        self.assertFalse(rule(self.state))
+
+    def test_mixed_clauses(self) -> None:
+        rule = self.compiler.compile_dnf([["Counted", "Menu"], ["Bow"]])
+        self.assertIsInstance(rule, Or)
+        self.assertIsNone(rule.dependencies)
+        self.assertTrue(rule(self.state))
+        self.assertEqual(1, self.calls)
+        self.assertIs(self.compiler.compile_dnf([["Menu", "Counted"], ["Shield"]]).rules[1], rule.rules[1],
+                      "identical clauses were not shared")
+
+    def test_expressions(self) -> None:
+        rule = self.compiler.compile(("and", "Sword", ("or", "Bow", "Shield", "Disabled")))
+        self.assertIsInstance(rule, ItemClauses)
+        self.assertTrue(rule(self.state))
+        self.assertFalse(self.compiler.compile(("and", "Bow", "Sword"))(self.state))
+
+    def test_large_expressions(self) -> None:
+        """Verify that expressions too large for disjunctive normal form get compiled as they are."""
+        compiler = LogicCompiler(self.compiler.symbols, max_clauses=4)
+        expression = ("and", *(("or", "Sword", "Bow") for _ in range(3)), "Shield")
+        rule = compiler.compile(expression)
+        self.assertIsInstance(rule, And)
+        self.assertTrue(rule(self.state))
+        self.assertFalse(compiler.compile(("and", expression, "Bow"))(self.state))
+
+    def test_unknown_operator(self) -> None:
+        with self.assertRaises(ValueError):
+            self.compiler.compile(("xor", "Sword", "Bow"))
+        with self.assertRaises(KeyError):
+            self.compiler.compile_dnf([["Hookshot"]])
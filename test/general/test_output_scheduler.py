@@ -0,0 +1,64 @@
+import multiprocessing
+import threading
+import time
+import unittest
+
+from worlds.OutputScheduler import OutputScheduler
+
+
+def double(value: int) -> int:
+    return value * 2
+
+
+def run_in_daemon(results: "multiprocessing.Queue[int]") -> None:
+    with OutputScheduler(processes=1) as scheduler:
+        results.put(scheduler.run(double, 5))
+
+
+class TestOutputScheduler(unittest.TestCase):
+    def test_limits(self) -> None:
+        """Verify that reservations respect CPU slots and the memory limit, and a nested reservation runs in the outer one."""
+        scheduler = OutputScheduler(cpu_slots=3, memory_limit=100)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(memory: int) -> None:
+            with scheduler.reserve(memory):
+                with scheduler.reserve(memory):
+                    with lock:
+                        active.append(memory)
+                        peak.append((len(active), sum(active)))
+                    time.sleep(0.01)
+                    with lock:
+                        active.remove(memory)
+
+        threads = [threading.Thread(target=scheduler.timed, args=(f"world {index}", work, memory))
+                   for index, memory in enumerate((60, 60, 10, 10, 10, 150))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(count <= 3 for count, _ in peak), peak)
+        self.assertTrue(all(memory <= 100 or count == 1 for count, memory in peak), peak)
+        self.assertEqual(6, len(scheduler.timings))
+        self.assertEqual("world", scheduler.get_slowest(1)[0][0].split()[0])
+
+    def test_run(self) -> None:
+        scheduler = OutputScheduler()
+        self.assertEqual(4, scheduler.run(double, 2))
+
+    def test_run_in_process(self) -> None:
+        with OutputScheduler(processes=1) as scheduler:
+            self.assertEqual(6, scheduler.run(double, 3))
+
+    def test_run_in_daemon(self) -> None:
+        """Verify that a daemonic process, which can't start output processes, runs output in place instead."""
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=run_in_daemon, args=(results,), daemon=True)
+        process.start()
+        try:
+            self.assertEqual(10, results.get(timeout=60))
+        finally:
+            process.join(10)
@@ -1,6 +1,34 @@
-﻿import unittest
+﻿import random
+import unittest
 from worlds.AutoWorld import AutoWorldRegister
-from worlds.Files import AutoPatchRegister
+from worlds.Files import APPatchExtension, APTokenMixin, APTokenTypes, AutoPatchRegister
+
+
+class TokenFile:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def get_file(self, file: str) -> bytes:
+        return self.data
+
+
+def apply_tokens_in_order(rom: bytes, tokens) -> bytes:
+    """Applies tokens one by one, the way apply_tokens has to behave."""
+    rom_data = bytearray(rom)
+    for token_type, offset, args in tokens:
+        if token_type == APTokenTypes.WRITE:
+            rom_data[offset:offset + len(args)] = args
+        elif token_type == APTokenTypes.COPY:
+            rom_data[offset:offset + args[0]] = rom_data[args[1]:args[1] + args[0]]
+        elif token_type == APTokenTypes.RLE:
+            rom_data[offset:offset + args[0]] = bytes([args[1]] * args[0])
+        elif token_type == APTokenTypes.AND_8:
+            rom_data[offset] &= args
+        elif token_type == APTokenTypes.OR_8:
+            rom_data[offset] |= args
+        else:
+            rom_data[offset] ^= args
+    return bytes(rom_data)
 
 
 class TestPatches(unittest.TestCase):
@@ -9,3 +37,43 @@ class TestPatches(unittest.TestCase):
             with self.subTest(game=game_name):
                 self.assertIn(game_name, AutoWorldRegister.world_types.keys(),
                               f"Patch '{game_name}' does not match the name of any world.")
+
+    def test_tokens(self) -> None:
+        """Tests that token binaries apply like their tokens would one by one, with writes getting joined."""
+        rng = random.Random(0)
+        rom = rng.randbytes(512)
+        patch = APTokenMixin()
+        offset = 0
+        for _ in range(2000):
+            token_type = rng.choice(list(APTokenTypes))
+            # mostly adjacent writes, with some overlapping the tokens before
+            offset = offset if rng.random() < 0.5 else rng.randrange(480)
+            if token_type == APTokenTypes.WRITE:
+                data = rng.randbytes(rng.randrange(16))
+                patch.write_token(token_type, offset, data)
+                offset += len(data)
+            elif token_type in (APTokenTypes.COPY, APTokenTypes.RLE):
+                patch.write_token(token_type, offset, (rng.randrange(16), rng.randrange(256)))
+            else:
+                patch.write_token(token_type, offset, rng.randrange(256))
+        token_binary = patch.get_token_binary()
+        self.assertLess(int.from_bytes(token_binary[:4], "little"), len(patch._tokens), "writes were not joined")
+        self.assertEqual(apply_tokens_in_order(rom, patch._tokens),
+                         APPatchExtension.apply_tokens(TokenFile(token_binary), rom, "token_data.bin"))
+
+    def test_unjoined_tokens(self) -> None:
+        """Tests that token binaries with a token per write, like older patches have, still apply."""
+        tokens = [(APTokenTypes.WRITE, 0, b"\x01\x02"), (APTokenTypes.WRITE, 2, b"\x03"),
+                  (APTokenTypes.OR_8, 1, 0xF0), (APTokenTypes.WRITE, 3, b"\x04"), (APTokenTypes.COPY, 4, (4, 0))]
+        token_binary = bytearray(len(tokens).to_bytes(4, "little"))
+        for token_type, offset, args in tokens:
+            if token_type == APTokenTypes.WRITE:
+                payload = args
+            elif token_type == APTokenTypes.COPY:
+                payload = args[0].to_bytes(4, "little") + args[1].to_bytes(4, "little")
+            else:
+                payload = bytes([args])
+            token_binary += bytes([token_type]) + offset.to_bytes(4, "little") + len(payload).to_bytes(4, "little")
+            token_binary += payload
+        self.assertEqual(b"\x01\xf2\x03\x04\x01\xf2\x03\x04",
+                         APPatchExtension.apply_tokens(TokenFile(bytes(token_binary)), bytes(8), "token_data.bin"))
@@ -0,0 +1,65 @@
+import unittest
+
+from BaseClasses import Item, ItemClassification, Location, Region
+from test.general import generate_test_multiworld
+from worlds.generic.Rules import And, CanReach, Count, Has, HasAll, HasAny, Or, add_rule, set_rule
+
+
+class TestRules(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.state = self.multiworld.state
+        self.state.prog_items[1].update({"Sword": 2, "Shield": 1})
+
+    def test_items(self) -> None:
+        self.assertTrue(Has("Sword", 1, 2)(self.state))
+        self.assertFalse(Has("Sword", 1, 3)(self.state))
+        self.assertTrue(HasAll(["Sword", "Shield"], 1)(self.state))
+        self.assertFalse(HasAll({"Sword": 1, "Shield": 2}, 1)(self.state))
+        self.assertTrue(HasAny(["Bow", "Shield"], 1)(self.state))
+        self.assertFalse(HasAny(["Bow", "Hookshot"], 1)(self.state))
+        self.assertTrue(Count(["Sword", "Shield", "Bow"], 1, 3)(self.state))
+        self.assertFalse(Count(["Sword", "Bow"], 1, 3)(self.state))
+
+    def test_combinations(self) -> None:
+        rule = Has("Sword", 1) & (Has("Bow", 1) | Has("Shield", 1)) & Has("Sword", 1, 2)
+        self.assertIsInstance(rule, And)
+        self.assertEqual(2, len(rule.rules), "item checks were not merged")
+        self.assertTrue(rule(self.state))
+        self.assertEqual({(1, "Sword"), (1, "Bow"), (1, "Shield")}, rule.dependencies)
+        self.assertFalse((Has("Bow", 1) | Has("Sword", 1, 3))(self.state))
+        self.assertTrue(Or()(self.state) is False and And()(self.state) is True)
+
+    def test_can_reach_has_no_dependencies(self) -> None:
+        rule = Has("Sword", 1) & CanReach("Menu", 1)
+        self.assertIsNone(rule.dependencies)
+        self.assertTrue(rule(self.state))
+
+    def test_add_rule_keeps_rules(self) -> None:
+        location = Location(1, "Test Location", None, self.multiworld.get_region("Menu", 1))
+        set_rule(location, Has("Sword", 1))
+        add_rule(location, Has("Bow", 1), "or")
+        self.assertIsInstance(location.access_rule, Or)
+        self.assertTrue(location.access_rule(self.state))
+        add_rule(location, lambda state: False)
+        self.assertFalse(location.access_rule(self.state))
+
+    def test_sweep(self) -> None:
+        """Verify that a sweep reaches locations behind declarative rules, also when they were blocked before."""
+        menu = self.multiworld.get_region("Menu", 1)
+        region = Region("Region", 1, self.multiworld)
+        self.multiworld.regions.append(region)
+        menu.connect(region, rule=Has("Key", 1))
+        for index, (requirement, reward) in enumerate((("Key", "Lamp"), ("Lamp", "Map"), ("Compass", "Map"))):
+            location = Location(1, f"Location {index}", None, menu if index != 1 else region)
+            location.place_locked_item(Item(reward, ItemClassification.progression, None, 1))
+            set_rule(location, Has(requirement, 1))
+            location.parent_region.locations.append(location)
+        key_location = Location(1, "Key Location", None, menu)
+        key_location.place_locked_item(Item("Key", ItemClassification.progression, None, 1))
+        menu.locations.append(key_location)
+        set_rule(key_location, Has("Shield", 1))
+
+        self.state.sweep_for_advancements()
+        self.assertTrue(self.state.has_all(["Key", "Lamp", "Map"], 1))
+        self.assertFalse(self.state.has("Compass", 1))
@@ -0,0 +1,230 @@
+import asyncio
+import base64
+import json
+import time
+import unittest
+
+from worlds._bizhawk import BizHawkContext, ConnectionStatus, MemoryWatcher, RequestBatch, RequestFailedError, \
+    disconnect, get_hash, get_script_version, guarded_write, ping, read, send_requests, start_binary_framing, \
+    start_pipeline
+from worlds._bizhawk.framing import decode_requests, encode_responses, frame_size
+
+
+def as_bytes(value):
+    return base64.b64decode(value) if isinstance(value, str) else value
+
+
+class FakeConnector:
+    """Answers requests like the connector script would, over a local socket, with 16 bytes of memory."""
+    memory: bytearray
+    messages: list
+    watches: dict
+    """Watched ranges by id, with when they were last polled and their contents at that time."""
+    watch_changes: list
+    """The changes the last WATCH_POLL reported."""
+    answer_in_reverse: int
+    """Collects this many tagged messages before answering them in reverse order."""
+    writer: asyncio.StreamWriter
+    closed: asyncio.Event
+
+    def __init__(self, script_version: int) -> None:
+        self.script_version = script_version
+        self.memory = bytearray(range(16))
+        self.watches = {}
+        self.messages = []
+        self.answer_in_reverse = 0
+        self.closed = asyncio.Event()
+
+    def process(self, requests: list) -> list:
+        responses = []
+        for request in requests:
+            if responses and responses[-1]["type"] == "GUARD_RESPONSE" and not responses[-1]["value"]:
+                responses.append(responses[-1])
+            elif request["type"] == "PING":
+                responses.append({"type": "PONG"})
+            elif request["type"] == "HASH":
+                responses.append({"type": "HASH_RESPONSE", "value": "F7D18982"})
+            elif request["type"] == "GUARD":
+                expected = as_bytes(request["expected_data"])
+                actual = self.memory[request["address"]:request["address"] + len(expected)]
+                responses.append({"type": "GUARD_RESPONSE", "value": actual == expected,
+                                  "address": request["address"]})
+            elif request["type"] == "READ":
+                value = self.memory[request["address"]:request["address"] + request["size"]]
+                responses.append({"type": "READ_RESPONSE", "value": base64.b64encode(value).decode("ascii")})
+            elif request["type"] == "WRITE":
+                value = as_bytes(request["value"])
+                self.memory[request["address"]:request["address"] + len(value)] = value
+                responses.append({"type": "WRITE_RESPONSE"})
+            elif request["type"] == "WATCH":
+                self.watches[request["id"]] = (request["address"], request["size"], request["interval"], None, None)
+                responses.append({"type": "WATCH_RESPONSE"})
+            elif request["type"] == "UNWATCH":
+                del self.watches[request["id"]]
+                responses.append({"type": "UNWATCH_RESPONSE"})
+            elif request["type"] == "WATCH_POLL":
+                changes = []
+                now = time.monotonic()
+                for watch_id, (address, size, interval, last_check, old_data) in self.watches.items():
+                    if last_check is not None and now - last_check < interval:
+                        continue
+                    data = bytes(self.memory[address:address + size])
+                    if data != old_data:
+                        first = 0 if old_data is None else next(i for i in range(size) if data[i] != old_data[i])
+                        last = size if old_data is None else \
+                            next(i for i in reversed(range(size)) if data[i] != old_data[i]) + 1
+                        changes.append({"id": watch_id, "offset": first,
+                                        "value": base64.b64encode(data[first:last]).decode("ascii")})
+                    self.watches[watch_id] = (address, size, interval, now, data)
+                self.watch_changes = changes
+                responses.append({"type": "WATCH_POLL_RESPONSE", "value": changes})
+        return responses
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        try:
+            await self.handle_lines(reader, writer)
+        finally:
+            writer.close()
+            self.closed.set()
+
+    async def handle_lines(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        held = []
+        while line := await reader.readline():
+            if line == b"VERSION\n":
+                writer.write(f"{self.script_version}\n".encode())
+                continue
+            if line == b"BINARY 1\n":
+                writer.write(line)
+                await self.handle_frames(reader, writer)
+                return
+            message = json.loads(line)
+            self.messages.append(message)
+            if isinstance(message, list):
+                writer.write(json.dumps(self.process(message)).encode() + b"\n")
+                continue
+            held.append({"id": message["id"], "responses": self.process(message["requests"])})
+            if len(held) >= self.answer_in_reverse:
+                for response in reversed(held):
+                    writer.write(json.dumps(response).encode() + b"\n")
+                held.clear()
+
+    async def handle_frames(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                size, = frame_size.unpack(await reader.readexactly(frame_size.size))
+                message_id, requests = decode_requests(await reader.readexactly(size))
+                self.messages.append(requests)
+                writer.write(encode_responses(message_id, self.process(requests)))
+        except asyncio.IncompleteReadError:
+            pass
+
+
+class TestBizHawkTransport(unittest.IsolatedAsyncioTestCase):
+    async def connect(self, script_version: int) -> None:
+        self.connector = FakeConnector(script_version)
+        self.server = await asyncio.start_server(self.connector.handle, "127.0.0.1", 0)
+        self.ctx = BizHawkContext()
+        self.ctx.streams = await asyncio.open_connection("127.0.0.1", self.server.sockets[0].getsockname()[1])
+        self.ctx.connection_status = ConnectionStatus.TENTATIVE
+        self.assertEqual(script_version, await get_script_version(self.ctx))
+
+    async def asyncTearDown(self) -> None:
+        disconnect(self.ctx)
+        await asyncio.wait_for(self.connector.closed.wait(), 5)
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_untagged(self) -> None:
+        """Test that requests still work with connector scripts that don't know tagged messages."""
+        await self.connect(1)
+        self.assertEqual([bytes((2, 3))], await read(self.ctx, [(2, 2, "RAM")]))
+        self.assertIsInstance(self.connector.messages[0], list)
+
+    async def test_pipelined(self) -> None:
+        """Test that messages in flight at the same time get the responses with their id."""
+        await self.connect(2)
+        start_pipeline(self.ctx)
+        self.connector.answer_in_reverse = 2
+        _, rom_hash = await asyncio.gather(ping(self.ctx), get_hash(self.ctx))
+        self.assertEqual("F7D18982", rom_hash)
+        self.assertEqual(ConnectionStatus.CONNECTED, self.ctx.connection_status)
+        self.assertEqual(2, len(self.connector.messages))
+
+        self.connector.answer_in_reverse = 0
+        reads = await asyncio.gather(*(read(self.ctx, [(address, 1, "RAM")]) for address in range(8)))
+        self.assertEqual([[bytes((address,))] for address in range(8)], reads)
+
+    async def test_batch(self) -> None:
+        """Test that a batch is sent as one message and skips everything after a failed guard."""
+        await self.connect(2)
+        start_pipeline(self.ctx)
+        batch = RequestBatch()
+        flags = batch.read(4, 2, "RAM")
+        write = batch.write(0, b"\xff", "RAM")
+        guard = batch.guard(0, b"\x00", "RAM")
+        skipped = batch.read(8, 1, "RAM")
+        results = await batch.send(self.ctx)
+        self.assertEqual(1, len(self.connector.messages))
+        self.assertEqual(bytes((4, 5)), results[flags])
+        self.assertIs(True, results[write])
+        self.assertIs(False, results[guard])
+        self.assertIsNone(results[skipped])
+
+    async def test_connection_lost(self) -> None:
+        """Test that requests waiting for a response fail once the connection is lost."""
+        await self.connect(2)
+        start_pipeline(self.ctx)
+        self.connector.answer_in_reverse = 2
+        request = asyncio.create_task(send_requests(self.ctx, [{"type": "PING"}]))
+        await asyncio.sleep(0.1)
+        self.connector.writer.close()
+        with self.assertRaises(RequestFailedError):
+            await request
+        self.assertEqual(ConnectionStatus.NOT_CONNECTED, self.ctx.connection_status)
+
+    async def test_binary(self) -> None:
+        """Test that memory data is sent as raw bytes with binary framing, and that other requests still work."""
+        await self.connect(3)
+        await start_binary_framing(self.ctx)
+        self.assertTrue(self.ctx.binary and self.ctx.pipelined)
+        self.assertEqual("F7D18982", await get_hash(self.ctx))
+        self.assertTrue(await guarded_write(self.ctx, [(0, b"\xfe\xff", "RAM")], [(2, b"\x02", "RAM")]))
+        self.assertEqual(b"\xfe\xff\x02", self.connector.memory[:3])
+        self.assertEqual([bytes((0xfe, 0xff, 2))], await read(self.ctx, [(0, 3, "RAM")]))
+        self.assertEqual(b"\xfe\xff", self.connector.messages[1][1]["value"])
+
+        # responses from send_requests stay the same as without binary framing
+        response = (await send_requests(self.ctx, [{"type": "READ", "address": 2, "size": 1, "domain": "RAM"}]))[0]
+        self.assertEqual(base64.b64encode(b"\x02").decode("ascii"), response["value"])
+
+    async def test_watch(self) -> None:
+        """Test that watched ranges are only reported when they changed, with and without the connector's help."""
+        for script_version in (3, 4):
+            with self.subTest(script_version=script_version):
+                await self.connect(script_version)
+                start_pipeline(self.ctx)
+                watcher = MemoryWatcher()
+                watcher.watch("flags", 4, 4, "RAM")
+                watcher.watch("counter", 8, 1, "RAM")
+                watcher.watch("slow", 12, 1, "RAM", interval=3600)
+                self.assertEqual({"flags": bytes((4, 5, 6, 7)), "counter": b"\x08", "slow": b"\x0c"},
+                                 await watcher.poll(self.ctx))
+                self.assertEqual({}, await watcher.poll(self.ctx))
+
+                self.connector.memory[6] = 0xff
+                self.connector.memory[12] = 0xff
+                watcher.unwatch("counter")
+                self.assertEqual({"flags": bytes((4, 5, 0xff, 7))}, await watcher.poll(self.ctx))
+                if script_version >= 4:
+                    self.assertNotIn("counter", self.connector.watches)
+                    # the connector only sends the changed byte
+                    self.assertEqual([{"id": "flags", "offset": 2, "value": "/w=="}], self.connector.watch_changes)
+
+                # a range watched while a poll is in flight gets registered by the next poll
+                poll = asyncio.create_task(watcher.poll(self.ctx))
+                await asyncio.sleep(0)
+                watcher.watch("late", 0, 2, "RAM")
+                await poll
+                self.assertEqual({"late": b"\x00\x01"}, await watcher.poll(self.ctx))
+                await self.asyncTearDown()
@@ -1,7 +1,9 @@
+import re
 import unittest
 
 import NetUtils
 from CommonClient import CommonContext
+from worlds import network_data_package
 
 
 class TestCommonContext(unittest.IsolatedAsyncioTestCase):
@@ -47,6 +49,12 @@ class TestCommonContext(unittest.IsolatedAsyncioTestCase):
         assert "Archipelago" in self.ctx.item_names, "Archipelago item names entry does not exist"
         assert "Archipelago" in self.ctx.location_names, "Archipelago location names entry does not exist"
 
+    async def test_local_name_lookups(self):
+        # games the server sent no data package for are looked up in the installed worlds on first use
+        item_name, item_id = next(iter(network_data_package["games"]["Clique"]["item_name_to_id"].items()))
+        assert self.ctx.item_names["Clique"][item_id] == item_name
+        assert self.ctx.item_names["Clique"][-1] == "Nothing"
+
     async def test_explicit_name_lookups(self):
         # Items
         assert self.ctx.item_names["__TestGame1"][2**54+1] == "Test Item 1 - Safe"
@@ -93,3 +101,20 @@ class TestCommonContext(unittest.IsolatedAsyncioTestCase):
         assert self.ctx.item_names.lookup_in_slot(-1, 3) == "Nothing"
         assert self.ctx.item_names.lookup_in_game(-1, "__TestGame1") == "Nothing"
         assert self.ctx.item_names.lookup_in_game(-1, "__TestGame2") == "Nothing"
+
+    async def test_item_send_summary(self):
+        """Verify that ItemSend messages past the limit get summarized by sending and receiving player,
+        except the ones sent or received by the client's own slot."""
+        self.ctx.item_send_limit = 2
+        self.ctx.item_send_interval = 60
+        self.ctx.slot = 3
+        self.ctx.player_names.update({1: "Player 1", 2: "Player 2", 3: "Player 3"})
+        with self.assertLogs("StreamLog") as logs:
+            for index, (sender, receiving) in enumerate(((1, 2), (1, 2), (1, 2), (3, 2), (1, 3), (1, 2), (1, 1))):
+                self.ctx.on_print_json({"cmd": "PrintJSON", "type": "ItemSend", "receiving": receiving,
+                                        "item": NetUtils.NetworkItem(2 ** 54 + 1, 2 ** 54 + 1, sender, 0),
+                                        "data": [{"text": f"Item Send {index}"}]})
+            self.ctx.print_item_send_summary()
+        self.assertEqual(["Item Send 0", "Item Send 1", "Item Send 3", "Item Send 4",
+                          "Player 1 sent 2 more items to Player 2.", "Player 1 found 1 more item of their own."],
+                         [re.sub("\033\\[[0-9;]*m", "", record.getMessage()) for record in logs.records])
@@ -1,5 +1,14 @@
+import asyncio
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+
+from typing_extensions import override
+
+from MultiServer import Client, Context, DataStorageSubscriptions, ServerCommandProcessor, process_client_cmd
+from NetUtils import Endpoint, decode
+
+if typing.TYPE_CHECKING:
+    from NetUtils import ServerConnection
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +47,71 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestDataStorage(unittest.IsolatedAsyncioTestCase):
+    @override
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        # the replies are only queued, nothing gets sent through the sockets
+        self.client = Client(typing.cast("ServerConnection", None), self.ctx)
+        self.client.slot = 1
+        self.tracker = Client(typing.cast("ServerConnection", None), self.ctx)
+
+    def get_replies(self, client: Client) -> typing.List[typing.Dict[str, typing.Any]]:
+        return decode(f"[{','.join(self.ctx.pending_set_replies.get(client, []))}]")
+
+    def test_subscriptions(self) -> None:
+        subscriptions = DataStorageSubscriptions()
+        subscriptions.add_key("tracker_1_map", self.client)
+        subscriptions.add_prefix("tracker_", self.tracker)
+        subscriptions.add_prefix("", self.client)
+        self.assertEqual(subscriptions.get_subscribers("tracker_1_map"), {self.client, self.tracker})
+        self.assertEqual(subscriptions.get_subscribers("tracker"), {self.client})
+        subscriptions = DataStorageSubscriptions()
+        subscriptions.add_prefix("tracker_", self.tracker)
+        self.assertEqual(subscriptions.get_subscribers("other"), set())
+
+    async def test_batch(self) -> None:
+        """Verify that batched sets apply in order and that their replies are queued for one message per client."""
+        self.ctx.stored_data_notification_clients.add_prefix("tracker_", self.tracker)
+        self.ctx.set_stored_data(self.client, [
+            {"key": "tracker_a", "operations": [{"operation": "update", "value": [1]}], "default": []},
+            {"key": "tracker_a", "operations": [{"operation": "add", "value": [2]}], "want_reply": True},
+            {"key": "other", "operations": [{"operation": "replace", "value": 3}], "tag": "x"},
+        ])
+        self.assertEqual(self.ctx.stored_data, {"tracker_a": [1, 2], "other": 3})
+        tracker_replies = self.get_replies(self.tracker)
+        self.assertEqual([(reply["original_value"], reply["value"]) for reply in tracker_replies],
+                         [([], [1]), ([1], [1, 2])])
+        client_replies = self.get_replies(self.client)
+        self.assertEqual(client_replies, [{"cmd": "SetReply", "key": "tracker_a", "want_reply": True, "slot": 1,
+                                           "operations": [{"operation": "add", "value": [2]}],
+                                           "original_value": [1], "value": [1, 2]}])
+        await asyncio.sleep(0)
+        self.assertFalse(self.ctx.pending_set_replies, "queued replies were not sent on the next loop iteration")
+
+    async def test_batch_atomic(self) -> None:
+        self.ctx.stored_data["a"] = [1]
+        with self.assertRaises(KeyError):
+            self.ctx.set_stored_data(self.client, [
+                {"key": "a", "operations": [{"operation": "update", "value": [2]}]},
+                {"key": "b", "operations": [{"operation": "unknown", "value": 3}]},
+            ])
+        self.assertEqual(self.ctx.stored_data, {"a": [1]})
+        self.assertFalse(self.ctx.pending_set_replies)
+
+    async def test_invalid_notify(self) -> None:
+        """Verify that SetNotify with keys or prefixes that aren't strings is answered with InvalidPacket."""
+        sent: typing.List[typing.Dict[str, typing.Any]] = []
+
+        async def send_msgs(endpoint: Endpoint, msgs: typing.Iterable[typing.Dict[str, typing.Any]]) -> bool:
+            sent.extend(msgs)
+            return True
+
+        self.ctx.send_msgs = send_msgs
+        self.client.auth = True
+        for args in ({"prefixes": [1]}, {"keys": ["a", None]}, {}):
+            await process_client_cmd(self.ctx, self.client, {"cmd": "SetNotify", **args})
+        self.assertEqual(["InvalidPacket"] * 3, [msg["cmd"] for msg in sent])
+        self.assertEqual(set(), self.ctx.stored_data_notification_clients.get_subscribers("a"))
@@ -0,0 +1,67 @@
+import json
+import unittest
+
+from SNIClient import SNESMemoryWatcher, SNESState, SNIContext, merge_snes_ranges, snes_read_ranges, snes_write
+
+
+class FakeSNI:
+    """Answers GetAddress requests from 256 bytes of memory, like SNI would over its websocket."""
+    open = True
+    closed = False
+
+    def __init__(self, ctx: SNIContext) -> None:
+        self.ctx = ctx
+        self.memory = bytearray(range(256))
+        self.requests = []
+
+    async def send(self, message) -> None:
+        if isinstance(message, bytes):
+            return
+        request = json.loads(message)
+        self.requests.append(request)
+        if request["Opcode"] == "GetAddress":
+            operands = [int(operand, 16) for operand in request["Operands"]]
+            data = b"".join(self.memory[address:address + size]
+                            for address, size in zip(operands[::2], operands[1::2]))
+            # SNI may split the data into multiple messages
+            self.ctx.snes_recv_queue.put_nowait(data[:3])
+            self.ctx.snes_recv_queue.put_nowait(data[3:])
+
+
+class TestSNIReads(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.ctx = SNIContext("", None, None)
+        self.sni = FakeSNI(self.ctx)
+        self.ctx.snes_socket = self.sni
+        self.ctx.snes_state = SNESState.SNES_ATTACHED
+
+    def test_merge_ranges(self) -> None:
+        self.assertEqual([(0, 6), (8, 2), (16, 8)], merge_snes_ranges([(16, 4), (8, 2), (0, 4), (4, 2), (18, 6)]))
+
+    async def test_read_ranges(self) -> None:
+        ranges = [(16, 4), (0, 4), (4, 2), (100, 1), (18, 6)]
+        results = await snes_read_ranges(self.ctx, ranges)
+        self.assertEqual({read_range: bytes(range(read_range[0], sum(read_range))) for read_range in ranges}, results)
+        self.assertEqual(1, len(self.sni.requests))
+        self.assertEqual(["0", "6", "10", "8", "64", "1"], self.sni.requests[0]["Operands"])
+
+    async def test_tick_snapshot(self) -> None:
+        self.ctx.snes_read_cache_active = True
+        await snes_read_ranges(self.ctx, [(0, 16)])
+        self.sni.memory[4] = 0xff
+        self.assertEqual(bytes((4, 5)), (await snes_read_ranges(self.ctx, [(4, 2)]))[4, 2])
+        self.assertEqual(1, len(self.sni.requests), "a range within the snapshot was read again")
+        await snes_write(self.ctx, [(32, b"\x00")])
+        self.assertEqual(bytes((0xff, 5)), (await snes_read_ranges(self.ctx, [(4, 2)]))[4, 2])
+
+    async def test_watcher(self) -> None:
+        watcher = SNESMemoryWatcher()
+        watcher.watch("flags", 0, 4)
+        watcher.watch("counter", 4, 1)
+        watcher.watch("slow", 8, 1, interval=3600)
+        self.assertEqual({"flags": bytes((0, 1, 2, 3)), "counter": b"\x04", "slow": b"\x08"},
+                         await watcher.poll(self.ctx))
+        self.assertEqual(1, len(self.sni.requests))
+        self.sni.memory[4] = 0xff
+        self.sni.memory[8] = 0xff
+        self.assertEqual({"counter": b"\xff"}, await watcher.poll(self.ctx))
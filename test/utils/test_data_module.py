@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import Utils
+from Utils import DataModule
+
+
+class TestDataModule(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.tempdir.name, "data_module_test_tables.py")
+        self.cache_folder = os.path.join(self.tempdir.name, "cache")
+        sys.path.insert(0, self.tempdir.name)
+        patcher = mock.patch.object(Utils, "cache_path", lambda *path: os.path.join(self.cache_folder, *path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.tempdir.name)
+        sys.modules.pop("data_module_test_tables", None)
+        self.tempdir.cleanup()
+
+    def write(self, text: str) -> None:
+        with open(self.source_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def cache_files(self) -> list:
+        folder = os.path.join(self.cache_folder, "data", "data_module_test_tables")
+        return sorted(entry.name for entry in os.scandir(folder))
+
+    def test_cache(self) -> None:
+        """Verify that literals get cached on first use and loaded from the cache without importing the source."""
+        self.write("import typing\n\nregions = [{'name': 'Menu', 'exits': ('A', 'B')}]\ncount: int = 3\n"
+                   "def helper(): pass\n")
+        data = DataModule("data_module_test_tables")
+        self.assertNotIn("data_module_test_tables", sys.modules, "data module got loaded before use")
+        self.assertEqual(3, data.count)
+        self.assertEqual([{"name": "Menu", "exits": ("A", "B")}], data.regions)
+        with self.assertRaises(AttributeError):
+            data.helper
+        with self.assertRaises(AttributeError):
+            data.typing
+        self.assertEqual(1, len(self.cache_files()))
+
+        sys.modules.pop("data_module_test_tables")
+        self.assertEqual(3, DataModule("data_module_test_tables").count)
+        self.assertNotIn("data_module_test_tables", sys.modules, "source got imported despite a cache")
+
+    def test_source_changed(self) -> None:
+        self.write("count = 1\n")
+        self.assertEqual(1, DataModule("data_module_test_tables").count)
+        old_cache = self.cache_files()
+        sys.modules.pop("data_module_test_tables")
+        self.write("count = 20\n")
+        self.assertEqual(20, DataModule("data_module_test_tables").count)
+        self.assertEqual(1, len(self.cache_files()))
+        self.assertNotEqual(old_cache, self.cache_files(), "outdated cache was not replaced")
+
+    def test_missing(self) -> None:
+        with self.assertRaises(ModuleNotFoundError):
+            DataModule("data_module_test_missing").value
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from Utils import DataPackageStore
+
+
+def make_data_package(checksum: str, items: int = 100) -> dict:
+    return {
+        "item_name_to_id": {f"Item {index} ü": 1000 + index * 3 for index in range(items)},
+        "location_name_to_id": {"Zebra": 5, "Apple": -1, "Mango": 2**40},
+        "item_name_groups": {"Everything": ["Item 0 ü"]},
+        "checksum": checksum,
+    }
+
+
+class TestDataPackageStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.store = DataPackageStore(self.tempdir.name, max_age=60)
+
+    def tearDown(self) -> None:
+        for data_package in self.store._opened.values():
+            data_package.close()
+        self.tempdir.cleanup()
+
+    def test_lookup(self) -> None:
+        """Verify that ids and names are looked up in both directions and that the whole data package round trips."""
+        data = make_data_package("abc")
+        self.store.store("Test Game", data)
+        data_package = self.store.open("Test Game", "abc")
+        self.assertIsNotNone(data_package)
+        self.assertEqual("Item 7 ü", data_package.item_names[1021])
+        self.assertNotIn(1022, data_package.item_names)
+        self.assertNotIn("Item 7 ü", data_package.item_names)
+        self.assertEqual(1021, data_package.item_names.get_code("Item 7 ü"))
+        self.assertIsNone(data_package.item_names.get_code("Item 7"))
+        self.assertEqual({5: "Zebra", -1: "Apple", 2**40: "Mango"}, dict(data_package.location_names))
+        self.assertEqual(2**40, data_package.location_names.get_code("Mango"))
+        self.assertEqual(data, data_package.to_dict())
+        self.assertIs(data_package, self.store.open("Test Game", "abc"))
+
+    def test_missing(self) -> None:
+        self.assertIsNone(self.store.open("Test Game", "abc"))
+        self.store.store("Test Game", {"item_name_to_id": {}, "location_name_to_id": {}})
+        self.assertEqual([], os.listdir(self.tempdir.name), "data package without checksum got stored")
+        with self.assertRaises(ValueError):
+            self.store.open("Test Game", "../abc")
+
+    def test_empty(self) -> None:
+        self.store.store("Test Game", {"item_name_to_id": {}, "location_name_to_id": {}, "checksum": "abc"})
+        data_package = self.store.open("Test Game", "abc")
+        self.assertEqual(0, len(data_package.item_names))
+        self.assertIsNone(data_package.item_names.get_code("Item"))
+
+    def test_shared(self) -> None:
+        """Verify that a checksum is stored once, also for multiple games."""
+        self.store.store("Test Game", make_data_package("abc"))
+        self.store.store("Other Game", make_data_package("abc"))
+        self.assertEqual(["abc.apdp", "index.json"], sorted(os.listdir(self.tempdir.name)))
+
+    def test_migrate(self) -> None:
+        """Verify that data packages in the cache format of older versions get moved into the store."""
+        data = make_data_package("abc")
+        os.makedirs(os.path.join(self.tempdir.name, "Test Game"))
+        with open(os.path.join(self.tempdir.name, "Test Game", "abc.json"), "w", encoding="utf-8-sig") as f:
+            json.dump(data, f)
+        self.assertEqual(data, self.store.open("Test Game", "abc").to_dict())
+        self.store.collect_garbage()
+        self.assertEqual(["abc.apdp", "index.json"], sorted(os.listdir(self.tempdir.name)))
+
+    def test_collect_garbage(self) -> None:
+        """Verify that stale checksums get removed, except the last used one of each game."""
+        self.store.store("Test Game", make_data_package("old"))
+        self.store.store("Test Game", make_data_package("older"))
+        self.store.store("Other Game", make_data_package("other"))
+        stale = time.time() - 120
+        for checksum in ("old", "older", "other"):
+            os.utime(os.path.join(self.tempdir.name, f"{checksum}.apdp"), (stale, stale))
+        with open(os.path.join(self.tempdir.name, "index.json"), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        index["games"] = {"Test Game": {"old": time.time() - 30, "older": stale}, "Other Game": {"other": stale}}
+        with open(os.path.join(self.tempdir.name, "index.json"), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+        self.store.store("Test Game", make_data_package("new"))
+        self.assertEqual(["index.json", "new.apdp", "old.apdp", "other.apdp"], sorted(os.listdir(self.tempdir.name)))
+        self.assertIsNone(self.store.open("Test Game", "older"))
+        self.store.open("Test Game", "new")
+        self.store.max_age = 0
+        time.sleep(0.01)
+        self.assertEqual(1, self.store.collect_garbage())
+        self.assertIsNone(self.store.open("Test Game", "old"))
+        self.assertIsNotNone(self.store.open("Other Game", "other"))
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from Utils import FileImageCache
+
+
+class TestFileImageCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache = FileImageCache(max_images=2)
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_shared(self) -> None:
+        """Verify that the same contents are read once and shared, also under another path."""
+        first = self.cache.read(self.write("base.rom", b"base"))
+        self.assertIs(first, self.cache.read(os.path.join(self.tempdir.name, "base.rom")))
+        self.assertIs(first, self.cache.read(self.write("copy.rom", b"base")))
+
+    def test_changed(self) -> None:
+        path = self.write("base.rom", b"base")
+        self.assertEqual(b"base", self.cache.read(path))
+        self.write("base.rom", b"changed")
+        self.assertEqual(b"changed", self.cache.read(path))
+
+    def test_limit(self) -> None:
+        paths = [self.write(f"{index}.rom", bytes([index]) * 16) for index in range(3)]
+        first = self.cache.read(paths[0])
+        self.cache.read(paths[1])
+        self.cache.read(paths[2])
+        self.assertIsNot(first, self.cache.read(paths[0]), "least recently used image was not dropped")
+        self.assertEqual(first, self.cache.read(paths[0]))
+
+    def test_scoped(self) -> None:
+        """Verify that images are dropped once the generation using the cache is done."""
+        path = self.write("base.rom", b"base")
+        with self.cache:
+            first = self.cache.read(path)
+            self.assertIs(first, self.cache.read(path))
+        self.assertIsNot(first, self.cache.read(path))
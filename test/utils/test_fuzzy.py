@@ -0,0 +1,38 @@
+# Tests for fuzzy name matching in Utils.py
+
+import random
+import string
+import unittest
+
+from Utils import FuzzyNameIndex, get_fuzzy_results, get_intended_text
+
+
+class TestFuzzyNameIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        rand = random.Random(0)
+        words = ["Grass", "Chest", "Key", "Heart", "Piece", "Boss", "Room", "Upper", "Lower", "İsland"]
+        self.names = list(dict.fromkeys(
+            " ".join(rand.choices(words, k=rand.randint(1, 4))) + f" {rand.randint(1, 50)}" for _ in range(1000)
+        ))
+        self.queries = [rand.choice(self.names) for _ in range(20)]
+        self.queries += [name.lower() for name in self.queries[:5]]
+        self.queries += ["".join(rand.choices(string.ascii_letters + " ", k=rand.randint(1, 30))) for _ in range(20)]
+        self.queries += ["", "Grass", "grass 1", "Heart Piece Boss Room 12"]
+
+    def test_same_results(self) -> None:
+        index = FuzzyNameIndex(self.names)
+        for query in self.queries:
+            for limit in (1, 2, 5, None):
+                with self.subTest(query=query, limit=limit):
+                    self.assertEqual(index.get_fuzzy_results(query, limit),
+                                     get_fuzzy_results(query, self.names, limit))
+
+    def test_intended_text(self) -> None:
+        index = FuzzyNameIndex(self.names)
+        for query in self.queries:
+            with self.subTest(query=query):
+                self.assertEqual(get_intended_text(query, index), get_intended_text(query, self.names))
+
+    def test_single_name(self) -> None:
+        index = FuzzyNameIndex(["Only"])
+        self.assertEqual(get_intended_text("only", index), get_intended_text("only", ["Only"]))
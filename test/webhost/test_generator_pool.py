@@ -0,0 +1,33 @@
+import os
+import unittest
+
+from WebHostLib.generator_pool import RecyclingPool, get_memory_usage
+
+_allocation: bytearray = bytearray()
+
+
+def allocate(size: int) -> int:
+    global _allocation
+    _allocation = bytearray(size)
+    _allocation[::4096] = b"\1" * len(range(0, size, 4096))  # touch every page, so it is resident
+    return os.getpid()
+
+
+@unittest.skipIf(get_memory_usage() is None, "memory usage not available on this platform")
+class TestRecyclingPool(unittest.TestCase):
+    def test_recycle_by_memory(self) -> None:
+        # workers share the parent's pages copy-on-write, so their private memory is measured in a worker
+        with RecyclingPool(1) as pool:
+            worker_memory = pool.apply(get_memory_usage)
+        with RecyclingPool(1, memory_limit=worker_memory + 64 * 2**20) as pool:
+            small = {pool.apply(allocate, (1,)) for _ in range(3)}
+            self.assertEqual(len(small), 1, "worker was recycled without exceeding its memory limit")
+            large = [pool.apply(allocate, (128 * 2**20,)) for _ in range(2)]
+            self.assertEqual(large[0], small.pop())
+            self.assertNotEqual(large[0], large[1], "worker was not recycled after exceeding its memory limit")
+
+    def test_recycle_by_task_count(self) -> None:
+        with RecyclingPool(1, maxtasksperchild=2) as pool:
+            pids = [pool.apply(allocate, (1,)) for _ in range(3)]
+            self.assertEqual(pids[0], pids[1])
+            self.assertNotEqual(pids[1], pids[2])
@@ -117,6 +117,31 @@ class TestHostFakeRoom(TestBase):
             self.assertEqual(response.status_code, 206)
             self.assertEqual(response.get_data(True), text)
 
+    def test_display_log_content_range(self) -> None:
+        """Verify that a range response states the range and the full size of the log."""
+        with open(self.log_filename, "w", encoding="utf-8-sig") as f:
+            f.write("x" * 200)
+
+        with self.app.app_context(), self.app.test_request_context():
+            response = self.client.get(url_for("display_log", room=self.room_id), headers={
+                "Range": "bytes=-50"
+            })
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response.headers["Content-Range"], "bytes 150-199/200")
+            self.assertEqual(response.get_data(True), "x" * 50)
+
+    def test_display_log_range_unsatisfiable(self) -> None:
+        """Verify that asking for a range past the end of the log, as the JS does without new log lines, gives 416."""
+        with open(self.log_filename, "w", encoding="utf-8") as f:
+            f.write("x" * 100)
+
+        with self.app.app_context(), self.app.test_request_context():
+            response = self.client.get(url_for("display_log", room=self.room_id), headers={
+                "Range": "bytes=100-"
+            })
+            self.assertEqual(response.status_code, 416)
+            self.assertEqual(response.headers["Content-Range"], "bytes */100")
+
     def test_host_room_missing(self) -> None:
         """Verify that missing room gives a 404 response."""
         missing_room_id = uuid5(uuid4(), "")  # rooms are always uuid4, so this can't exist
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from WebHostLib.room_log import RoomLog, RoomLogStore
+
+
+class TestRoomLog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, "room.txt")
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def write(self, text: str, mode: str = "a") -> None:
+        with open(self.path, mode, encoding="utf-8-sig") as f:
+            f.write(text)
+
+    def read(self, log: RoomLog, start: int, stop: int) -> str:
+        return b"".join(log.iter_range(start, stop)).decode("utf-8")
+
+    def test_missing(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            RoomLog(self.path, 100).refresh()
+
+    def test_appends(self) -> None:
+        """Verify that only new data gets read and offsets skip the BOM."""
+        log = RoomLog(self.path, 100)
+        self.write("first\n")
+        self.assertEqual(log.refresh(), 6)
+        self.write("second\n")
+        self.assertEqual(log.refresh(), 13)
+        self.assertEqual(self.read(log, 6, 13), "second\n")
+        self.assertEqual(log.get_tail(100), (b"first\nsecond\n", 0))
+
+    def test_tail_capped(self) -> None:
+        """Verify that the tail keeps whole lines and data before it is read from the file."""
+        log = RoomLog(self.path, 25)
+        self.write("".join(f"line {i}\n" for i in range(10)))
+        self.assertEqual(log.refresh(), 70)
+        tail, start = log.get_tail(25)
+        self.assertLessEqual(len(tail), 25)
+        self.assertTrue(tail.startswith(b"line "))
+        self.assertEqual(start + len(tail), 70)
+        self.assertEqual(self.read(log, 0, 14), "line 0\nline 1\n")
+        self.assertEqual(log.get_tail(10), (b"line 9\n", 63))
+
+    def test_truncated(self) -> None:
+        log = RoomLog(self.path, 100)
+        self.write("old log\n")
+        log.refresh()
+        self.write("new\n", "w")
+        self.assertEqual(log.refresh(), 4)
+        self.assertEqual(log.get_tail(100), (b"new\n", 0))
+
+    def test_store(self) -> None:
+        store = RoomLogStore(self.tempdir.name, 100, 2)
+        first = store.get("a")
+        store.get("b")
+        self.assertIs(store.get("a"), first)
+        store.get("c")  # evicts b, the least recently used
+        self.assertIs(store.get("a"), first)
+        self.assertEqual(first.path, os.path.join(self.tempdir.name, "a.txt"))
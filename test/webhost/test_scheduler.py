@@ -0,0 +1,50 @@
+import unittest
+
+from WebHostLib.scheduler import GenerationScheduler, LANE_FAST, LANE_LARGE, estimate_cost
+
+
+class TestGenerationScheduler(unittest.TestCase):
+    def test_estimate_cost(self) -> None:
+        options = {f"Player{i}.yaml": {"game": "A Link to the Past" if i % 2 else "Hollow Knight"} for i in range(10)}
+        self.assertEqual(estimate_cost(options), 10 + 2 * 2)
+
+    def test_small_jobs_use_fast_lane(self) -> None:
+        scheduler = GenerationScheduler(workers=3, large_workers=1, large_cost=10)
+        scheduler.enqueue("big", 50)
+        scheduler.enqueue("small", 3)
+        assignments = dict(scheduler.schedule(["big", "small"]))
+        self.assertEqual(assignments, {"big": LANE_LARGE, "small": LANE_FAST})
+
+    def test_large_jobs_capped(self) -> None:
+        scheduler = GenerationScheduler(workers=4, large_workers=1, large_cost=10)
+        for job_id in ("big1", "big2"):
+            scheduler.enqueue(job_id, 50)
+        self.assertEqual(scheduler.schedule(["big1", "big2"]), [("big1", LANE_LARGE)])
+        self.assertEqual(scheduler.schedule(["big2"]), [])
+        scheduler.finished("big1")
+        self.assertTrue(scheduler.wakeup.is_set())
+        self.assertEqual(scheduler.schedule(["big2"]), [("big2", LANE_LARGE)])
+
+    def test_small_jobs_overflow_while_no_large_waits(self) -> None:
+        scheduler = GenerationScheduler(workers=2, large_workers=1, large_cost=10)
+        for job_id in ("a", "b", "c"):
+            scheduler.enqueue(job_id, 3)
+        self.assertEqual(len(scheduler.schedule(["a", "b", "c"])), 2)
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics.queued, 1)
+        self.assertEqual(metrics.running, {LANE_FAST: 1, LANE_LARGE: 1})
+        self.assertEqual(metrics.started, 2)
+
+    def test_cheapest_small_job_first(self) -> None:
+        scheduler = GenerationScheduler(workers=2, large_workers=1, large_cost=10)
+        scheduler.enqueue("expensive", 9)
+        scheduler.enqueue("cheap", 2)
+        scheduler.enqueue("big", 20)
+        self.assertEqual(dict(scheduler.schedule(["expensive", "cheap", "big"])),
+                         {"cheap": LANE_FAST, "big": LANE_LARGE})
+
+    def test_forget_dequeued(self) -> None:
+        scheduler = GenerationScheduler(workers=2, large_workers=1, large_cost=10)
+        scheduler.enqueue("gone", 3)
+        self.assertEqual(scheduler.schedule([]), [])
+        self.assertNotIn("gone", scheduler)
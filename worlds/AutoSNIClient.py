@@ -59,6 +59,9 @@ class AutoSNIClientRegister(abc.ABCMeta):
 
     @staticmethod
     async def get_handler(ctx: SNIContext) -> Optional[SNIClient]:
+        # handlers get registered when their world is imported
+        from worlds import load_lazy_worlds
+        load_lazy_worlds()
         for _game, handler in AutoSNIClientRegister.game_handlers.items():
             try:
                 if await handler.validate_rom(ctx):
@@ -22,8 +22,72 @@ if TYPE_CHECKING:
 perf_logger = logging.getLogger("performance")
 
 
+class WorldTypes(Dict[str, Type["World"]]):
+    """
+    Registered World types by game. Games of worlds that are known but not imported yet can be added to `pending`
+    with a loader, which gets called on first access of that game. Iterating imports all pending worlds.
+    """
+    pending: Dict[str, Callable[[], Any]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pending = {}
+
+    def _load(self, game: str) -> None:
+        loader = self.pending[game]
+        # a loader may register multiple games, those are no longer pending either
+        for pending_game in [pending_game for pending_game, other in self.pending.items() if other == loader]:
+            del self.pending[pending_game]
+        loader()
+
+    def load_pending(self) -> None:
+        while self.pending:
+            self._load(next(iter(self.pending)))
+
+    def __missing__(self, game: str) -> Type[World]:
+        if game in self.pending:
+            self._load(game)
+            if dict.__contains__(self, game):
+                return dict.__getitem__(self, game)
+        raise KeyError(game)
+
+    def __contains__(self, game: object) -> bool:
+        return dict.__contains__(self, game) or game in self.pending
+
+    def __setitem__(self, game: str, world: Type[World]) -> None:
+        # the world may get imported directly instead of through its loader
+        self.pending.pop(game, None)
+        super().__setitem__(game, world)
+
+    def get(self, game: str, default: Any = None) -> Any:
+        try:
+            return self[game]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        self.load_pending()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.load_pending()
+        return super().__len__()
+
+    def keys(self):
+        self.load_pending()
+        return super().keys()
+
+    def values(self):
+        self.load_pending()
+        return super().values()
+
+    def items(self):
+        self.load_pending()
+        return super().items()
+
+
 class AutoWorldRegister(type):
-    world_types: Dict[str, Type[World]] = {}
+    world_types: Dict[str, Type[World]] = WorldTypes()
     __file__: str
     zip_path: Optional[str]
     settings_key: str
@@ -85,7 +149,7 @@ class AutoWorldRegister(type):
         new_class = super().__new__(mcs, name, bases, dct)
         new_class.__file__ = sys.modules[new_class.__module__].__file__
         if "game" in dct:
-            if dct["game"] in AutoWorldRegister.world_types:
+            if dict.__contains__(AutoWorldRegister.world_types, dct["game"]):
                 raise RuntimeError(f"""Game {dct["game"]} already registered in 
                 {AutoWorldRegister.world_types[dct["game"]].__file__} when attempting to register from
                 {new_class.__file__}.""")
@@ -5,17 +5,14 @@ import json
 import zipfile
 from enum import IntEnum
 import os
-import threading
+import struct
 from io import BytesIO
 
 from typing import ClassVar, Dict, List, Literal, Tuple, Any, Optional, Union, BinaryIO, overload, Sequence
 
 import bsdiff4
 
-semaphore = threading.Semaphore(os.cpu_count() or 4)
-
-del threading
-del os
+from .OutputScheduler import output_scheduler
 
 
 class AutoPatchRegister(abc.ABCMeta):
@@ -34,6 +31,9 @@ class AutoPatchRegister(abc.ABCMeta):
 
     @staticmethod
     def get_handler(file: str) -> Optional[AutoPatchRegister]:
+        # patch types get registered when their world is imported
+        from . import load_lazy_worlds
+        load_lazy_worlds()
         for file_ending, handler in AutoPatchRegister.file_endings.items():
             if file.endswith(file_ending):
                 return handler
@@ -55,10 +55,14 @@ class AutoPatchExtensionRegister(abc.ABCMeta):
     def get_handler(game: Optional[str]) -> Union[AutoPatchExtensionRegister, List[AutoPatchExtensionRegister]]:
         if not game:
             return APPatchExtension
+        # extensions get registered when the world of their game is imported
+        from .AutoWorld import AutoWorldRegister
+        AutoWorldRegister.world_types.get(game)
         handler = AutoPatchExtensionRegister.extension_types.get(game, APPatchExtension)
         if handler.required_extensions:
             handlers = [handler]
             for required in handler.required_extensions:
+                AutoWorldRegister.world_types.get(required)
                 ext = AutoPatchExtensionRegister.extension_types.get(required)
                 if not ext:
                     raise NotImplementedError(f"No handler for {required}.")
@@ -95,6 +99,11 @@ class APContainer:
     version: ClassVar[int] = container_version
     compression_level: ClassVar[int] = 9
     compression_method: ClassVar[int] = zipfile.ZIP_DEFLATED
+    write_in_process: ClassVar[bool] = False
+    """
+    Allow writing to a path in an output worker process, if the generator has them. The container gets pickled for
+    that, and changes write_contents makes to it are lost.
+    """
 
     path: Optional[str]
 
@@ -105,13 +114,20 @@ class APContainer:
         zip_file = file if file else self.path
         if not zip_file:
             raise FileNotFoundError(f"Cannot write {self.__class__.__name__} due to no path provided.")
-        with semaphore:  # TODO: remove semaphore once generate_output has a thread limit
+        if self.write_in_process and isinstance(zip_file, str):
+            output_scheduler.run(_write_container, self, zip_file, memory=self.get_write_memory())
+            return
+        with output_scheduler.reserve(self.get_write_memory()):
             with zipfile.ZipFile(
                     zip_file, "w", self.compression_method, True, self.compression_level) as zf:
                 if file:
                     self.path = zf.filename
                 self.write_contents(zf)
 
+    def get_write_memory(self) -> int:
+        """Bytes of memory writing this container can take, which get reserved from the output scheduler."""
+        return 0
+
     def write_contents(self, opened_zipfile: zipfile.ZipFile) -> None:
         manifest = self.get_manifest()
         try:
@@ -155,6 +171,12 @@ class APContainer:
         }
 
 
+def _write_container(container: APContainer, path: str) -> None:
+    """Writes a container in an output worker process."""
+    with zipfile.ZipFile(path, "w", container.compression_method, True, container.compression_level) as zf:
+        container.write_contents(zf)
+
+
 class APPlayerContainer(APContainer):
     """A zipfile containing at least archipelago.json meant for a player"""
     game: ClassVar[Optional[str]] = None
@@ -302,6 +324,7 @@ class APProcedurePatch(APAutoPatchInterface):
 class APDeltaPatch(APProcedurePatch):
     """An APProcedurePatch that additionally has delta.bsdiff4
     containing a delta patch to get the desired file, often a rom."""
+    write_in_process = True
 
     procedure = [
         ("apply_bsdiff4", ["delta.bsdiff4"])
@@ -311,6 +334,10 @@ class APDeltaPatch(APProcedurePatch):
         super(APDeltaPatch, self).__init__(*args, **kwargs)
         self.patched_path = patched_path
 
+    def get_write_memory(self) -> int:
+        # bsdiff's suffix sorting takes two 8 byte integers per byte of the source, on top of the source and target
+        return 18 * os.path.getsize(self.patched_path)
+
     def write_contents(self, opened_zipfile: zipfile.ZipFile) -> None:
         self.write_file("delta.bsdiff4",
                         bsdiff4.diff(self.get_source_data_with_cache(), open(self.patched_path, "rb").read()))
@@ -326,6 +353,17 @@ class APTokenTypes(IntEnum):
     XOR_8 = 5
 
 
+_token_count = struct.Struct("<I")
+_token_header = struct.Struct("<BII")
+"""Type, offset and payload size of a token."""
+_token_range = struct.Struct("<II")
+"""Payload of COPY and RLE tokens: length, then source offset or byte value."""
+_bitwise_tokens = frozenset((APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8))
+_range_tokens = frozenset((APTokenTypes.COPY, APTokenTypes.RLE))
+_patch_tokens = _bitwise_tokens | _range_tokens
+"""Tokens that change the existing data, anything else is a WRITE."""
+
+
 class APTokenMixin:
     """
     A class that defines functions for generating a token binary, for use in patches.
@@ -340,29 +378,48 @@ class APTokenMixin:
     def get_token_binary(self) -> bytes:
         """
         Returns the token binary created from stored tokens.
+        Consecutive WRITE tokens to adjacent offsets are stored as one token.
         :return: A bytes object representing the token data.
         """
         data = bytearray()
-        data.extend(len(self._tokens).to_bytes(4, "little"))
+        token_count = 0
+        pack_header = _token_header.pack
+        write_offset = write_end = -1
+        writes: List[bytes] = []
+
+        def flush_writes() -> None:
+            nonlocal token_count
+            if writes:
+                payload = writes[0] if len(writes) == 1 else b"".join(writes)
+                data.extend(pack_header(APTokenTypes.WRITE, write_offset, len(payload)))
+                data.extend(payload)
+                token_count += 1
+                writes.clear()
+
         for token_type, offset, args in self._tokens:
-            data.append(token_type)
-            data.extend(offset.to_bytes(4, "little"))
-            if token_type in [APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8]:
+            if token_type == APTokenTypes.WRITE:
+                assert isinstance(args, bytes), f"Arguments to WRITE must be of type bytes, not {type(args)}"
+                if offset != write_end:
+                    flush_writes()
+                    write_offset = offset
+                writes.append(args)
+                write_end = offset + len(args)
+                continue
+            flush_writes()
+            write_end = -1
+            if token_type in _bitwise_tokens:
                 assert isinstance(args, int), f"Arguments to AND/OR/XOR must be of type int, not {type(args)}"
-                data.extend(int.to_bytes(1, 4, "little"))
+                data.extend(pack_header(token_type, offset, 1))
                 data.append(args)
-            elif token_type in [APTokenTypes.COPY, APTokenTypes.RLE]:
+            elif token_type in _range_tokens:
                 assert isinstance(args, tuple), f"Arguments to COPY/RLE must be of type tuple, not {type(args)}"
-                data.extend(int.to_bytes(8, 4, "little"))
-                data.extend(args[0].to_bytes(4, "little"))
-                data.extend(args[1].to_bytes(4, "little"))
-            elif token_type == APTokenTypes.WRITE:
-                assert isinstance(args, bytes), f"Arguments to WRITE must be of type bytes, not {type(args)}"
-                data.extend(len(args).to_bytes(4, "little"))
-                data.extend(args)
+                data.extend(pack_header(token_type, offset, 8))
+                data.extend(_token_range.pack(*args))
             else:
                 raise ValueError(f"Unknown token type {token_type}")
-        return bytes(data)
+            token_count += 1
+        flush_writes()
+        return _token_count.pack(token_count) + data
 
     @overload
     def write_token(self,
@@ -418,33 +475,48 @@ class APPatchExtension(metaclass=AutoPatchExtensionRegister):
     @staticmethod
     def apply_tokens(caller: APProcedurePatch, rom: bytes, token_file: str) -> bytes:
         """Applies the given token file from the patch onto the current file."""
-        token_data = caller.get_file(token_file)
+        token_data = memoryview(caller.get_file(token_file))
         rom_data = bytearray(rom)
-        token_count = int.from_bytes(token_data[0:4], "little")
-        bpr = 4
+        unpack_header = _token_header.unpack_from
+        token_count, = _token_count.unpack_from(token_data)
+        bpr = _token_count.size
+        # adjacent writes are joined and applied as one, everything else has to apply in order
+        write_offset = write_end = -1
+        writes: List[memoryview] = []
         for _ in range(token_count):
-            token_type = token_data[bpr:bpr + 1][0]
-            offset = int.from_bytes(token_data[bpr + 1:bpr + 5], "little")
-            size = int.from_bytes(token_data[bpr + 5:bpr + 9], "little")
-            data = token_data[bpr + 9:bpr + 9 + size]
-            if token_type in [APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8]:
-                arg = data[0]
+            token_type, offset, size = unpack_header(token_data, bpr)
+            bpr += _token_header.size
+            if token_type not in _patch_tokens:
+                if offset != write_end:
+                    if writes:
+                        rom_data[write_offset:write_end] = writes[0] if len(writes) == 1 else b"".join(writes)
+                        writes.clear()
+                    write_offset = offset
+                writes.append(token_data[bpr:bpr + size])
+                write_end = offset + size
+                bpr += size
+                continue
+            if writes:
+                rom_data[write_offset:write_end] = writes[0] if len(writes) == 1 else b"".join(writes)
+                writes.clear()
+                write_end = -1
+            if token_type in _bitwise_tokens:
+                arg = token_data[bpr]
                 if token_type == APTokenTypes.AND_8:
-                    rom_data[offset] = rom_data[offset] & arg
+                    rom_data[offset] &= arg
                 elif token_type == APTokenTypes.OR_8:
-                    rom_data[offset] = rom_data[offset] | arg
+                    rom_data[offset] |= arg
                 else:
-                    rom_data[offset] = rom_data[offset] ^ arg
-            elif token_type in [APTokenTypes.COPY, APTokenTypes.RLE]:
-                length = int.from_bytes(data[:4], "little")
-                value = int.from_bytes(data[4:], "little")
+                    rom_data[offset] ^= arg
+            else:
+                length, value = _token_range.unpack_from(token_data, bpr)
                 if token_type == APTokenTypes.COPY:
-                    rom_data[offset: offset + length] = rom_data[value: value + length]
+                    rom_data[offset:offset + length] = rom_data[value:value + length]
                 else:
-                    rom_data[offset: offset + length] = bytes([value] * length)
-            else:
-                rom_data[offset:offset + len(data)] = data
-            bpr += 9 + size
+                    rom_data[offset:offset + length] = bytes((value,)) * length
+            bpr += size
+        if writes:
+            rom_data[write_offset:write_end] = writes[0] if len(writes) == 1 else b"".join(writes)
         return bytes(rom_data)
 
     @staticmethod
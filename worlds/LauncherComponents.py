@@ -3,7 +3,7 @@ import logging
 import pathlib
 import weakref
 from enum import Enum, auto
-from typing import Optional, Callable, List, Iterable, Tuple
+from typing import Any, Dict, Optional, Callable, List, Iterable, Tuple
 
 from Utils import local_path, open_filename
 
@@ -83,10 +83,71 @@ class Component:
     def handles_file(self, path: str):
         return self.file_identifier(path) if self.file_identifier else False
 
+    def to_manifest(self) -> Dict[str, Any]:
+        """What the Launcher needs to show and run this component without importing the world it comes from."""
+        file_identifier = self.file_identifier
+        return {
+            "display_name": self.display_name,
+            "description": self.description,
+            "type": self.type.name,
+            "script_name": self.script_name,
+            "frozen_name": self.frozen_name,
+            "icon": self.icon,
+            "cli": self.cli,
+            "func": self.func is not None,
+            # suffixes, or if there is an identifier that needs the world to be imported
+            "file_identifier": list(file_identifier.suffixes) if isinstance(file_identifier, SuffixIdentifier)
+            else file_identifier is not None,
+            "game_name": self.game_name,
+            "supports_uri": self.supports_uri,
+        }
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.display_name})"
 
 
+class LazyComponent(Component):
+    """
+    Stand-in for a component of a world that is not imported yet, built from the world manifest.
+    Running it, or identifying files with an identifier other than suffixes, imports the world and uses the component
+    the world registers instead.
+    """
+    loader: Callable[[], Any]
+    """Imports the world of the component"""
+
+    def __init__(self, data: Dict[str, Any], loader: Callable[[], Any]) -> None:
+        file_identifier = data["file_identifier"]
+        super().__init__(data["display_name"], data["script_name"], data["frozen_name"], data["cli"], data["icon"],
+                         Type[data["type"]], self._run if data["func"] else None,
+                         SuffixIdentifier(*file_identifier) if isinstance(file_identifier, list) else
+                         self._handles_file if file_identifier else None,
+                         data["game_name"], data["supports_uri"], data["description"])
+        self.loader = loader
+
+    def resolve(self) -> Component:
+        """Imports the world and replaces the stand-ins of all components it registered."""
+        self.loader()
+        loaded = replace_lazy_components()
+        if self.display_name not in loaded:
+            raise Exception(f"Component {self.display_name} is no longer registered by its world.")
+        return loaded[self.display_name]
+
+    def _run(self, *args: Any) -> None:
+        self.resolve().func(*args)
+
+    def _handles_file(self, path: str) -> bool:
+        return self.resolve().handles_file(path)
+
+
+def replace_lazy_components() -> Dict[str, Component]:
+    """Removes the stand-ins of components that their world registered by now, returns the registered components."""
+    loaded = {component.display_name: component for component in components
+              if not isinstance(component, LazyComponent)}
+    components[:] = [component for component in components
+                     if not isinstance(component, LazyComponent) or component.display_name not in loaded]
+    return loaded
+
+
 processes = weakref.WeakSet()
 
 
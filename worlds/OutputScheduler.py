@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+__all__ = ["OutputScheduler", "output_scheduler"]
+
+logger = logging.getLogger("OutputScheduler")
+T = TypeVar("T")
+
+
+class OutputScheduler:
+    """
+    Shares CPU slots and a memory budget between the output of all worlds, which runs in one thread per world.
+    Worlds reserve resources for CPU or memory heavy work, and can hand off work that only needs picklable data to
+    worker processes, so it doesn't compete for the GIL.
+    Reservations are per thread and do not nest: work reserved inside a reservation runs in the outer one.
+    """
+    cpu_slots: int
+    memory_limit: int
+    """Bytes all reservations may add up to, 0 for no limit. A reservation over the limit runs on its own."""
+    processes: int
+    """Worker processes for run, 0 to run in the calling thread instead."""
+    timings: Dict[str, float]
+    """Seconds each timed output took, including waiting for resources."""
+    waits: Dict[str, float]
+    """Seconds each timed output waited for resources."""
+
+    _condition: threading.Condition
+    _used_slots: int
+    _used_memory: int
+    _local: threading.local
+    _pool: Optional[concurrent.futures.ProcessPoolExecutor]
+
+    def __init__(self, cpu_slots: int = 0, memory_limit: int = 0, processes: int = 0) -> None:
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._pool = None
+        self.configure(cpu_slots, memory_limit, processes)
+
+    def configure(self, cpu_slots: int = 0, memory_limit: int = 0, processes: int = 0) -> None:
+        """
+        :param cpu_slots: reservations that can be held at the same time, 0 for one per CPU core
+        :param memory_limit: bytes reservations may add up to, 0 for no limit
+        :param processes: worker processes for run, 0 to run in the calling thread, -1 for one per CPU core
+        """
+        self.shutdown()
+        self.cpu_slots = cpu_slots if cpu_slots > 0 else os.cpu_count() or 4
+        self.memory_limit = max(0, memory_limit)
+        self.processes = processes if processes >= 0 else os.cpu_count() or 4
+        self.timings = {}
+        self.waits = {}
+        self._used_slots = 0
+        self._used_memory = 0
+
+    def _fits(self, memory: int) -> bool:
+        if self._used_slots >= self.cpu_slots:
+            return False
+        return not self.memory_limit or not self._used_memory or self._used_memory + memory <= self.memory_limit
+
+    @contextlib.contextmanager
+    def reserve(self, memory: int = 0) -> Iterator[None]:
+        """Blocks until a CPU slot and memory bytes are available, and holds them for the duration of the context."""
+        if getattr(self._local, "reserved", False):
+            yield
+            return
+        start = time.perf_counter()
+        with self._condition:
+            self._condition.wait_for(lambda: self._fits(memory))
+            self._used_slots += 1
+            self._used_memory += memory
+        label = getattr(self._local, "label", None)
+        if label is not None:
+            self.waits[label] = self.waits.get(label, 0) + time.perf_counter() - start
+        self._local.reserved = True
+        try:
+            yield
+        finally:
+            self._local.reserved = False
+            with self._condition:
+                self._used_slots -= 1
+                self._used_memory -= memory
+                self._condition.notify_all()
+
+    def _get_pool(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        if self._pool is None and self.processes:
+            if multiprocessing.current_process().daemon:
+                # daemonic processes, like the WebHost's generators, can't have child processes
+                logger.info("Running output in threads, as daemonic processes can't start output processes.")
+                self.processes = 0
+                return None
+            try:
+                # spawn behaves the same on all platforms and does not fork the output threads' state
+                self._pool = concurrent.futures.ProcessPoolExecutor(self.processes,
+                                                                    multiprocessing.get_context("spawn"))
+            except Exception as e:
+                logger.warning(f"Could not start output processes, running output in threads instead: {e}")
+                self.processes = 0
+        return self._pool
+
+    def run(self, function: Callable[..., T], *args: Any, memory: int = 0) -> T:
+        """
+        Runs function(*args) within a reservation, in a worker process if processes are configured.
+        function has to be importable by name, and it and args have to be picklable. Changes it makes to args
+        are not seen by the caller when it runs in a worker process.
+        """
+        with self.reserve(memory):
+            pool = self._get_pool()
+            if pool is None:
+                return function(*args)
+            return pool.submit(function, *args).result()
+
+    def timed(self, label: str, function: Callable[..., T], *args: Any) -> T:
+        """Calls function(*args) and records how long it took, and waited for resources, under label."""
+        self._local.label = label
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.timings[label] = time.perf_counter() - start
+            self._local.label = None
+
+    def get_slowest(self, count: int) -> List[Tuple[str, float, float]]:
+        """Label, seconds taken and seconds waited of the slowest timed outputs."""
+        slowest = sorted(self.timings.items(), key=lambda timing: timing[1], reverse=True)[:count]
+        return [(label, seconds, self.waits.get(label, 0)) for label, seconds in slowest]
+
+    def shutdown(self) -> None:
+        """Stops the worker processes, if any got started. They are restarted as needed."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> OutputScheduler:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+
+output_scheduler = OutputScheduler()
+"""Scheduler for the output stage. Main configures it from the generator settings before output starts."""
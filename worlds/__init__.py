@@ -1,15 +1,21 @@
+import functools
+import hashlib
 import importlib
 import importlib.util
+import json
 import logging
 import os
+import pkgutil
 import sys
 import warnings
+import zipfile
 import zipimport
 import time
 import dataclasses
-from typing import Dict, List, TypedDict
+from typing import Any, Dict, List, Sequence, Set, TypedDict
 
-from Utils import local_path, user_path
+from Utils import __version__, cache_path, get_file_safe_name, load_data_package_for_checksum, local_path, \
+    store_data_package_for_checksum, user_path
 
 local_folder = os.path.dirname(__file__)
 user_folder = user_path("worlds") if user_path() != local_path() else user_path("custom_worlds")
@@ -27,8 +33,18 @@ __all__ = {
     "GamesPackage",
     "DataPackage",
     "failed_world_loads",
+    "lazy_worlds",
+    "load_lazy_world",
+    "load_lazy_worlds",
+    "load_unlisted_worlds",
 }
 
+# Only import worlds when their game gets accessed through AutoWorldRegister.world_types, one of their launcher
+# components gets run or their settings get accessed, using the world manifest to know which games, components and
+# settings exist. Registries that worlds add to while being imported, like the SNI and BizHawk client handlers and the
+# patch handlers, call load_lazy_worlds before they get used. Set ARCHIPELAGO_LAZY_WORLDS=0 to import all worlds.
+lazy_worlds: bool = os.environ.get("ARCHIPELAGO_LAZY_WORLDS", "1") not in ("", "0")
+
 
 failed_world_loads: List[str] = []
 
@@ -45,6 +61,85 @@ class DataPackage(TypedDict):
     games: Dict[str, GamesPackage]
 
 
+class APWorldIndex:
+    """
+    Size, modification time, content hash, archipelago.json metadata and declared game of the .apworld files in the world
+    folders. Stored in the user's cache directory. Entries are reused while the size and modification time of their file
+    stay the same, so only new or changed .apworld files get hashed and opened.
+    """
+    index_version: int = 2
+    path: str
+    entries: Dict[str, Dict[str, Any]]
+    changed: bool = False
+    _used: Set[str]
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.entries = {}
+        self._used = set()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == self.index_version:
+                self.entries = index["apworlds"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Could not load APWorld index: {e}")
+
+    def get(self, path: str) -> Dict[str, Any]:
+        """The index entry of an .apworld file, rebuilt if the file changed. Raises OSError if it can't be read."""
+        stat = os.stat(path)
+        self._used.add(path)
+        entry = self.entries.get(path)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry
+        content_hash = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                content_hash.update(chunk)
+        metadata: Dict[str, Any] = {}
+        if entry and entry["sha256"] == content_hash.hexdigest():
+            metadata = entry["metadata"]
+        else:
+            try:
+                with zipfile.ZipFile(path) as zf:
+                    # archipelago.json sits next to or in the world's folder, depending on the tool that built it
+                    name = next((name for name in zf.namelist() if name.count("/") <= 1
+                                 and name.rsplit("/", 1)[-1] == "archipelago.json"), None)
+                    if name:
+                        metadata = json.loads(zf.read(name))
+            except Exception as e:
+                logging.debug(f"Could not read metadata of {path}: {e}")
+        game = metadata.get("game")
+        entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": content_hash.hexdigest(),
+                 "metadata": metadata, "game": game if isinstance(game, str) else None}
+        self.entries[path] = entry
+        self.changed = True
+        return entry
+
+    def save(self) -> None:
+        """Stores the index, without entries of .apworld files that were not looked up since it got loaded."""
+        if set(self.entries) != self._used:
+            self.entries = {path: entry for path, entry in self.entries.items() if path in self._used}
+            self.changed = True
+        if not self.changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # write to a temporary file first, other processes may be reading the index
+            temp_file = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": self.index_version, "apworlds": self.entries}, f)
+            os.replace(temp_file, self.path)
+        except Exception as e:
+            logging.debug(f"Could not store APWorld index: {e}")
+        self.changed = False
+
+
+apworld_index = APWorldIndex(cache_path("worlds", "apworlds.json"))
+
+
 @dataclasses.dataclass(order=True)
 class WorldSource:
     path: str  # typically relative path from this module
@@ -61,6 +156,35 @@ class WorldSource:
             return os.path.join(local_folder, self.path)
         return self.path
 
+    @property
+    def module_name(self) -> str:
+        return os.path.basename(self.path).rsplit(".", 1)[0]
+
+    @property
+    def declared_game(self) -> str | None:
+        """Game an .apworld declares in its archipelago.json, None if it declares none or for world folders."""
+        if self.is_zip:
+            try:
+                return apworld_index.get(self.resolved_path)["game"]
+            except OSError:
+                pass
+        return None
+
+    def get_fingerprint(self) -> str:
+        """
+        Fingerprint of the world's files, changes if any of them got modified. Stat based for world folders, and the
+        content hash from the APWorld index for .apworld files, so copying or touching one does not change it.
+        """
+        if self.is_zip:
+            return apworld_index.get(self.resolved_path)["sha256"]
+        fingerprint = hashlib.sha1()
+        for root, dirs, files in os.walk(self.resolved_path):
+            dirs[:] = sorted(folder for folder in dirs if folder != "__pycache__")
+            for file in sorted(files):
+                stat = os.stat(os.path.join(root, file))
+                fingerprint.update(f"{os.path.join(root, file)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+        return fingerprint.hexdigest()
+
     def load(self) -> bool:
         try:
             start = time.perf_counter()
@@ -93,7 +217,7 @@ class WorldSource:
             traceback.print_exc(file=file_like)
             file_like.seek(0)
             logging.exception(file_like.read())
-            failed_world_loads.append(os.path.basename(self.path).rsplit(".", 1)[0])
+            failed_world_loads.append(self.module_name)
             return False
 
 
@@ -115,15 +239,266 @@ for folder in (folder for folder in (user_folder, local_folder) if folder):
             elif entry.is_file() and entry.name.endswith(".apworld"):
                 world_sources.append(WorldSource(file_name, is_zip=True, relative=relative))
 
-# import all submodules to trigger AutoWorldRegister
 world_sources.sort()
-for world_source in world_sources:
-    world_source.load()
 
-# Build the data package for each game.
 from .AutoWorld import AutoWorldRegister
+from .LauncherComponents import Component, LazyComponent, components as launcher_components, icon_paths, \
+    replace_lazy_components
+
+
+class WorldManifest:
+    """
+    Which games each world source registers, together with their data package checksums, which launcher components
+    and icons it registers and which worlds define settings, keyed by a fingerprint of the source's files. Stored in the
+    user's cache directory.
+    """
+    manifest_version: int = 3
+    path: str
+    sources: Dict[str, Dict[str, Any]]
+    changed: bool = False
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.sources = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == __version__ and manifest.get("manifest_version") == self.manifest_version:
+                self.sources = manifest["sources"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Could not load world manifest: {e}")
+
+    def get_entry(self, source: WorldSource, fingerprint: str) -> Dict[str, Any] | None:
+        """Games, components, icons and settings of a source, if the manifest is up to date for it."""
+        entry = self.sources.get(source.resolved_path)
+        if entry and entry["fingerprint"] == fingerprint:
+            return entry
+        return None
+
+    def get_games(self, source: WorldSource, fingerprint: str) -> Dict[str, str] | None:
+        """Game name -> data package checksum of a source, if the manifest is up to date for it."""
+        entry = self.get_entry(source, fingerprint)
+        return entry["games"] if entry else None
+
+    def _store_icon(self, source: WorldSource, name: str, path: str) -> str:
+        """Copies icons from inside the world package to the cache, reading them from there does not import it."""
+        if not path.startswith("ap:"):
+            return path
+        module, file = path[3:].split("/", 1)
+        data = pkgutil.get_data(module, file)
+        if data is None:
+            return path
+        icon_file = os.path.join(os.path.dirname(self.path), "icons",
+                                 get_file_safe_name(f"{source.module_name}-{name}-{os.path.basename(file)}"))
+        os.makedirs(os.path.dirname(icon_file), exist_ok=True)
+        with open(icon_file, "wb") as f:
+            f.write(data)
+        return icon_file
+
+    def update(self, source: WorldSource, fingerprint: str, components: Sequence[Component] = (),
+               icons: Dict[str, str] | None = None) -> None:
+        """
+        Record the games of an imported source and store their data packages for lazy access, together with the
+        launcher components and icons that got registered while importing it, and the settings its worlds define.
+        """
+        from settings import get_world_settings_name
+
+        games: Dict[str, str] = {}
+        world_settings: Dict[str, str] = {}
+        module = f"worlds.{source.module_name}"
+        for game, world in dict.items(AutoWorldRegister.world_types):
+            if world.__module__ == module or world.__module__.startswith(module + "."):
+                game_package = network_data_package["games"][game]
+                store_data_package_for_checksum(game, game_package)
+                games[game] = game_package["checksum"]
+                world_settings_name = get_world_settings_name(world)
+                if world_settings_name:
+                    world_settings[world.settings_key] = world_settings_name
+        stored_icons: Dict[str, str] = {}
+        for name, path in (icons or {}).items():
+            try:
+                stored_icons[name] = self._store_icon(source, name, path)
+            except Exception as e:
+                logging.debug(f"Could not store icon {name} of {source}: {e}")
+                stored_icons[name] = path
+        self.sources[source.resolved_path] = {"fingerprint": fingerprint, "games": games,
+                                              "components": [component.to_manifest() for component in components],
+                                              "icons": stored_icons, "settings": world_settings}
+        self.changed = True
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # write to a temporary file first, other processes may be reading the manifest
+            temp_file = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": __version__, "manifest_version": self.manifest_version, "sources": self.sources},
+                          f)
+            os.replace(temp_file, self.path)
+        except Exception as e:
+            logging.debug(f"Could not store world manifest: {e}")
+        self.changed = False
 
+
+class GamesPackages(Dict[str, GamesPackage]):
+    """
+    Data package of each game, built on first access. For games of worlds that are not imported yet, the data package
+    gets loaded from the data package cache instead of importing the world, if the manifest knows its checksum.
+    """
+    checksums: Dict[str, str]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.checksums = {}
+
+    def _games(self) -> List[str]:
+        return [*dict.keys(AutoWorldRegister.world_types), *AutoWorldRegister.world_types.pending]
+
+    def __missing__(self, game: str) -> GamesPackage:
+        if game not in AutoWorldRegister.world_types:
+            raise KeyError(game)
+        if game in AutoWorldRegister.world_types.pending and game in self.checksums:
+            game_package = load_data_package_for_checksum(game, self.checksums[game])
+            if game_package.get("checksum") == self.checksums[game]:
+                self[game] = game_package
+                return game_package
+        game_package = self[game] = AutoWorldRegister.world_types[game].get_data_package_data()
+        return game_package
+
+    def __contains__(self, game: object) -> bool:
+        return game in AutoWorldRegister.world_types
+
+    def get(self, game: str, default: Any = None) -> Any:
+        try:
+            return self[game]
+        except KeyError:
+            return default
+
+    def build_all(self) -> None:
+        for game in self._games():
+            if not dict.__contains__(self, game):
+                self.get(game)
+
+    def __iter__(self):
+        self.build_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self.build_all()
+        return super().__len__()
+
+    def keys(self):
+        self.build_all()
+        return super().keys()
+
+    def values(self):
+        self.build_all()
+        return super().values()
+
+    def items(self):
+        self.build_all()
+        return super().items()
+
+
+# Data package for each game. In lazy mode, built when first accessed.
 network_data_package: DataPackage = {
-    "games": {world_name: world.get_data_package_data() for world_name, world in AutoWorldRegister.world_types.items()},
+    "games": GamesPackages(),
 }
 
+lazy_world_sources: Dict[str, WorldSource] = {}
+"""World sources that lazy mode did not import yet, by module name"""
+lazy_world_settings: Dict[str, str] = {}
+"""Settings key -> module and class name of the worlds that define settings, for world sources not imported yet"""
+unlisted_world_sources: Set[str] = set()
+"""Module names of the lazy world sources that the manifest does not list yet, new or changed .apworld files"""
+
+
+def load_world_source(world_source: WorldSource, fingerprint: str) -> None:
+    """Imports a world source and records it in the world manifest."""
+    known_component_count = len(launcher_components)
+    known_icons = dict(icon_paths)
+    if world_source.load():
+        world_manifest.update(world_source, fingerprint, launcher_components[known_component_count:],
+                              {name: path for name, path in icon_paths.items() if known_icons.get(name) != path})
+
+
+def load_lazy_world(module_name: str) -> None:
+    """Imports a world source that lazy mode skipped, unless it got imported since."""
+    world_source = lazy_world_sources.pop(module_name, None)
+    if world_source is None:
+        return
+    if module_name in unlisted_world_sources:
+        unlisted_world_sources.discard(module_name)
+        load_world_source(world_source, world_source.get_fingerprint())
+        if world_manifest.changed:
+            world_manifest.save()
+    else:
+        world_source.load()
+
+
+def load_unlisted_worlds() -> None:
+    """
+    Imports the .apworld files lazy mode skipped without the manifest listing them, which registers their launcher
+    components and lists them for the next start.
+    """
+    for module_name in list(unlisted_world_sources):
+        load_lazy_world(module_name)
+
+
+def load_lazy_worlds() -> None:
+    """Imports all world sources that lazy mode skipped, so all import side effects of worlds are present."""
+    if not lazy_world_sources:
+        return
+    while lazy_world_sources:
+        load_lazy_world(next(iter(lazy_world_sources)))
+    replace_lazy_components()
+
+
+# import all submodules to trigger AutoWorldRegister, or in lazy mode only the ones the manifest is outdated for
+world_manifest = WorldManifest(cache_path("worlds", "manifest.json"))
+lazy_components: List[LazyComponent] = []
+for world_source in world_sources:
+    try:
+        source_fingerprint = world_source.get_fingerprint()
+    except OSError:
+        world_source.load()
+        continue
+    manifest_entry = world_manifest.get_entry(world_source, source_fingerprint)
+    if manifest_entry is None:
+        declared_game = world_source.declared_game
+        if lazy_worlds and declared_game and declared_game not in AutoWorldRegister.world_types:
+            # the archipelago.json of a new or changed .apworld tells its game, so it only gets imported, and listed in
+            # the manifest, once the game is needed
+            lazy_world_sources[world_source.module_name] = world_source
+            unlisted_world_sources.add(world_source.module_name)
+            AutoWorldRegister.world_types.pending[declared_game] = functools.partial(load_lazy_world,
+                                                                                     world_source.module_name)
+        else:
+            load_world_source(world_source, source_fingerprint)
+    elif lazy_worlds and all(game not in AutoWorldRegister.world_types for game in manifest_entry["games"]):
+        lazy_world_sources[world_source.module_name] = world_source
+        # one loader for all games and components of the source, so loading any of them loads all of them
+        world_loader = functools.partial(load_lazy_world, world_source.module_name)
+        for manifest_game, manifest_checksum in manifest_entry["games"].items():
+            AutoWorldRegister.world_types.pending[manifest_game] = world_loader
+            network_data_package["games"].checksums[manifest_game] = manifest_checksum
+        lazy_components.extend(LazyComponent(data, world_loader) for data in manifest_entry["components"])
+        for icon_name, icon_path in manifest_entry["icons"].items():
+            icon_paths.setdefault(icon_name, icon_path)
+        lazy_world_settings.update(manifest_entry["settings"])
+    else:
+        world_source.load()
+if world_manifest.changed:
+    world_manifest.save()
+apworld_index.save()
+# worlds sharing a client, like SNI or BizHawk ones, each list its component, and it may be registered already
+registered_components = {component.display_name for component in launcher_components}
+for lazy_component in lazy_components:
+    if lazy_component.display_name not in registered_components:
+        registered_components.add(lazy_component.display_name)
+        launcher_components.append(lazy_component)
+if not lazy_worlds:
+    # serializers like json only see data packages that were already built
+    network_data_package["games"].build_all()
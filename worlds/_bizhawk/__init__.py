@@ -9,12 +9,23 @@ import asyncio
 import base64
 import enum
 import json
+import struct
 import sys
+import time
+import typing
 from typing import Any, Sequence
 
+from .framing import FRAMING_VERSION, decode_responses, encode_requests, frame_size
+
 
 BIZHAWK_SOCKET_PORT_RANGE_START = 43055
 BIZHAWK_SOCKET_PORT_RANGE_SIZE = 5
+PIPELINE_SCRIPT_VERSION = 2
+"""The first version of the connector script that accepts tagged messages"""
+BINARY_SCRIPT_VERSION = 3
+"""The first version of the connector script that can switch to binary framing, see `framing`"""
+WATCH_SCRIPT_VERSION = 4
+"""The first version of the connector script that can watch memory for changes, see `MemoryWatcher`"""
 
 
 class ConnectionStatus(enum.IntEnum):
@@ -43,17 +54,67 @@ class SyncError(Exception):
     pass
 
 
+def _encode_bytes(value: Any) -> str:
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dump_message(message: Any) -> str:
+    """Encodes a message as JSON, with bytes as base64 strings."""
+    return json.dumps(message, default=_encode_bytes)
+
+
+def _as_bytes(value: str | bytes) -> bytes:
+    """Memory data in responses is bytes with binary framing and a base64 string otherwise."""
+    return value if isinstance(value, bytes) else base64.b64decode(value)
+
+
 class BizHawkContext:
     streams: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None
     connection_status: ConnectionStatus
+    script_version: int | None
+    """The version of the connector script, once `get_script_version` asked for it"""
+    pipelined: bool
+    """Whether the connector script tags messages, so multiple of them can be in flight at once. Enabled with
+    `start_pipeline` for script versions that support it."""
+    binary: bool
+    """Whether tagged messages are sent as binary frames instead of JSON lines"""
     _lock: asyncio.Lock
     _port: int | None
+    _next_message_id: int
+    _pending: dict[int, asyncio.Future[list[dict[str, Any]]]]
+    _reader_task: asyncio.Task[None] | None
 
     def __init__(self) -> None:
         self.streams = None
         self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.script_version = None
+        self.pipelined = False
+        self.binary = False
         self._lock = asyncio.Lock()
         self._port = None
+        self._next_message_id = 0
+        self._pending = {}
+        self._reader_task = None
+
+    def _close(self, error: Exception) -> None:
+        """Drops the connection and fails all requests that are still waiting for a response with `error`."""
+        if self.streams is not None:
+            self.streams[1].close()
+            self.streams = None
+        self.connection_status = ConnectionStatus.NOT_CONNECTED
+        self.script_version = None
+        self.pipelined = False
+        self.binary = False
+        if self._reader_task is not None:
+            if self._reader_task is not asyncio.current_task():
+                self._reader_task.cancel()
+            self._reader_task = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
 
     async def _send_message(self, message: str):
         async with self._lock:
@@ -88,6 +149,64 @@ class BizHawkContext:
                 self.connection_status = ConnectionStatus.NOT_CONNECTED
                 raise RequestFailedError("Connection reset") from exc
 
+    async def _send_tagged(self, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Sends a list of requests as a tagged message without waiting for earlier messages to be answered, and
+        returns the responses the connector script sent back with the same tag."""
+        if self.streams is None:
+            raise NotConnectedError("You tried to send a request before a connection to BizHawk was made")
+
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        future: asyncio.Future[list[dict[str, Any]]] = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+
+        try:
+            async with self._lock:
+                writer = self.streams[1]
+                if self.binary:
+                    writer.write(encode_requests(message_id, requests))
+                else:
+                    writer.write(_dump_message({"id": message_id, "requests": requests}).encode("utf-8") + b"\n")
+                await asyncio.wait_for(writer.drain(), timeout=5)
+            return await asyncio.wait_for(future, timeout=5)
+        except asyncio.TimeoutError as exc:
+            self._close(RequestFailedError("Connection timed out"))
+            raise RequestFailedError("Connection timed out") from exc
+        except ConnectionResetError as exc:
+            self._close(RequestFailedError("Connection reset"))
+            raise RequestFailedError("Connection reset") from exc
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        """Hands tagged responses from the connector script to the requests waiting for them."""
+        try:
+            while True:
+                if self.binary:
+                    size, = frame_size.unpack(await reader.readexactly(frame_size.size))
+                    message_id, responses = decode_responses(await reader.readexactly(size))
+                else:
+                    res = await reader.readline()
+                    if res == b"":
+                        raise RequestFailedError("Connection closed")
+                    message = json.loads(res)
+                    message_id, responses = message["id"], message["responses"]
+
+                if self.connection_status == ConnectionStatus.TENTATIVE:
+                    self.connection_status = ConnectionStatus.CONNECTED
+
+                future = self._pending.get(message_id)
+                if future is not None and not future.done():
+                    future.set_result(responses)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.IncompleteReadError:
+            self._close(RequestFailedError("Connection closed"))
+        except RequestFailedError as exc:
+            self._close(exc)
+        except (ConnectionResetError, ValueError, KeyError, struct.error) as exc:
+            self._close(RequestFailedError(f"Connection failed: {exc}"))
+
 
 async def connect(ctx: BizHawkContext) -> bool:
     """Attempts to establish a connection with a connector script. Returns True if successful."""
@@ -98,6 +217,8 @@ async def connect(ctx: BizHawkContext) -> bool:
     for port in ports:
         try:
             ctx.streams = await asyncio.open_connection("127.0.0.1", port)
+            ctx.script_version = None
+            ctx.pipelined = False
             ctx.connection_status = ConnectionStatus.TENTATIVE
             ctx._port = port
             return True
@@ -112,21 +233,61 @@ async def connect(ctx: BizHawkContext) -> bool:
 
 def disconnect(ctx: BizHawkContext) -> None:
     """Closes the connection to the connector script."""
-    if ctx.streams is not None:
-        ctx.streams[1].close()
-        ctx.streams = None
-    ctx.connection_status = ConnectionStatus.NOT_CONNECTED
+    ctx._close(NotConnectedError("Disconnected from BizHawk"))
 
 
 async def get_script_version(ctx: BizHawkContext) -> int:
-    return int(await ctx._send_message("VERSION"))
+    ctx.script_version = int(await ctx._send_message("VERSION"))
+    return ctx.script_version
+
+
+async def start_binary_framing(ctx: BizHawkContext) -> None:
+    """Asks the connector script to switch to binary frames, which carry memory as raw bytes instead of base64 strings,
+    and starts the pipeline. Only call this after `get_script_version` returned `BINARY_SCRIPT_VERSION` or newer."""
+    if ctx.pipelined:
+        raise SyncError("Binary framing has to be negotiated before the pipeline is started")
+
+    handshake = f"BINARY {FRAMING_VERSION}"
+    res = (await ctx._send_message(handshake)).strip()
+    if res != handshake:
+        raise SyncError(f"Expected {handshake} but got {res}")
+
+    ctx.binary = True
+    start_pipeline(ctx)
+
+
+def start_pipeline(ctx: BizHawkContext) -> None:
+    """Switches the connection to tagged messages, so requests from multiple tasks can be in flight at once instead of
+    each waiting for the responses to the one before it. Only call this after `get_script_version` returned
+    `PIPELINE_SCRIPT_VERSION` or newer."""
+    if ctx.streams is None:
+        raise NotConnectedError("You tried to start a pipeline before a connection to BizHawk was made")
+
+    if not ctx.pipelined:
+        ctx.pipelined = True
+        ctx._reader_task = asyncio.create_task(ctx._read_responses(ctx.streams[0]), name="BizHawkReader")
 
 
 async def send_requests(ctx: BizHawkContext, req_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Sends a list of requests to the BizHawk connector and returns their responses.
 
-    It's likely you want to use the wrapper functions instead of this."""
-    responses = json.loads(await ctx._send_message(json.dumps(req_list)))
+    It's likely you want to use the wrapper functions or `RequestBatch` instead of this."""
+    responses = await _send_requests(ctx, req_list)
+    if ctx.binary:
+        # callers expect the same responses as from a connector script without binary framing
+        for response in responses:
+            if response["type"] == "READ_RESPONSE":
+                response["value"] = base64.b64encode(response["value"]).decode("ascii")
+    return responses
+
+
+async def _send_requests(ctx: BizHawkContext, req_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Like `send_requests`, but memory data in requests may be bytes and data in responses is bytes with binary
+    framing."""
+    if ctx.pipelined:
+        responses = await ctx._send_tagged(req_list)
+    else:
+        responses = json.loads(await ctx._send_message(_dump_message(req_list)))
     errors: list[ConnectorError] = []
 
     for response in responses:
@@ -250,10 +411,10 @@ async def guarded_read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int,
 
     Returns None if any item in guard_list failed to validate. Otherwise returns a list of bytes in the order they
     were requested."""
-    res = await send_requests(ctx, [{
+    res = await _send_requests(ctx, [{
         "type": "GUARD",
         "address": address,
-        "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
+        "expected_data": bytes(expected_data),
         "domain": domain
     } for address, expected_data, domain in guard_list] + [{
         "type": "READ",
@@ -271,7 +432,7 @@ async def guarded_read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int,
             if item["type"] != "READ_RESPONSE":
                 raise SyncError(f"Expected response of type READ_RESPONSE or GUARD_RESPONSE but got {item['type']}")
 
-            ret.append(base64.b64decode(item["value"]))
+            ret.append(_as_bytes(item["value"]))
 
     return ret
 
@@ -303,15 +464,15 @@ async def guarded_write(ctx: BizHawkContext, write_list: Sequence[tuple[int, Seq
     - `domain` is the name of the region of memory the address corresponds to
 
     Returns False if any item in guard_list failed to validate. Otherwise returns True."""
-    res = await send_requests(ctx, [{
+    res = await _send_requests(ctx, [{
         "type": "GUARD",
         "address": address,
-        "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
+        "expected_data": bytes(expected_data),
         "domain": domain
     } for address, expected_data, domain in guard_list] + [{
         "type": "WRITE",
         "address": address,
-        "value": base64.b64encode(bytes(value)).decode("ascii"),
+        "value": bytes(value),
         "domain": domain
     } for address, value, domain in write_list])
 
@@ -334,3 +495,199 @@ async def write(ctx: BizHawkContext, write_list: Sequence[tuple[int, Sequence[in
     - `value` is a list of bytes to write, in order, starting at `address`
     - `domain` is the name of the region of memory the address corresponds to"""
     await guarded_write(ctx, write_list, [])
+
+
+class RequestBatch:
+    """Collects the guards, reads and writes of one client tick, so they can be sent to the connector script as a
+    single message, which it runs on the same frame.
+
+    Every added request returns its index into the results of `send`. Requests run in the order they were added, and
+    once a guard fails, the requests after it are skipped."""
+    requests: list[dict[str, Any]]
+
+    _response_types: typing.ClassVar[dict[str, str]] = {
+        "GUARD": "GUARD_RESPONSE",
+        "READ": "READ_RESPONSE",
+        "WRITE": "WRITE_RESPONSE",
+        "DISPLAY_MESSAGE": "DISPLAY_MESSAGE_RESPONSE",
+    }
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    def _add(self, request: dict[str, Any]) -> int:
+        self.requests.append(request)
+        return len(self.requests) - 1
+
+    def guard(self, address: int, expected_data: Sequence[int], domain: str) -> int:
+        """Skips the requests after this one unless the bytes at `address` match `expected_data`."""
+        return self._add({
+            "type": "GUARD",
+            "address": address,
+            "expected_data": bytes(expected_data),
+            "domain": domain
+        })
+
+    def read(self, address: int, size: int, domain: str) -> int:
+        """Reads `size` bytes starting at `address`."""
+        return self._add({"type": "READ", "address": address, "size": size, "domain": domain})
+
+    def write(self, address: int, value: Sequence[int], domain: str) -> int:
+        """Writes `value` starting at `address`."""
+        return self._add({
+            "type": "WRITE",
+            "address": address,
+            "value": bytes(value),
+            "domain": domain
+        })
+
+    def display_message(self, message: str) -> int:
+        """Adds `message` to BizHawk's message queue."""
+        return self._add({"type": "DISPLAY_MESSAGE", "message": message})
+
+    async def send(self, ctx: BizHawkContext) -> list[Any]:
+        """Sends all requests as one message and returns their results in the order they were added: whether the
+        memory matched for guards, the read bytes for reads and True for everything else. Requests that were skipped
+        after a failed guard have None as their result."""
+        if not self.requests:
+            return []
+
+        responses = await _send_requests(ctx, self.requests)
+        results: list[Any] = []
+        failed_guard = False
+        for request, response in zip(self.requests, responses):
+            if failed_guard:
+                results.append(None)
+                continue
+
+            expected_type = self._response_types[request["type"]]
+            if response["type"] != expected_type:
+                raise SyncError(f"Expected response of type {expected_type} but got {response['type']}")
+
+            if response["type"] == "GUARD_RESPONSE":
+                failed_guard = not response["value"]
+                results.append(response["value"])
+            elif response["type"] == "READ_RESPONSE":
+                results.append(_as_bytes(response["value"]))
+            else:
+                results.append(True)
+
+        return results
+
+
+class _Watch(typing.NamedTuple):
+    address: int
+    size: int
+    domain: str
+    interval: float
+
+
+class MemoryWatcher:
+    """Watches ranges of memory and only reports the ones that changed, so a game watcher doesn't have to compare the
+    same location flags or item counters on every tick.
+
+    With a connector script of version `WATCH_SCRIPT_VERSION` or newer, the connector keeps the ranges and compares
+    them itself, and a poll that finds no changes sends almost nothing back. Watches are registered again after a
+    reconnect. With older scripts, the ranges are read and compared here instead.
+
+    Watch names are shared by all watchers on the same connection."""
+    watches: dict[str, _Watch]
+    data: dict[str, bytes]
+    """The last known contents of each watched range"""
+
+    _registered_streams: Any
+    _unregistered: set[str]
+    _unwatched: set[str]
+    _last_checked: dict[str, float]
+
+    def __init__(self) -> None:
+        self.watches = {}
+        self.data = {}
+        self._registered_streams = None
+        self._unregistered = set()
+        self._unwatched = set()
+        self._last_checked = {}
+
+    def watch(self, name: str, address: int, size: int, domain: str, interval: float = 0) -> None:
+        """Starts watching `size` bytes at `address`. `interval` is the least amount of seconds between two checks of
+        the range, to limit how often ranges that don't need quick reactions get compared."""
+        self.watches[name] = _Watch(address, size, domain, interval)
+        self.data.pop(name, None)
+        self._unregistered.add(name)
+        self._unwatched.discard(name)
+
+    def unwatch(self, name: str) -> None:
+        """Stops watching the range added under `name`."""
+        if self.watches.pop(name, None) is not None:
+            self.data.pop(name, None)
+            self._unregistered.discard(name)
+            self._unwatched.add(name)
+
+    async def poll(self, ctx: BizHawkContext) -> dict[str, bytes]:
+        """Returns the new contents of the ranges that changed since the last poll, by name. The first poll after
+        watching a range always reports it."""
+        if ctx.script_version is None or ctx.script_version < WATCH_SCRIPT_VERSION:
+            return await self._poll_reads(ctx)
+
+        if self._registered_streams is not ctx.streams:
+            # the connector forgets its watches when the connection drops
+            self._registered_streams = ctx.streams
+            self._unregistered = set(self.watches)
+            self._unwatched.clear()
+            self.data.clear()
+
+        # ranges watched or unwatched while the requests are in flight are sent with the next poll
+        unwatched, self._unwatched = self._unwatched, set()
+        unregistered, self._unregistered = self._unregistered, set()
+        requests: list[dict[str, Any]] = [{"type": "UNWATCH", "id": name} for name in unwatched]
+        requests += [{
+            "type": "WATCH",
+            "id": name,
+            "address": self.watches[name].address,
+            "size": self.watches[name].size,
+            "domain": self.watches[name].domain,
+            "interval": self.watches[name].interval
+        } for name in unregistered]
+        requests.append({"type": "WATCH_POLL"})
+        try:
+            responses = await send_requests(ctx, requests)
+        except Exception:
+            self._unwatched.update(name for name in unwatched if name not in self.watches)
+            self._unregistered.update(name for name in unregistered if name in self.watches)
+            raise
+
+        if responses[-1]["type"] != "WATCH_POLL_RESPONSE":
+            raise SyncError(f"Expected response of type WATCH_POLL_RESPONSE but got {responses[-1]['type']}")
+
+        changes: dict[str, bytes] = {}
+        for change in responses[-1]["value"]:
+            name = change["id"]
+            if name not in self.watches:
+                continue
+            # only the changed part of a range is sent
+            data = bytearray(self.data.get(name, bytes(self.watches[name].size)))
+            value = base64.b64decode(change["value"])
+            data[change["offset"]:change["offset"] + len(value)] = value
+            changes[name] = self.data[name] = bytes(data)
+        return changes
+
+    async def _poll_reads(self, ctx: BizHawkContext) -> dict[str, bytes]:
+        self._unregistered.clear()
+        for name in self._unwatched:
+            self._last_checked.pop(name, None)
+        self._unwatched.clear()
+
+        now = time.monotonic()
+        due = [name for name, watch in self.watches.items()
+               if name not in self._last_checked or now - self._last_checked[name] >= watch.interval]
+        if not due:
+            return {}
+
+        values = await read(ctx, [(self.watches[name].address, self.watches[name].size, self.watches[name].domain)
+                                  for name in due])
+        changes: dict[str, bytes] = {}
+        for name, value in zip(due, values):
+            self._last_checked[name] = now
+            if self.data.get(name) != value:
+                changes[name] = self.data[name] = value
+        return changes
@@ -56,6 +56,9 @@ class AutoBizHawkClientRegister(abc.ABCMeta):
 
     @staticmethod
     async def get_handler(ctx: "BizHawkClientContext", system: str) -> BizHawkClient | None:
+        # handlers get registered when their world is imported
+        from worlds import load_lazy_worlds
+        load_lazy_worlds()
         for systems, handlers in AutoBizHawkClientRegister.game_handlers.items():
             if system in systems:
                 for handler in handlers.values():
@@ -12,12 +12,15 @@ from CommonClient import CommonContext, ClientCommandProcessor, get_base_parser,
 import Patch
 import Utils
 
-from . import BizHawkContext, ConnectionStatus, NotConnectedError, RequestFailedError, connect, disconnect, get_hash, \
-    get_script_version, get_system, ping
+from . import BINARY_SCRIPT_VERSION, PIPELINE_SCRIPT_VERSION, BizHawkContext, ConnectionStatus, NotConnectedError, \
+    RequestFailedError, connect, disconnect, get_hash, get_script_version, get_system, ping, start_binary_framing, \
+    start_pipeline
 from .client import BizHawkClient, AutoBizHawkClientRegister
 
 
-EXPECTED_SCRIPT_VERSION = 1
+EXPECTED_SCRIPT_VERSION = 4
+MINIMUM_SCRIPT_VERSION = 1
+"""Oldest connector script version the client still works with, without tagged messages"""
 
 
 class AuthStatus(enum.IntEnum):
@@ -146,21 +149,29 @@ async def _game_watcher(ctx: BizHawkClientContext):
 
                 script_version = await get_script_version(ctx.bizhawk_ctx)
 
-                if script_version != EXPECTED_SCRIPT_VERSION:
+                if not MINIMUM_SCRIPT_VERSION <= script_version <= EXPECTED_SCRIPT_VERSION:
                     logger.info(f"Connector script is incompatible. Expected version {EXPECTED_SCRIPT_VERSION} but "
                                 f"got {script_version}. Disconnecting.")
                     disconnect(ctx.bizhawk_ctx)
                     continue
 
+                if script_version >= BINARY_SCRIPT_VERSION:
+                    await start_binary_framing(ctx.bizhawk_ctx)
+                elif script_version >= PIPELINE_SCRIPT_VERSION:
+                    start_pipeline(ctx.bizhawk_ctx)
+                else:
+                    logger.info(f"Connector script is outdated (version {script_version}). Use the one that came "
+                                f"with this client for faster responses.")
+
             showed_connecting_message = False
 
-            await ping(ctx.bizhawk_ctx)
+            # with a pipelined connection, both are answered on the same frame
+            _, rom_hash = await asyncio.gather(ping(ctx.bizhawk_ctx), get_hash(ctx.bizhawk_ctx))
 
             if not showed_connected_message:
                 showed_connected_message = True
                 logger.info("Connected to BizHawk")
 
-            rom_hash = await get_hash(ctx.bizhawk_ctx)
             if ctx.rom_hash is not None and ctx.rom_hash != rom_hash:
                 if ctx.server is not None and not ctx.server.socket.closed:
                     logger.info(f"ROM changed. Disconnecting from server.")
@@ -0,0 +1,166 @@
+"""
+Binary framing for tagged messages between the client and `connector_bizhawk_generic.lua`, used instead of JSON lines
+once both sides agreed on it with a `BINARY <version>` handshake.
+
+Every frame is a little endian u32 with the size of its body, followed by the body: the u32 message id, the u16 amount
+of requests or responses and then each of them, starting with a u8 opcode. Memory requests carry raw bytes instead of
+base64 strings. Everything else is sent as a JSON object, the same way as without binary framing.
+
+Requests:
+- `JSON`: u32 size, JSON object
+- `READ`: u32 address, u8 domain size, domain, u32 size
+- `WRITE`: u32 address, u8 domain size, domain, u32 size, data
+- `GUARD`: u32 address, u8 domain size, domain, u32 size, expected data
+
+Responses:
+- `JSON`: u32 size, JSON object
+- `READ`: u32 size, data
+- `WRITE`: nothing
+- `GUARD`: u8 1 if the memory matched and 0 if not, u32 address
+"""
+
+import base64
+import enum
+import json
+import struct
+from typing import Any
+
+FRAMING_VERSION = 1
+"""The version of the framing the client asks the connector script for"""
+
+frame_size = struct.Struct("<I")
+_header = struct.Struct("<IH")
+_u32 = struct.Struct("<I")
+_address = struct.Struct("<IB")
+_guard = struct.Struct("<BI")
+
+
+class Opcode(enum.IntEnum):
+    JSON = 0
+    READ = 1
+    WRITE = 2
+    GUARD = 3
+
+
+_request_opcodes = {"READ": Opcode.READ, "WRITE": Opcode.WRITE, "GUARD": Opcode.GUARD}
+
+
+def _as_bytes(value: str | bytes) -> bytes:
+    """Memory data in requests built by `send_requests` callers is a base64 string, the module's own helpers use bytes."""
+    return base64.b64decode(value) if isinstance(value, str) else value
+
+
+def _pack_json(data: bytearray, value: Any) -> None:
+    encoded = json.dumps(value).encode("utf-8")
+    data += _u32.pack(len(encoded))
+    data += encoded
+
+
+def _unpack_json(body: memoryview, position: int) -> tuple[Any, int]:
+    size, = _u32.unpack_from(body, position)
+    position += _u32.size
+    return json.loads(bytes(body[position:position + size])), position + size
+
+
+def _pack_memory(data: bytearray, request: dict[str, Any]) -> None:
+    domain = request["domain"].encode("utf-8")
+    data += _address.pack(request["address"], len(domain))
+    data += domain
+
+
+def encode_requests(message_id: int, requests: list[dict[str, Any]]) -> bytes:
+    """Encodes a tagged message to the connector script as a frame."""
+    data = bytearray(frame_size.size)
+    data += _header.pack(message_id, len(requests))
+    for request in requests:
+        opcode = _request_opcodes.get(request["type"], Opcode.JSON)
+        data.append(opcode)
+        if opcode == Opcode.JSON:
+            _pack_json(data, request)
+            continue
+        _pack_memory(data, request)
+        if opcode == Opcode.READ:
+            data += _u32.pack(request["size"])
+        else:
+            value = _as_bytes(request["value" if opcode == Opcode.WRITE else "expected_data"])
+            data += _u32.pack(len(value))
+            data += value
+    frame_size.pack_into(data, 0, len(data) - frame_size.size)
+    return bytes(data)
+
+
+def decode_requests(body: bytes) -> tuple[int, list[dict[str, Any]]]:
+    """Decodes the body of a frame from `encode_requests`. Memory data is decoded to bytes."""
+    view = memoryview(body)
+    message_id, count = _header.unpack_from(view)
+    position = _header.size
+    requests: list[dict[str, Any]] = []
+    for _ in range(count):
+        opcode = view[position]
+        position += 1
+        if opcode == Opcode.JSON:
+            request, position = _unpack_json(view, position)
+            requests.append(request)
+            continue
+        address, domain_size = _address.unpack_from(view, position)
+        position += _address.size
+        domain = bytes(view[position:position + domain_size]).decode("utf-8")
+        position += domain_size
+        size, = _u32.unpack_from(view, position)
+        position += _u32.size
+        request = {"type": Opcode(opcode).name, "address": address, "domain": domain}
+        if opcode == Opcode.READ:
+            request["size"] = size
+        else:
+            request["value" if opcode == Opcode.WRITE else "expected_data"] = bytes(view[position:position + size])
+            position += size
+        requests.append(request)
+    return message_id, requests
+
+
+def encode_responses(message_id: int, responses: list[dict[str, Any]]) -> bytes:
+    """Encodes the responses to a tagged message as a frame, the way the connector script does."""
+    data = bytearray(frame_size.size)
+    data += _header.pack(message_id, len(responses))
+    for response in responses:
+        if response["type"] == "READ_RESPONSE":
+            value = _as_bytes(response["value"])
+            data.append(Opcode.READ)
+            data += _u32.pack(len(value))
+            data += value
+        elif response["type"] == "WRITE_RESPONSE":
+            data.append(Opcode.WRITE)
+        elif response["type"] == "GUARD_RESPONSE":
+            data.append(Opcode.GUARD)
+            data += _guard.pack(response["value"], response["address"])
+        else:
+            data.append(Opcode.JSON)
+            _pack_json(data, response)
+    frame_size.pack_into(data, 0, len(data) - frame_size.size)
+    return bytes(data)
+
+
+def decode_responses(body: bytes) -> tuple[int, list[dict[str, Any]]]:
+    """Decodes the body of a frame from the connector script. Read data is decoded to bytes."""
+    view = memoryview(body)
+    message_id, count = _header.unpack_from(view)
+    position = _header.size
+    responses: list[dict[str, Any]] = []
+    for _ in range(count):
+        opcode = view[position]
+        position += 1
+        if opcode == Opcode.READ:
+            size, = _u32.unpack_from(view, position)
+            position += _u32.size
+            responses.append({"type": "READ_RESPONSE", "value": bytes(view[position:position + size])})
+            position += size
+        elif opcode == Opcode.WRITE:
+            responses.append({"type": "WRITE_RESPONSE"})
+        elif opcode == Opcode.GUARD:
+            value, address = _guard.unpack_from(view, position)
+            position += _guard.size
+            responses.append({"type": "GUARD_RESPONSE", "value": bool(value), "address": address})
+        else:
+            response, position = _unpack_json(view, position)
+            responses.append(response)
+    return message_id, responses
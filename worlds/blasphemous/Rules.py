@@ -1,5 +1,7 @@
 from typing import Dict, List, Tuple, Any, Callable, TYPE_CHECKING
 from BaseClasses import CollectionState
+from worlds.generic.LogicCompiler import LogicCompiler, Symbol
+from worlds.generic.Rules import CanReach
 
 if TYPE_CHECKING:
     from . import BlasphemousWorld
@@ -491,37 +493,33 @@ class BlasRules:
                                                     *self.indirect_regions["canBeatPatioBoss"],
                                                     *self.indirect_regions["canBeatWallBoss"]]
 
+        # rooms are added as they come up in load_rule
+        self.logic_symbols: Dict[str, Symbol] = dict(self.string_rules)
+        # visibility flags only depend on options, so they get folded into the logic
+        for flag in ("DoubleJump", "NormalLogic", "NormalLogicAndDoubleJump", "HardLogic", "HardLogicAndDoubleJump",
+                     "EnemySkips", "EnemySkipsAndDoubleJump"):
+            self.logic_symbols[flag] = bool(self.string_rules[flag](self.multiworld.state))
+        self.logic = LogicCompiler(self.logic_symbols)
 
     def req_is_region(self, string: str) -> bool:
         return (string[0] == "D" and string[3] == "Z" and string[6] == "S")\
             or (string[0] == "D" and string[3] == "B" and string[4] == "Z" and string[7] == "S")
 
     def load_rule(self, obj_is_region: bool, name: str, obj: Dict[str, Any]) -> Callable[[CollectionState], bool]:
-        clauses = []
         for clause in obj["logic"]:
-            reqs = []
             for req in clause["item_requirements"]:
                 if self.req_is_region(req):
                     if obj_is_region:
                         # add to indirect conditions if object and requirement are doors
                         self.indirect_conditions.append((req, f"{name} -> {obj['target']}"))
-                    reqs.append(lambda state, req=req: state.can_reach_region(req, self.player))
-                else:
-                    if obj_is_region and req in self.indirect_regions:
-                        # add to indirect conditions if object is door and requirement has list of regions
-                        for region in self.indirect_regions[req]:
-                            self.indirect_conditions.append((region, f"{name} -> {obj['target']}"))
-                    reqs.append(self.string_rules[req])
-            if len(reqs) == 1:
-                clauses.append(reqs[0])
-            else:
-                clauses.append(lambda state, reqs=reqs: all(req(state) for req in reqs))
-        if not clauses:
+                    self.logic_symbols.setdefault(req, CanReach(req, self.player))
+                elif obj_is_region and req in self.indirect_regions:
+                    # add to indirect conditions if object is door and requirement has list of regions
+                    for region in self.indirect_regions[req]:
+                        self.indirect_conditions.append((region, f"{name} -> {obj['target']}"))
+        if not obj["logic"]:
             return lambda state: True
-        elif len(clauses) == 1:
-            return clauses[0]
-        else:
-            return lambda state: any(clause(state) for clause in clauses)
+        return self.logic.compile_dnf(clause["item_requirements"] for clause in obj["logic"])
 
     # Relics
     def blood(self, state: CollectionState) -> bool:
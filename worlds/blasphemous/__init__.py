@@ -9,7 +9,11 @@ from .Rules import BlasRules
 from worlds.generic.Rules import set_rule
 from .Options import BlasphemousOptions, blas_option_groups
 from .Vanilla import unrandomized_dict, junk_locations, thorn_set, skill_dict
-from .region_data import regions, locations
+from Utils import DataModule
+
+# generated tables, loaded from a binary cache when first used
+region_tables = DataModule(f"{__name__}.region_data")
+
 
 class BlasphemousWeb(WebWorld):
     theme = "stone"
@@ -223,7 +227,7 @@ class BlasphemousWorld(World):
 
         created_regions: List[str] = []
 
-        for r in regions:
+        for r in region_tables.regions:
             multiworld.regions.append(Region(r["name"], player, multiworld))
             created_regions.append(r["name"])
 
@@ -231,7 +235,7 @@ class BlasphemousWorld(World):
 
         blas_logic = BlasRules(self)
 
-        for r in regions:
+        for r in region_tables.regions:
             region = self.get_region(r["name"])
 
             for e in r["exits"]:
@@ -252,7 +256,7 @@ class BlasphemousWorld(World):
                     region.add_exits({t})
 
 
-        for l in [l for l in locations if l["name"] not in self.disabled_locations]:
+        for l in [l for l in region_tables.locations if l["name"] not in self.disabled_locations]:
             location = self.get_location(location_names[l["name"]])
             set_rule(location, blas_logic.load_rule(False, l["name"], l))
 
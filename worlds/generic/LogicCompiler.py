@@ -0,0 +1,200 @@
+"""
+Compiles boolean logic over named symbols, as found in generated or data-driven logic tables, into access rules.
+
+Logic is given either in disjunctive normal form, as a list of clauses that each list the symbols they require, or as an
+expression tree of symbol names and ("and", ...) / ("or", ...) tuples. Symbols resolve through a symbol table to
+declarative rules from worlds.generic.Rules, plain CollectionRules or booleans for things that are fixed per world, such
+as options.
+
+Compiling constant folds booleans, drops duplicate and redundant clauses, merges the item requirements of each clause
+into one lookup per player and orders clauses and requirements so cheap checks run first. Identical clauses share one
+compiled rule across all rules of a compiler.
+"""
+import typing
+
+from worlds.generic.Rules import And, CollectionRule, Has, HasAll, Or, Rule
+
+if typing.TYPE_CHECKING:
+    import BaseClasses
+
+Symbol = typing.Union[bool, Rule, CollectionRule]
+Expression = typing.Union[str, typing.Tuple[typing.Any, ...]]
+
+
+class ItemClauses(Rule):
+    """Requires all items with their counts of any one of the clauses, with the item counter looked up only once."""
+    __slots__ = ("clauses", "player")
+
+    def __init__(self, clauses: typing.Iterable[typing.Mapping[str, int]], player: int) -> None:
+        self.clauses = tuple(tuple(clause.items()) for clause in clauses)
+        self.player = player
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        player_prog_items = state.prog_items[self.player]
+        for clause in self.clauses:
+            for item, count in clause:
+                if player_prog_items[item] < count:
+                    break
+            else:
+                return True
+        return False
+
+    @property
+    def dependencies(self) -> typing.FrozenSet[typing.Tuple[int, str]]:
+        return frozenset((self.player, item) for clause in self.clauses for item, _ in clause)
+
+    def __repr__(self) -> str:
+        return f"ItemClauses({[dict(clause) for clause in self.clauses]!r}, {self.player})"
+
+
+class Condition(Rule):
+    """Wraps a plain CollectionRule, so it can be part of declarative rules. Its dependencies are unknown."""
+    __slots__ = ("function",)
+
+    def __init__(self, function: CollectionRule) -> None:
+        self.function = function
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        return self.function(state)
+
+    def __repr__(self) -> str:
+        return f"Condition({self.function!r})"
+
+
+class _Clause(typing.NamedTuple):
+    items: typing.Dict[int, typing.Dict[str, int]]
+    """Required item counts by player."""
+    others: typing.Tuple[Rule, ...]
+    """Other requirements, in the order of the symbols that required them."""
+
+
+class LogicCompiler:
+    """
+    Compiles logic for one symbol table. Reuse one compiler for all rules of a world, so identical clauses are shared.
+
+    :param symbols: Maps symbol names to a Rule, a CollectionRule or a bool
+    :param max_clauses: Expression trees that would expand to more clauses than this are compiled as they are, instead
+                        of getting converted to disjunctive normal form
+    """
+    symbols: typing.Mapping[str, Symbol]
+    max_clauses: int
+    _conditions: typing.Dict[str, Rule]
+    _clauses: typing.Dict[typing.FrozenSet[str], Rule]
+
+    def __init__(self, symbols: typing.Mapping[str, Symbol], max_clauses: int = 64) -> None:
+        self.symbols = symbols
+        self.max_clauses = max_clauses
+        self._conditions = {}
+        self._clauses = {}
+
+    def _resolve(self, symbol: str) -> typing.Union[bool, Rule]:
+        value = self.symbols[symbol]
+        if isinstance(value, (bool, Rule)):
+            return value
+        condition = self._conditions.get(symbol)
+        if condition is None:
+            condition = self._conditions[symbol] = Condition(value)
+        return condition
+
+    def _reduce(self, clauses: typing.Iterable[typing.Iterable[str]]) \
+            -> typing.Optional[typing.List[typing.FrozenSet[str]]]:
+        """Folds constants and drops duplicate and redundant clauses. Returns None if a clause is always true."""
+        reduced: typing.Set[typing.FrozenSet[str]] = set()
+        for clause in clauses:
+            symbols: typing.Set[str] = set()
+            for symbol in clause:
+                value = self._resolve(symbol)
+                if value is False:
+                    break
+                if value is not True:
+                    symbols.add(symbol)
+            else:
+                if not symbols:
+                    return None
+                reduced.add(frozenset(symbols))
+        # a clause that requires everything another clause requires and more is never needed
+        minimal: typing.List[typing.FrozenSet[str]] = []
+        for clause in sorted(reduced, key=lambda clause: (len(clause), sorted(clause))):
+            if not any(other <= clause for other in minimal):
+                minimal.append(clause)
+        return minimal
+
+    def _split(self, clause: typing.FrozenSet[str]) -> _Clause:
+        items: typing.Dict[int, typing.Dict[str, int]] = {}
+        others: typing.List[Rule] = []
+        for symbol in sorted(clause):
+            value = self._resolve(symbol)
+            if isinstance(value, Has):
+                counts = items.setdefault(value.player, {})
+                counts[value.item] = max(counts.get(value.item, 0), value.count)
+            elif isinstance(value, HasAll):
+                counts = items.setdefault(value.player, {})
+                for item, count in value.item_counts.items():
+                    counts[item] = max(counts.get(item, 0), count)
+            else:
+                others.append(value)
+        return _Clause(items, tuple(others))
+
+    def _compile_clause(self, clause: typing.FrozenSet[str], split: _Clause) -> Rule:
+        rule = self._clauses.get(clause)
+        if rule is None:
+            rule = self._clauses[clause] = And(*(HasAll(counts, player) for player, counts in split.items.items()),
+                                               *split.others)
+        return rule
+
+    def compile_dnf(self, clauses: typing.Iterable[typing.Iterable[str]]) -> Rule:
+        """
+        Compiles logic in disjunctive normal form, a list of clauses of which any one has to be fulfilled, each listing
+        the symbols it requires. No clauses means the rule can never be fulfilled, an empty clause that it always is.
+        """
+        reduced = self._reduce(clauses)
+        if reduced is None:
+            return And()
+        item_clauses: typing.Dict[int, typing.List[typing.Dict[str, int]]] = {}
+        others: typing.List[typing.Tuple[int, Rule]] = []
+        for clause in reduced:
+            split = self._split(clause)
+            if not split.others and len(split.items) == 1:
+                player, counts = next(iter(split.items.items()))
+                item_clauses.setdefault(player, []).append(counts)
+            else:
+                # clauses with fewer non-item requirements are likely cheaper, try them first
+                others.append((len(split.others), self._compile_clause(clause, split)))
+        rules = [ItemClauses(player_clauses, player) if len(player_clauses) > 1 else HasAll(player_clauses[0], player)
+                 for player, player_clauses in item_clauses.items()]
+        rules += [rule for _, rule in sorted(others, key=lambda other: other[0])]
+        return rules[0] if len(rules) == 1 else Or(*rules)
+
+    def _to_dnf(self, expression: Expression) -> typing.Optional[typing.List[typing.List[str]]]:
+        if isinstance(expression, str):
+            return [[expression]]
+        operator, *operands = expression
+        if operator not in ("and", "or"):
+            raise ValueError(f"Unknown logic operator {operator!r} in {expression!r}")
+        operand_clauses = []
+        for operand in operands:
+            clauses = self._to_dnf(operand)
+            if clauses is None:
+                return None
+            operand_clauses.append(clauses)
+        if operator == "or":
+            result = [clause for clauses in operand_clauses for clause in clauses]
+        else:
+            result = [[]]
+            for clauses in operand_clauses:
+                result = [left + right for left in result for right in clauses]
+                if len(result) > self.max_clauses:
+                    return None
+        return result if len(result) <= self.max_clauses else None
+
+    def compile(self, expression: Expression) -> Rule:
+        """
+        Compiles an expression tree of symbol names and ("and", *operands) or ("or", *operands) tuples.
+        Expressions that are small enough in disjunctive normal form get compiled through compile_dnf.
+        """
+        clauses = self._to_dnf(expression)
+        if clauses is not None:
+            return self.compile_dnf(clauses)
+        operator, *operands = expression
+        compiled = [self.compile(operand) for operand in operands]
+        return And(*compiled) if operator == "and" else Or(*compiled)
@@ -96,6 +96,210 @@ def exclusion_rules(multiworld: MultiWorld, player: int, exclude_locations: typi
                 logging.warning(f"Unable to exclude location {loc_name} in player {player}'s world.")
 
 
+class Rule:
+    """
+    Base of declarative access rules, which can be used anywhere a CollectionRule is expected. Unlike a lambda, a rule
+    knows which items it reads, so sweeps can skip re-evaluating it while none of them changed.
+    Rules can be combined with `&` and `|`, add_rule also keeps combined rules declarative.
+    """
+    __slots__ = ()
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        raise NotImplementedError
+
+    @property
+    def dependencies(self) -> typing.Optional[typing.FrozenSet[typing.Tuple[int, str]]]:
+        """The (player, item name) pairs the result depends on, or None if it depends on more than just items."""
+        return None
+
+    def __and__(self, other: "Rule") -> "Rule":
+        return And(self, other)
+
+    def __or__(self, other: "Rule") -> "Rule":
+        return Or(self, other)
+
+
+class Has(Rule):
+    """Requires `count` of an item."""
+    __slots__ = ("item", "player", "count")
+
+    def __init__(self, item: str, player: int, count: int = 1) -> None:
+        self.item = item
+        self.player = player
+        self.count = count
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        return state.prog_items[self.player][self.item] >= self.count
+
+    @property
+    def dependencies(self) -> typing.FrozenSet[typing.Tuple[int, str]]:
+        return frozenset(((self.player, self.item),))
+
+    def __repr__(self) -> str:
+        return f"Has({self.item!r}, {self.player}, {self.count})"
+
+
+class HasAll(Rule):
+    """Requires each of the items, with an optional count per item."""
+    __slots__ = ("item_counts", "player")
+
+    def __init__(self, items: typing.Union[typing.Iterable[str], typing.Mapping[str, int]], player: int) -> None:
+        self.item_counts = dict(items) if isinstance(items, typing.Mapping) else dict.fromkeys(items, 1)
+        self.player = player
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        player_prog_items = state.prog_items[self.player]
+        for item, count in self.item_counts.items():
+            if player_prog_items[item] < count:
+                return False
+        return True
+
+    @property
+    def dependencies(self) -> typing.FrozenSet[typing.Tuple[int, str]]:
+        return frozenset((self.player, item) for item in self.item_counts)
+
+    def __repr__(self) -> str:
+        return f"HasAll({self.item_counts!r}, {self.player})"
+
+
+class HasAny(Rule):
+    """Requires at least one of the items."""
+    __slots__ = ("items", "player")
+
+    def __init__(self, items: typing.Iterable[str], player: int) -> None:
+        self.items = tuple(dict.fromkeys(items))
+        self.player = player
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        player_prog_items = state.prog_items[self.player]
+        for item in self.items:
+            if player_prog_items[item]:
+                return True
+        return False
+
+    @property
+    def dependencies(self) -> typing.FrozenSet[typing.Tuple[int, str]]:
+        return frozenset((self.player, item) for item in self.items)
+
+    def __repr__(self) -> str:
+        return f"HasAny({list(self.items)!r}, {self.player})"
+
+
+class Count(Rule):
+    """Requires `count` items in total from the given items, duplicates included."""
+    __slots__ = ("items", "player", "count")
+
+    def __init__(self, items: typing.Iterable[str], player: int, count: int) -> None:
+        self.items = tuple(dict.fromkeys(items))
+        self.player = player
+        self.count = count
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        return state.has_from_list(self.items, self.player, self.count)
+
+    @property
+    def dependencies(self) -> typing.FrozenSet[typing.Tuple[int, str]]:
+        return frozenset((self.player, item) for item in self.items)
+
+    def __repr__(self) -> str:
+        return f"Count({list(self.items)!r}, {self.player}, {self.count})"
+
+
+class CanReach(Rule):
+    """Requires a region, location or entrance to be reachable, see CollectionState.can_reach."""
+    __slots__ = ("spot", "resolution_hint", "player")
+
+    def __init__(self, spot: str, player: int, resolution_hint: str = "Region") -> None:
+        self.spot = spot
+        self.player = player
+        self.resolution_hint = resolution_hint
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        return state.can_reach(self.spot, self.resolution_hint, self.player)
+
+    def __repr__(self) -> str:
+        return f"CanReach({self.spot!r}, {self.player}, {self.resolution_hint!r})"
+
+
+class _Combination(Rule):
+    __slots__ = ("rules", "_dependencies")
+
+    def __init__(self, *rules: Rule) -> None:
+        flattened: typing.List[Rule] = []
+        for rule in rules:
+            flattened.extend(rule.rules if type(rule) is type(self) else (rule,))
+        self.rules = self._merge(flattened)
+        self._dependencies: typing.Optional[typing.FrozenSet[typing.Tuple[int, str]]] = frozenset()
+        for rule in self.rules:
+            dependencies = rule.dependencies
+            if dependencies is None:
+                self._dependencies = None
+                break
+            self._dependencies |= dependencies
+
+    @staticmethod
+    def _merge(rules: typing.List[Rule]) -> typing.Tuple[Rule, ...]:
+        return tuple(rules)
+
+    @property
+    def dependencies(self) -> typing.Optional[typing.FrozenSet[typing.Tuple[int, str]]]:
+        return self._dependencies
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.rules))})"
+
+
+class And(_Combination):
+    """Requires all the rules. Item requirements of the same player get merged into one check, which runs first."""
+    __slots__ = ()
+
+    @staticmethod
+    def _merge(rules: typing.List[Rule]) -> typing.Tuple[Rule, ...]:
+        item_counts: typing.Dict[int, typing.Dict[str, int]] = {}
+        others: typing.List[Rule] = []
+        for rule in rules:
+            if isinstance(rule, Has):
+                counts = item_counts.setdefault(rule.player, {})
+                counts[rule.item] = max(counts.get(rule.item, 0), rule.count)
+            elif isinstance(rule, HasAll):
+                counts = item_counts.setdefault(rule.player, {})
+                for item, count in rule.item_counts.items():
+                    counts[item] = max(counts.get(item, 0), count)
+            else:
+                others.append(rule)
+        return (*(HasAll(counts, player) for player, counts in item_counts.items()), *others)
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        for rule in self.rules:
+            if not rule(state):
+                return False
+        return True
+
+
+class Or(_Combination):
+    """Requires any of the rules. Single items of the same player get merged into one check, which runs first."""
+    __slots__ = ()
+
+    @staticmethod
+    def _merge(rules: typing.List[Rule]) -> typing.Tuple[Rule, ...]:
+        any_items: typing.Dict[int, typing.List[str]] = {}
+        others: typing.List[Rule] = []
+        for rule in rules:
+            if isinstance(rule, Has) and rule.count == 1:
+                any_items.setdefault(rule.player, []).append(rule.item)
+            elif isinstance(rule, HasAny):
+                any_items.setdefault(rule.player, []).extend(rule.items)
+            else:
+                others.append(rule)
+        return (*(HasAny(items, player) for player, items in any_items.items()), *others)
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        for rule in self.rules:
+            if rule(state):
+                return True
+        return False
+
+
 def set_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"], rule: CollectionRule):
     spot.access_rule = rule
 
@@ -105,6 +309,8 @@ def add_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"],
     # empty rule, replace instead of add
     if old_rule is Location.access_rule or old_rule is Entrance.access_rule:
         spot.access_rule = rule if combine == "and" else old_rule
+    elif isinstance(rule, Rule) and isinstance(old_rule, Rule):
+        spot.access_rule = And(rule, old_rule) if combine == "and" else Or(rule, old_rule)
     else:
         if combine == "and":
             spot.access_rule = lambda state: rule(state) and old_rule(state)
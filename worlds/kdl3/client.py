@@ -261,15 +261,11 @@ class KDL3SNIClient(SNIClient):
 
     async def game_watcher(self, ctx: "SNIContext") -> None:
         try:
-            from SNIClient import snes_buffered_write, snes_flush_writes, snes_read
-            rom = await snes_read(ctx, KDL3_ROMNAME, 0x15)
-            if rom != ctx.rom:
+            from SNIClient import snes_buffered_write, snes_flush_writes, snes_read, snes_read_ranges
+            header = await snes_read_ranges(ctx, [(KDL3_ROMNAME, 0x15), (KDL3_HALKEN, 6), (KDL3_NINTEN, 6)])
+            if header is None or header[KDL3_ROMNAME, 0x15] != ctx.rom:
                 ctx.rom = None
-            halken = await snes_read(ctx, KDL3_HALKEN, 6)
-            if halken != b"halken":
-                return
-            ninten = await snes_read(ctx, KDL3_NINTEN, 6)
-            if ninten != b"ninten":
+            if header is None or header[KDL3_HALKEN, 6] != b"halken" or header[KDL3_NINTEN, 6] != b"ninten":
                 return
             if not ctx.slot:
                 return
@@ -298,15 +294,25 @@ class KDL3SNIClient(SNIClient):
             if self.stars is None:
                 stars = await snes_read(ctx, KDL3_STARS_FLAG, 1)
                 self.stars = stars[0] == 0x01
-            is_demo = await snes_read(ctx, KDL3_IS_DEMO, 1)
+            status = await snes_read_ranges(ctx, [(KDL3_IS_DEMO, 1), (KDL3_GAME_SAVE, 1), (KDL3_GOAL_ADDR, 1),
+                                                  (KDL3_CURRENT_BGM, 1), (KDL3_GAME_STATE, 1)])
+            if status is None:
+                return
+            is_demo = status[KDL3_IS_DEMO, 1]
             # 1 - recording a demo, 2 - playing back recorded, 3+ is a demo
             if is_demo[0] > 0x00:
                 return
-            current_save = await snes_read(ctx, KDL3_GAME_SAVE, 1)
-            goal = await snes_read(ctx, KDL3_GOAL_ADDR, 1)
-            boss_butch_status = await snes_read(ctx, KDL3_BOSS_BUTCH_STATUS + (current_save[0] * 2), 1)
-            mg5_status = await snes_read(ctx, KDL3_MG5_STATUS + (current_save[0] * 2), 1)
-            jumping_status = await snes_read(ctx, KDL3_JUMPING_STATUS + (current_save[0] * 2), 1)
+            current_save = status[KDL3_GAME_SAVE, 1]
+            goal = status[KDL3_GOAL_ADDR, 1]
+            boss_butch_range = (KDL3_BOSS_BUTCH_STATUS + (current_save[0] * 2), 1)
+            mg5_range = (KDL3_MG5_STATUS + (current_save[0] * 2), 1)
+            jumping_range = (KDL3_JUMPING_STATUS + (current_save[0] * 2), 1)
+            save_status = await snes_read_ranges(ctx, [boss_butch_range, mg5_range, jumping_range])
+            if save_status is None:
+                return
+            boss_butch_status = save_status[boss_butch_range]
+            mg5_status = save_status[mg5_range]
+            jumping_status = save_status[jumping_range]
             if boss_butch_status[0] == 0xFF:
                 return  # save file is not created, ignore
             if (goal[0] == 0x00 and boss_butch_status[0] == 0x01) \
@@ -315,10 +321,10 @@ class KDL3SNIClient(SNIClient):
                     or (goal[0] == 0x03 and jumping_status[0] == 0x03):
                 await ctx.send_msgs([{"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL}])
                 ctx.finished_game = True
-            current_bgm = await snes_read(ctx, KDL3_CURRENT_BGM, 1)
+            current_bgm = status[KDL3_CURRENT_BGM, 1]
             if current_bgm[0] in (0x00, 0x21, 0x22, 0x23, 0x25, 0x2A, 0x2B):
                 return  # null, title screen, opening, save select, true and false endings
-            game_state = await snes_read(ctx, KDL3_GAME_STATE, 1)
+            game_state = status[KDL3_GAME_STATE, 1]
             if "DeathLink" in ctx.tags and game_state[0] == 0x00 and ctx.last_death_link + 1 < time.time():
                 current_hp = await snes_read(ctx, KDL3_KIRBY_HP, 1)
                 current_world = struct.unpack("H", await snes_read(ctx, KDL3_CURRENT_WORLD, 2))[0]
@@ -6,7 +6,7 @@ import subprocess
 import copy
 import threading
 from .Utils import subprocess_args, data_path, get_version_bytes, __version__
-from Utils import user_path
+from Utils import file_image_cache, user_path
 from .ntype import BigStream
 from .crc import calculate_crc
 
@@ -14,6 +14,19 @@ DMADATA_START = 0x7430
 
 double_cache_prevention = threading.Lock()
 
+
+def load_symbols():
+    # shared by all roms, they don't modify it
+    if load_symbols.symbols is None:
+        with open(data_path('generated/symbols.json'), 'r') as stream:
+            symbols = json.load(stream)
+        load_symbols.symbols = {name: int(addr, 16) for name, addr in symbols.items()}
+    return load_symbols.symbols
+
+
+load_symbols.symbols = None
+
+
 class Rom(BigStream):
     original = None
 
@@ -29,9 +42,7 @@ class Rom(BigStream):
 
         decomp_file = user_path('ZOOTDEC.z64')
 
-        with open(data_path('generated/symbols.json'), 'r') as stream:
-            symbols = json.load(stream)
-            self.symbols = {name: int(addr, 16) for name, addr in symbols.items()}
+        self.symbols = load_symbols()
 
         # If decompressed file already exists, read from it
         if not force_use:
@@ -148,8 +159,8 @@ class Rom(BigStream):
     def read_rom(self, file):
         # "Reads rom into bytearray"
         try:
-            with open(file, 'rb') as stream:
-                self.buffer = bytearray(stream.read())
+            # all players read the same (decompressed) base rom, share one copy of it between them
+            self.buffer = bytearray(file_image_cache.read(file))
         except FileNotFoundError as ex:
             raise FileNotFoundError('Invalid path to Base ROM: "' + file + '"')
 
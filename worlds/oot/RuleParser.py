@@ -1,5 +1,5 @@
 import ast
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from inspect import signature, _ParameterKind
 import logging
 import re
@@ -30,6 +30,15 @@ kwarg_defaults = {
 
 allowed_globals = {'TimeOfDay': TimeOfDay}
 
+# Rules only refer to their player through the 'player' keyword arg, so parsed and compiled rules are shared by all
+# players and seeds. A parsed rule records the settings and spot properties it looked at, as (kind, name) -> repr,
+# and is reused for a player whose settings and spot agree on all of them.
+ParsedRule = namedtuple('ParsedRule', ('trace', 'rule_str', 'events'))
+parsed_rule_cache = defaultdict(list)  # rule string -> ParsedRule variants
+compiled_rule_cache = {}  # rule ast dump -> code object
+max_parsed_variants = 16
+missing_setting = object()
+
 rule_aliases = {}
 nonaliases = set()
 
@@ -67,6 +76,9 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         self.rule_cache = {}
         self.kwarg_defaults = kwarg_defaults.copy()  # otherwise this gets contaminated between players
         self.kwarg_defaults['player'] = self.player
+        # what the rule currently being parsed depends on, while it can still be cached
+        self.trace = None
+        self.trace_events = None
 
 
     def visit_Name(self, node):
@@ -84,23 +96,23 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(escaped_items[node.id]), ast.Constant(self.player)],
+                args=[ast.Str(escaped_items[node.id]), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
-        elif node.id in self.world.__dict__:
+        elif (setting := self.get_setting(node.id)) is not missing_setting:
             # Settings are constant
-            return ast.parse('%r' % self.world.__dict__[node.id], mode='eval').body
+            return ast.parse('%r' % setting, mode='eval').body
         elif node.id in State.__dict__:
             return self.make_call(node, node.id, [], [])
         elif node.id in self.kwarg_defaults or node.id in allowed_globals:
             return node
         elif event_name.match(node.id):
-            self.events.add(node.id.replace('_', ' '))
+            self.add_event(node.id.replace('_', ' '))
             return ast.Call(
                 func=ast.Attribute(
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has',
                     ctx=ast.Load()),
-                args=[ast.Str(node.id.replace('_', ' ')), ast.Constant(self.player)],
+                args=[ast.Str(node.id.replace('_', ' ')), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])
         else:
             raise Exception('Parse Error: invalid node name %s' % node.id, self.current_spot.name, ast.dump(node, False))
@@ -111,7 +123,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(node.s), ast.Constant(self.player)],
+            args=[ast.Str(node.s), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
 
     # python 3.8 compatibility: ast walking now uses visit_Constant for Constant subclasses
@@ -137,20 +149,23 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
         if isinstance(count, ast.Name):
             # Must be a settings constant
-            count = ast.parse('%r' % self.world.__dict__[count.id], mode='eval').body
+            setting = self.get_setting(count.id)
+            if setting is missing_setting:
+                raise Exception('Parse Error: unknown setting %s' % count.id, self.current_spot.name, ast.dump(node, False))
+            count = ast.parse('%r' % setting, mode='eval').body
 
         if iname in escaped_items:
             iname = escaped_items[iname]
 
         if iname not in item_table:
-            self.events.add(iname)
+            self.add_event(iname)
 
         return ast.Call(
             func=ast.Attribute(
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(iname), ast.Constant(self.player), count],
+            args=[ast.Str(iname), ast.Name(id='player', ctx=ast.Load()), count],
             keywords=[])
 
 
@@ -182,7 +197,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         new_args = []
         for child in node.args:
             if isinstance(child, ast.Name):
-                if child.id in self.world.__dict__:
+                setting = self.get_setting(child.id)
+                if setting is not missing_setting:
                     # child = ast.Attribute(
                     #     value=ast.Attribute(
                     #         value=ast.Name(id='state', ctx=ast.Load()),
@@ -190,7 +206,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     #         ctx=ast.Load()),
                     #     attr=child.id,
                     #     ctx=ast.Load())
-                    child = ast.Constant(getattr(self.world, child.id))
+                    child = ast.Constant(setting)
                 elif child.id in rule_aliases:
                     child = self.visit(child)
                 elif child.id in escaped_items:
@@ -221,7 +237,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                                 ctx=ast.Load()),
                             attr='worlds',
                             ctx=ast.Load()),
-                        slice=ast.Index(value=ast.Constant(self.player)),
+                        slice=ast.Index(value=ast.Name(id='player', ctx=ast.Load())),
                         ctx=ast.Load()),
                     attr=node.value.id,
                     ctx=ast.Load()),
@@ -242,7 +258,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         # Fast check for json can_use
         if (len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq)
                 and isinstance(node.left, ast.Name) and isinstance(node.comparators[0], ast.Name)
-                and node.left.id not in self.world.__dict__ and node.comparators[0].id not in self.world.__dict__):
+                and self.get_setting(node.left.id) is missing_setting
+                and self.get_setting(node.comparators[0].id) is missing_setting):
             return ast.NameConstant(node.left.id == node.comparators[0].id)
 
         node.left = escape_or_string(node.left)
@@ -325,7 +342,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                     value=ast.Name(id='state', ctx=ast.Load()),
                     attr='has_any' if early_return else 'has_all',
                     ctx=ast.Load()),
-                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Constant(self.player)],
+                args=[ast.Tuple(elts=[ast.Str(i) for i in items], ctx=ast.Load()), ast.Name(id='player', ctx=ast.Load())],
                 keywords=[])] + new_values
         else:
             node.values = new_values
@@ -334,6 +351,44 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         return node
 
 
+    # Settings and properties of the current spot are looked up through these,
+    # so parse_rule can record what the rule depends on.
+    def get_setting(self, name):
+        setting = self.world.__dict__.get(name, missing_setting)
+        if self.trace is not None:
+            self.trace.setdefault(('setting', name), None if setting is missing_setting else repr(setting))
+        return setting
+
+
+    def get_spot_region(self):
+        r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
+        if self.trace is not None:
+            self.trace.setdefault(('spot', 'region'), r.name)
+        return r
+
+
+    def get_spot_type(self):
+        if self.trace is not None:
+            self.trace.setdefault(('spot', 'type'), self.current_spot.type)
+        return self.current_spot.type
+
+
+    def get_traced_value(self, key):
+        kind, name = key
+        if kind == 'setting':
+            setting = self.world.__dict__.get(name, missing_setting)
+            return None if setting is missing_setting else repr(setting)
+        if self.current_spot is None:
+            return None
+        return self.get_spot_region().name if name == 'region' else self.current_spot.type
+
+
+    def add_event(self, event):
+        self.events.add(event)
+        if self.trace_events is not None:
+            self.trace_events.add(event)
+
+
     # Generates an ast.Call invoking the given State function 'name',
     # providing given args and keywords, and adding in additional
     # keyword args from kwarg_defaults (age, etc.)
@@ -341,8 +396,9 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         if not hasattr(State, name):
             raise Exception('Parse Error: No such function State.%s' % name, self.current_spot.name, ast.dump(node, False))
 
-        for (k, v) in self.kwarg_defaults.items():
-            keywords.append(ast.keyword(arg=f'{k}', value=ast.Constant(v)))
+        # pass on the rule's own keyword args, so the rule does not depend on their values
+        for k in self.kwarg_defaults.keys():
+            keywords.append(ast.keyword(arg=f'{k}', value=ast.Name(id=k, ctx=ast.Load())))
 
         return ast.Call(
             func=ast.Attribute(
@@ -354,6 +410,8 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
 
     def replace_subrule(self, target, node):
+        # subrules are tied to this player's regions
+        self.trace = None
         rule = ast.dump(node, False)
         if rule in self.replaced_rules[target]:
             return self.replaced_rules[target][rule]
@@ -367,7 +425,7 @@ class Rule_AST_Transformer(ast.NodeTransformer):
                 value=ast.Name(id='state', ctx=ast.Load()),
                 attr='has',
                 ctx=ast.Load()),
-            args=[ast.Str(subrule_name), ast.Constant(self.player)],
+            args=[ast.Str(subrule_name), ast.Name(id='player', ctx=ast.Load())],
             keywords=[])
         # Cache the subrule for any others in this region
         # (and reserve the item name in the process)
@@ -400,31 +458,39 @@ class Rule_AST_Transformer(ast.NodeTransformer):
         self.delayed_rules.clear()
 
 
-    def make_access_rule(self, body):
-        rule_str = ast.dump(body, False)
+    def make_access_rule(self, body, rule_str=None):
+        if rule_str is None:
+            rule_str = ast.dump(body, False)
         if rule_str not in self.rule_cache:
-            # requires consistent iteration on dicts
-            kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
-            kwd = list(map(ast.Constant, self.kwarg_defaults.values()))
-            try:
-                self.rule_cache[rule_str] = eval(compile(
-                    ast.fix_missing_locations(
-                        ast.Expression(ast.Lambda(
-                            args=ast.arguments(
-                                posonlyargs=[],
-                                args=[ast.arg(arg='state')],
-                                defaults=[],
-                                kwonlyargs=kwargs,
-                                kw_defaults=kwd),
-                            body=body))),
-                    '<string>', 'eval'),
-                    # globals/locals. if undefined, everything in the namespace *now* would be allowed
-                    allowed_globals)
-            except TypeError as e:
-                raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+            code = compiled_rule_cache.get(rule_str)
+            if code is None:
+                code = compiled_rule_cache[rule_str] = self.compile_rule(body)
+            # globals/locals. if undefined, everything in the namespace *now* would be allowed.
+            # the locals provide the defaults of the rule's keyword args
+            self.rule_cache[rule_str] = eval(code, allowed_globals, self.kwarg_defaults)
         return self.rule_cache[rule_str]
 
 
+    def compile_rule(self, body):
+        # requires consistent iteration on dicts
+        kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
+        kwd = [ast.Name(id=k, ctx=ast.Load()) for k in self.kwarg_defaults.keys()]
+        try:
+            return compile(
+                ast.fix_missing_locations(
+                    ast.Expression(ast.Lambda(
+                        args=ast.arguments(
+                            posonlyargs=[],
+                            args=[ast.arg(arg='state')],
+                            defaults=[],
+                            kwonlyargs=kwargs,
+                            kw_defaults=kwd),
+                        body=body))),
+                '<string>', 'eval')
+        except TypeError as e:
+            raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+
+
     ## Handlers for specific internal functions used in the json logic.
 
     # at(region_name, rule)
@@ -448,29 +514,29 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     ## Handlers for compile-time optimizations (former State functions)
 
     def at_day(self, node):
-        if self.world.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAY or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
-            r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
+            r = self.get_spot_region()
             return ast.parse(f"(state.has('Ocarina', player) and state.has('Suns Song', player)) or state._oot_reach_at_time('{r.name}', TimeOfDay.DAY, [], player)", mode='eval').body
         return ast.NameConstant(True)
 
     def at_dampe_time(self, node):
-        if self.world.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (find a path from a provider))
             # parsing is better than constructing this expression by hand
-            r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
+            r = self.get_spot_region()
             return ast.parse(f"state._oot_reach_at_time('{r.name}', TimeOfDay.DAMPE, [], player)", mode='eval').body
         return ast.NameConstant(True)
 
     def at_night(self, node):
-        if self.current_spot.type == 'GS Token' and self.world.logic_no_night_tokens_without_suns_song:
+        if self.get_spot_type() == 'GS Token' and self.get_setting('logic_no_night_tokens_without_suns_song'):
             # Using visit here to resolve 'can_play' rule
             return self.visit(ast.parse('can_play(Suns_Song)', mode='eval').body)
-        if self.world.ensure_tod_access:
+        if self.get_setting('ensure_tod_access'):
             # tod has DAMPE or (tod == NONE and (ss or find a path from a provider))
             # parsing is better than constructing this expression by hand
-            r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
+            r = self.get_spot_region()
             return ast.parse(f"(state.has('Ocarina', player) and state.has('Suns Song', player)) or state._oot_reach_at_time('{r.name}', TimeOfDay.DAMPE, [], player)", mode='eval').body
         return ast.NameConstant(True)
 
@@ -479,7 +545,26 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     # If spot is None, here() rules won't work.
     def parse_rule(self, rule_string, spot=None):
         self.current_spot = spot
-        return self.make_access_rule(self.visit(ast.parse(rule_string, mode='eval').body))
+        for parsed in parsed_rule_cache.get(rule_string, ()):
+            if all(self.get_traced_value(key) == value for key, value in parsed.trace):
+                self.events.update(parsed.events)
+                return self.make_access_rule(None, parsed.rule_str)
+
+        self.trace = {}
+        self.trace_events = set()
+        try:
+            body = self.visit(ast.parse(rule_string, mode='eval').body)
+            rule_str = ast.dump(body, False)
+            access_rule = self.make_access_rule(body, rule_str)
+            if self.trace is not None:
+                variants = parsed_rule_cache[rule_string]
+                if len(variants) >= max_parsed_variants:
+                    del variants[0]
+                variants.append(ParsedRule(tuple(self.trace.items()), rule_str, frozenset(self.trace_events)))
+        finally:
+            self.trace = None
+            self.trace_events = None
+        return access_rule
 
     def parse_spot_rule(self, spot):
         rule = spot.rule_string.split('#', 1)[0].strip()
@@ -493,21 +578,21 @@ class Rule_AST_Transformer(ast.NodeTransformer):
 
     # Hijacking functions
     def current_spot_child_access(self, node): 
-        r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', {self.player})", mode='eval').body
+        r = self.get_spot_region()
+        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'child', player)", mode='eval').body
 
     def current_spot_adult_access(self, node): 
-        r = self.current_spot if type(self.current_spot) == OOTRegion else self.current_spot.parent_region
-        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', {self.player})", mode='eval').body
+        r = self.get_spot_region()
+        return ast.parse(f"state._oot_reach_as_age('{r.name}', 'adult', player)", mode='eval').body
 
     def current_spot_starting_age_access(self, node): 
-        return self.current_spot_child_access(node) if self.world.starting_age == 'child' else self.current_spot_adult_access(node)
+        return self.current_spot_child_access(node) if self.get_setting('starting_age') == 'child' else self.current_spot_adult_access(node)
 
     def has_bottle(self, node): 
-        return ast.parse(f"state._oot_has_bottle({self.player})", mode='eval').body
+        return ast.parse(f"state._oot_has_bottle(player)", mode='eval').body
 
     def can_live_dmg(self, node):
-        return ast.parse(f"state._oot_can_live_dmg({self.player}, {node.args[0].value})", mode='eval').body
+        return ast.parse(f"state._oot_can_live_dmg(player, {node.args[0].value})", mode='eval').body
 
     def region_has_shortcuts(self, node):
-        return ast.parse(f"state._oot_region_has_shortcuts({self.player}, '{node.args[0].value}')", mode='eval').body
+        return ast.parse(f"state._oot_region_has_shortcuts(player, '{node.args[0].value}')", mode='eval').body
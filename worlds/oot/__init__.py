@@ -35,9 +35,10 @@ from Options import Range, Toggle, VerifyKeys, Accessibility, PlandoConnections,
 from Fill import fill_restrictive, fast_fill, FillError
 from worlds.generic.Rules import exclusion_rules, add_item_rule
 from worlds.AutoWorld import World, AutoLogicRegister, WebWorld
+from worlds.OutputScheduler import output_scheduler
 
-# OoT's generate_output doesn't benefit from more than 2 threads, instead it uses a lot of memory.
-i_o_limiter = threading.Semaphore(2)
+# OoT's generate_output uses a lot of memory, for several copies of the decompressed ROM.
+output_memory = 384 * 2**20
 
 
 class OOTCollectionState(metaclass=AutoLogicRegister):
@@ -1078,7 +1079,7 @@ class OOTWorld(World):
         if self.hints != 'none':
             self.hint_data_available.wait()
 
-        with i_o_limiter:
+        with output_scheduler.reserve(output_memory):
             # Make traps appear as other random items
             trap_location_ids = [loc.address for loc in self.get_locations() if loc.item.trap]
             self.trap_appearances = {}
@@ -0,0 +1,35 @@
+import unittest
+
+from BaseClasses import CollectionState
+from test.general import setup_multiworld
+from .. import OOTWorld
+from ..RuleParser import parsed_rule_cache
+
+
+class TestRuleParser(unittest.TestCase):
+    def test_rules_shared(self) -> None:
+        """Verify that a second world reuses parsed rules, and its rules are still its own."""
+        steps = ("generate_early", "create_regions", "create_items", "set_rules")
+        multiworld = setup_multiworld([OOTWorld, OOTWorld], steps)
+        first, second = multiworld.worlds[1], multiworld.worlds[2]
+        self.assertTrue(parsed_rule_cache)
+        self.assertEqual(first.parser.rule_cache.keys(), second.parser.rule_cache.keys())
+        self.assertEqual(first.parser.events, second.parser.events)
+        for rule_str, rule in first.parser.rule_cache.items():
+            other_rule = second.parser.rule_cache[rule_str]
+            self.assertIsNot(rule, other_rule)
+            self.assertIs(rule.__code__, other_rule.__code__, rule_str)
+            self.assertEqual({"player": first.player}, rule.__kwdefaults__, rule_str)
+            self.assertEqual({"player": second.player}, other_rule.__kwdefaults__, rule_str)
+
+        # each player's rule only sees that player's items
+        has_bow = "Call(Attribute(Name('state', Load()), 'has', Load()), [Constant('Bow'), Name('player', Load())], [])"
+        state = CollectionState(multiworld)
+        state.collect(second.create_item("Bow"), True)
+        self.assertFalse(first.parser.rule_cache[has_bow](state))
+        self.assertTrue(second.parser.rule_cache[has_bow](state))
+
+        for location in multiworld.get_locations(first.player):
+            other_location = multiworld.get_location(location.name, second.player)
+            for flag in ("always", "never"):
+                self.assertEqual(getattr(location, flag, False), getattr(other_location, flag, False), location.name)